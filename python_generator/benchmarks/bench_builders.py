@@ -0,0 +1,160 @@
+"""
+Per-request cost of building REQUEST blocks.
+
+Builds a block for each of the requested number of synthetic requests with
+``RequestBlockBuilder.build``, with ``RequestBlockBuilder.write`` into one
+shared list and one shared ``io.StringIO``, and with the builder as it was
+before it gained a write mode (a header dict copy, a skip list and a join
+per block).
+
+Usage:
+    python benchmarks/bench_builders.py [--requests N] [--repeat N] [--custom-headers]
+"""
+
+import argparse
+import gc
+import io
+import sys
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from generator.builders import RequestBlockBuilder
+from generator.types import (
+    CustomHeader,
+    RequestBody,
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+)
+
+
+def make_entries(count: int) -> List[SemanticHarEntry]:
+    """Build requests with browser-like headers, cookies and some bodies."""
+    entries = []
+    for i in range(count):
+        body = None
+        if i % 3 == 0:
+            body = RequestBody(data=f'{{"id": {i}, "name": "item \\"{i}\\""}}', content_type='json')
+        entries.append(SemanticHarEntry(
+            request=SemanticHarRequest(
+                url=f'https://api.example.com/v1/items/{i}?page={i % 10}',
+                method='POST' if body else 'GET',
+                headers={
+                    'Accept': 'application/json',
+                    'Accept-Language': 'en-US,en;q=0.9',
+                    'User-Agent': 'Mozilla/5.0',
+                    'Content-Length': '42',
+                    'Referer': 'https://app.example.com/',
+                    'x-request-id': f'{i:032x}',
+                },
+                cookies={'sid': f'{i:x}', 'theme': 'dark'},
+                body=body
+            ),
+            response=SemanticHarResponse(status=200)
+        ))
+    return entries
+
+
+def legacy_build(entry: SemanticHarEntry, custom_headers: Optional[List[CustomHeader]] = None) -> str:
+    """Build a block the way the previous implementation did."""
+    request = entry.request
+    lines = []
+    if request.method != 'GET':
+        lines.append(f'REQUEST "{request.url}" {request.method}')
+    else:
+        lines.append(f'REQUEST "{request.url}"')
+    lines.append('  "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"')
+    headers = dict(request.headers)
+    if custom_headers:
+        for header in custom_headers:
+            if header.enabled:
+                headers[header.key.lower()] = header.value
+    skip_headers = ['user-agent', 'cookie', 'content-length']
+    for key, value in headers.items():
+        if key.lower() not in skip_headers:
+            lines.append(f'  "{key}: {value}"')
+    if request.cookies:
+        cookie_string = '; '.join(f'{k}={v}' for k, v in request.cookies.items())
+        lines.append(f'  "Cookie: {cookie_string}"')
+    if request.body:
+        escaped_body = request.body.data.replace('\\', '\\\\').replace('"', '\\"')
+        lines.append(f'  CONTENT "{escaped_body}"')
+        content_type = 'application/json' if request.body.content_type == 'json' else 'application/x-www-form-urlencoded'
+        lines.append(f'  "Content-Type: {content_type}"')
+    return '\n'.join(lines)
+
+
+def timed(run: Callable[[], str], repeat: int) -> Tuple[float, str]:
+    """Return the best seconds taken by ``run`` over ``repeat`` runs and its text."""
+    best = float('inf')
+    text = ''
+    gc.collect()
+    # Like timeit, keep collections of the entries out of the timings
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            text = run()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best, text
+
+
+def main() -> None:
+    """Run the benchmark and print the cost per request of each mode."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=100_000, help='Number of requests')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode; the best is reported')
+    parser.add_argument('--custom-headers', action='store_true', help='Add a custom header to every request')
+    args = parser.parse_args()
+    
+    entries = make_entries(args.requests)
+    custom_headers = None
+    if args.custom_headers:
+        custom_headers = [CustomHeader(key='X-Trace', value='bench', enabled=True)]
+    builder = RequestBlockBuilder()
+    
+    def run_legacy() -> str:
+        return '\n'.join([legacy_build(entry, custom_headers) for entry in entries])
+    
+    def run_build() -> str:
+        return '\n'.join([builder.build(entry, custom_headers) for entry in entries])
+    
+    def run_list() -> str:
+        parts: List[str] = []
+        write = parts.append
+        for entry in entries:
+            if parts:
+                write('\n')
+            builder.write(write, entry, custom_headers)
+        return ''.join(parts)
+    
+    def run_stringio() -> str:
+        buffer = io.StringIO()
+        write = buffer.write
+        for i, entry in enumerate(entries):
+            if i:
+                write('\n')
+            builder.write(write, entry, custom_headers)
+        return buffer.getvalue()
+    
+    results = [
+        ('Previous builder:', timed(run_legacy, args.repeat)),
+        ('build():', timed(run_build, args.repeat)),
+        ('write() to list:', timed(run_list, args.repeat)),
+        ('write() to StringIO:', timed(run_stringio, args.repeat)),
+    ]
+    
+    reference = results[0][1][1]
+    assert all(text == reference for _, (_, text) in results)
+    print(f'Requests:             {args.requests:8d}')
+    for label, (seconds, _) in results:
+        print(f'{label:<22}{seconds / args.requests * 1e6:8.2f} us/request')
+
+
+if __name__ == '__main__':
+    main()
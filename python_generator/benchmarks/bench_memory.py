@@ -0,0 +1,147 @@
+"""
+Memory benchmark for parsed HAR entries.
+
+Compares the resident bytes per entry of the current slotted, interned
+representation against the previous plain-dataclass representation. Entries
+are parsed with the 'minimal' profile, which like the old representation
+keeps only the response status.
+
+Usage:
+    python benchmarks/bench_memory.py [--entries N]
+"""
+
+import argparse
+import json
+import sys
+import os
+import tracemalloc
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from generator.parser import transform_entry
+
+
+@dataclass
+class _LegacyRequestBody:
+    data: str
+    content_type: str
+
+
+@dataclass
+class _LegacyRequest:
+    url: str
+    method: str
+    headers: Dict[str, str]
+    cookies: Dict[str, str]
+    body: Optional[_LegacyRequestBody] = None
+
+
+@dataclass
+class _LegacyResponse:
+    status: int
+
+
+@dataclass
+class _LegacyEntry:
+    request: _LegacyRequest
+    response: _LegacyResponse
+
+
+def legacy_transform_entry(raw: Dict[str, Any]) -> _LegacyEntry:
+    """Transform an entry the way the GUI did before slots and interning."""
+    request_data = raw.get('request', {})
+    response_data = raw.get('response', {})
+    headers = {}
+    for h in request_data.get('headers', []):
+        headers[h.get('name', '').lower()] = h.get('value', '')
+    cookies = {}
+    for c in request_data.get('cookies', []):
+        cookies[c.get('name', '')] = c.get('value', '')
+    body = None
+    post_data = request_data.get('postData', {})
+    if post_data:
+        content_type = 'json' if 'json' in post_data.get('mimeType', '') else 'form'
+        body = _LegacyRequestBody(data=post_data.get('text', ''), content_type=content_type)
+    return _LegacyEntry(
+        request=_LegacyRequest(
+            url=request_data.get('url', ''),
+            method=request_data.get('method', 'GET'),
+            headers=headers,
+            cookies=cookies,
+            body=body
+        ),
+        response=_LegacyResponse(status=response_data.get('status', 0))
+    )
+
+
+def make_raw_entry(i: int) -> bytes:
+    """Serialize one realistic browser request as HAR JSON."""
+    host = f'api{i % 4}.example.com'
+    is_post = i % 5 == 0
+    entry = {
+        'request': {
+            'method': 'POST' if is_post else 'GET',
+            'url': f'https://{host}/v1/items/{i}?page={i % 10}',
+            'headers': [
+                {'name': 'Host', 'value': host},
+                {'name': 'User-Agent', 'value': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'},
+                {'name': 'Accept', 'value': 'application/json, text/plain, */*'},
+                {'name': 'Accept-Language', 'value': 'en-US,en;q=0.9'},
+                {'name': 'Accept-Encoding', 'value': 'gzip, deflate, br'},
+                {'name': 'Origin', 'value': f'https://{host}'},
+                {'name': 'Referer', 'value': f'https://{host}/items'},
+                {'name': 'Connection', 'value': 'keep-alive'},
+                {'name': 'Sec-Fetch-Mode', 'value': 'cors'},
+                {'name': 'Sec-Fetch-Site', 'value': 'same-origin'},
+                {'name': 'X-Request-Id', 'value': f'{i:032x}'},
+            ],
+            'cookies': [
+                {'name': 'session', 'value': f'{i * 7919:016x}'},
+                {'name': 'theme', 'value': 'dark'},
+                {'name': 'consent', 'value': 'yes'},
+            ],
+        },
+        'response': {'status': 201 if is_post else 200},
+    }
+    if is_post:
+        entry['request']['postData'] = {
+            'mimeType': 'application/json',
+            'text': json.dumps({'id': i, 'name': f'item-{i}'}),
+        }
+    return json.dumps(entry).encode('utf-8')
+
+
+def measure(transform: Callable[[Dict[str, Any]], Any], raw_entries: List[bytes]) -> float:
+    """Return the retained bytes per entry after transforming all entries."""
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    entries = [transform(json.loads(raw)) for raw in raw_entries]
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in snapshot.compare_to(baseline, 'filename'))
+    del entries
+    return retained / len(raw_entries)
+
+
+def main() -> None:
+    """Run the benchmark and print bytes per entry."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--entries', type=int, default=100_000, help='Number of entries to build')
+    args = parser.parse_args()
+    
+    raw_entries = [make_raw_entry(i) for i in range(args.entries)]
+    
+    before = measure(legacy_transform_entry, raw_entries)
+    after = measure(partial(transform_entry, profile='minimal'), raw_entries)
+    
+    print(f'Entries:                       {args.entries}')
+    print(f'Before (dataclass, no intern): {before:8.0f} bytes/entry')
+    print(f'After  (slots + interning):    {after:8.0f} bytes/entry')
+    print(f'Saved:                         {before - after:8.0f} bytes/entry ({(1 - after / before) * 100:.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""
+Regression benchmarks for the main pipeline stages.
+
+Generates deterministic synthetic captures (see ``synthetic_har.py``) and
+measures the time and peak memory of each stage at each size:
+
+- ingest: streaming parse, EntryTable and TrigramIndex, as the GUI loads
+- generate: ``LoliCodeGenerator.generate`` over every request
+- validate: ``LoliCodeValidator.validate`` of the generated script
+- request_builder, keycheck_builder, parse_builder: each block builder
+  over every request
+
+Times are the best of ``--repeat`` runs. Peak memory is measured in one
+more run under tracemalloc, counting only what the stage allocates. With
+``--baseline``, results are compared against a stored baseline and the
+exit status is 1 if any stage got slower by more than ``--max-slowdown``
+percent. Baselines depend on the machine; record one with
+``--save-baseline`` before comparing.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes N ...] [--repeat N]
+        [--baseline PATH] [--save-baseline PATH] [--max-slowdown PCT]
+        [--min-seconds S]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from generator.builders import KeycheckBlockBuilder, ParseBlockBuilder, RequestBlockBuilder
+from generator.entry_table import EntryTable
+from generator.lolicode_generator import LoliCodeGenerator
+from generator.parser import load_har_entries
+from generator.search import TrigramIndex
+from generator.types import (
+    CustomAssertion,
+    DependencyMatrix,
+    LoliCodeConfig,
+    SemanticHarEntry,
+    VariableExtraction,
+)
+from generator.validators import LoliCodeValidator
+from synthetic_har import write_har
+
+
+STAGES = ('ingest', 'generate', 'validate', 'request_builder', 'keycheck_builder', 'parse_builder')
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Percentage by which a stage may get slower than its baseline
+DEFAULT_MAX_SLOWDOWN = 25.0
+
+# Slowdowns smaller than this many seconds are timer noise, not regressions
+MIN_SLOWDOWN_SECONDS = 0.005
+
+# Every request gets these extractions and one assertion besides the
+# default status check, so that every builder is exercised
+_EXTRACTIONS = [
+    VariableExtraction(type='json', pattern='access_token', variable_name='TOKEN', is_global=True),
+    VariableExtraction(type='regex', pattern='name=.csrf. value=.(\\w+)', variable_name='CSRF', is_global=False),
+]
+_ASSERTIONS = [CustomAssertion(type='contains', value='items', action='success')]
+
+# {size: {stage: {'seconds': float, 'peak_mb': float}}}
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+
+def measure(run: Callable[[], Any], repeat: int) -> Tuple[float, float, Any]:
+    """
+    Time a stage and measure its peak memory.
+    
+    Args:
+        run: The stage
+        repeat: Timed runs; the best is kept
+    
+    Returns:
+        ``(seconds, peak_mb, result)`` where ``result`` is the stage's
+        return value from the last run
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    result = None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1_000_000, result
+
+
+def _ingest(path: str) -> Tuple[List[SemanticHarEntry], EntryTable, TrigramIndex]:
+    """Load a capture the way the GUI does."""
+    entries = load_har_entries(path, profile='minimal')
+    return entries, EntryTable.from_entries(entries), TrigramIndex.from_entries(entries)
+
+
+def run_size(size: int, repeat: int, seed: int, directory: str) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark every stage on one synthetic capture.
+    
+    Args:
+        size: Number of entries
+        repeat: Timed runs per stage
+        seed: Seed of the synthetic capture
+        directory: Directory for the capture file
+    
+    Returns:
+        ``{stage: {'seconds': ..., 'peak_mb': ...}}``
+    """
+    path = os.path.join(directory, f'synthetic_{size}.har')
+    write_har(path, size, seed)
+    results: Dict[str, Dict[str, float]] = {}
+    
+    def record(stage: str, run: Callable[[], Any]) -> Any:
+        seconds, peak_mb, result = measure(run, repeat)
+        results[stage] = {'seconds': round(seconds, 6), 'peak_mb': round(peak_mb, 3)}
+        return result
+    
+    entries = record('ingest', lambda: _ingest(path))[0]
+    os.remove(path)
+    
+    indices = list(range(len(entries)))
+    config = LoliCodeConfig(
+        selected_indices=indices,
+        variable_extractions={i: _EXTRACTIONS for i in indices},
+        custom_assertions={i: _ASSERTIONS for i in indices if i % 2}
+    )
+    matrix = DependencyMatrix(topological_order=indices)
+    generator = LoliCodeGenerator(cache_max_bytes=0)
+    script = record('generate', lambda: asyncio.run(generator.generate(config, entries, matrix)))
+    validation = record('validate', lambda: LoliCodeValidator().validate(script))
+    if not validation.is_valid:
+        raise RuntimeError(f'Generated script is invalid: {validation.errors[0]}')
+    
+    request_builder = RequestBlockBuilder()
+    keycheck_builder = KeycheckBlockBuilder()
+    parse_builder = ParseBlockBuilder()
+    
+    def build_requests() -> int:
+        parts: List[str] = []
+        for entry in entries:
+            request_builder.write(parts.append, entry)
+        return len(parts)
+    
+    def build_keychecks() -> int:
+        blocks = [keycheck_builder.build_status_check(entry.response.status) for entry in entries]
+        blocks.extend(keycheck_builder.build(assertion) for _ in entries for assertion in _ASSERTIONS)
+        return len(blocks)
+    
+    def build_parses() -> int:
+        return len([parse_builder.build(extraction) for _ in entries for extraction in _EXTRACTIONS])
+    
+    record('request_builder', build_requests)
+    record('keycheck_builder', build_keychecks)
+    record('parse_builder', build_parses)
+    return results
+
+
+def run_suite(sizes: Sequence[int], repeat: int = 3, seed: int = 0) -> Results:
+    """
+    Benchmark every stage at every size.
+    
+    Returns:
+        ``{str(size): {stage: {'seconds': ..., 'peak_mb': ...}}}``
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        return {str(size): run_size(size, repeat, seed, directory) for size in sizes}
+
+
+def compare(
+    results: Results,
+    baseline: Results,
+    max_slowdown: float = DEFAULT_MAX_SLOWDOWN,
+    min_seconds: float = MIN_SLOWDOWN_SECONDS
+) -> List[str]:
+    """
+    Find stages that got slower than their baseline.
+    
+    Stages or sizes missing from the baseline are not compared.
+    
+    Args:
+        results: Results from ``run_suite``
+        baseline: Stored results to compare against
+        max_slowdown: Allowed slowdown in percent
+        min_seconds: Slowdowns smaller than this are ignored
+    
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for size, stages in results.items():
+        for stage, measured in stages.items():
+            reference = baseline.get(size, {}).get(stage)
+            if reference is None:
+                continue
+            seconds, expected = measured['seconds'], reference['seconds']
+            if seconds - expected < min_seconds:
+                continue
+            slowdown = (seconds / expected - 1) * 100 if expected > 0 else float('inf')
+            if slowdown > max_slowdown:
+                regressions.append(
+                    f'{stage} at {size} entries: {seconds:.3f}s vs {expected:.3f}s baseline '
+                    f'(+{slowdown:.0f}%, limit {max_slowdown:g}%)'
+                )
+    return regressions
+
+
+def load_baseline(path: str) -> Results:
+    """Read the results stored by ``save_baseline``."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def save_baseline(path: str, results: Results, seed: int) -> None:
+    """Store results, with the machine they were measured on."""
+    data = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def print_results(results: Results, baseline: Optional[Results] = None) -> None:
+    """Print a table of the results, with the change from the baseline."""
+    print(f'{"Stage":<18}{"Entries":>9}{"Seconds":>11}{"Peak MB":>10}{"vs base":>10}')
+    for size, stages in results.items():
+        for stage, measured in stages.items():
+            reference = (baseline or {}).get(size, {}).get(stage)
+            change = ''
+            if reference is not None and reference['seconds'] > 0:
+                change = f'{(measured["seconds"] / reference["seconds"] - 1) * 100:+.0f}%'
+            print(f'{stage:<18}{size:>9}{measured["seconds"]:>11.3f}{measured["peak_mb"]:>10.1f}{change:>10}')
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the suite; return 1 if a stage regressed past the limit."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='Capture sizes in entries')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage; the best is kept')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic captures')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', help='Write the results as a baseline JSON')
+    parser.add_argument('--max-slowdown', type=float, default=DEFAULT_MAX_SLOWDOWN,
+                        help='Allowed slowdown per stage in percent')
+    parser.add_argument('--min-seconds', type=float, default=MIN_SLOWDOWN_SECONDS,
+                        help='Ignore slowdowns smaller than this many seconds')
+    args = parser.parse_args(argv)
+    
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    results = run_suite(args.sizes, args.repeat, args.seed)
+    print_results(results, baseline)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, args.seed)
+        print(f'Saved baseline to {args.save_baseline}')
+    if baseline is None:
+        return 0
+    
+    regressions = compare(results, baseline, args.max_slowdown, args.min_seconds)
+    for message in regressions:
+        print(f'REGRESSION: {message}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
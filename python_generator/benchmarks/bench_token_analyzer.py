@@ -0,0 +1,113 @@
+"""
+Throughput benchmark for TokenAnalyzer.
+
+Scans synthetic response-like bodies with the combined single-pass token
+regex and, for comparison, with one regex per token pattern, and reports
+the throughput of each in MB/s.
+
+Usage:
+    python benchmarks/bench_token_analyzer.py [--bodies N] [--body-size BYTES]
+"""
+
+import argparse
+import random
+import re
+import sys
+import os
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from generator.analyzer import TokenAnalyzer
+
+
+# The TypeScript analyzer's patterns, each run as its own pass
+_SEPARATE_PATTERNS = [
+    r'Bearer\s+([a-zA-Z0-9\-_]+\.[a-zA-Z0-9\-_]+\.[a-zA-Z0-9\-_]+)',
+    r'["\'](csrf_token|xsrf_token|x-csrf-token)["\']\s*:\s*["\']([^"\']+)["\']',
+    r'name=["\'](_csrf|csrf-token)["\'][^>]*value=["\']([^"\']+)["\']',
+    r'(session_id|sid|jsessionid)=([a-zA-Z0-9\-_]{16,})',
+    r'["\'](api_key|access_token)["\']\s*:\s*["\']([^"\']+)["\']',
+    r'(x-api-key|authorization):\s*([a-zA-Z0-9\-_.]+)',
+]
+
+_WORDS = ['data', 'items', 'name', 'value', 'user', 'count', 'true', 'false', 'null', 'id']
+
+_TOKENS = [
+    '"csrf_token": "{}"',
+    '"access_token": "{}"',
+    '<input name="_csrf" value="{}">',
+    'jsessionid={}',
+    'Bearer a{}.b{}.c{}',
+]
+
+
+def make_body(rng: random.Random, size: int) -> str:
+    """Build a JSON/HTML-like body of about ``size`` characters with a few tokens."""
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.01:
+            secret = '%032x' % rng.getrandbits(128)
+            part = rng.choice(_TOKENS).format(secret, secret, secret)
+        else:
+            part = '"%s": "%s%d", ' % (rng.choice(_WORDS), rng.choice(_WORDS), rng.randrange(1000))
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)
+
+
+def combined_scan(analyzer: TokenAnalyzer) -> Callable[[str], int]:
+    """Count tokens using the analyzer's single combined regex."""
+    def scan(text: str) -> int:
+        return sum(1 for _ in analyzer.scan(text))
+    return scan
+
+
+def per_pattern_scan() -> Callable[[str], int]:
+    """Count tokens with one regex pass per pattern, as the TypeScript analyzer does."""
+    patterns = [re.compile(pattern, re.IGNORECASE) for pattern in _SEPARATE_PATTERNS]
+    
+    def scan(text: str) -> int:
+        count = 0
+        for pattern in patterns:
+            for match in pattern.finditer(text):
+                if len(match.group(match.lastindex)) >= 10:
+                    count += 1
+        return count
+    return scan
+
+
+def throughput(scan: Callable[[str], int], bodies: List[str]) -> float:
+    """Return the scan throughput over ``bodies`` in MB/s."""
+    total = sum(len(body) for body in bodies)
+    start = time.perf_counter()
+    for body in bodies:
+        scan(body)
+    elapsed = time.perf_counter() - start
+    return total / elapsed / 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print MB/s for each strategy."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--bodies', type=int, default=200, help='Number of bodies to scan')
+    parser.add_argument('--body-size', type=int, default=64 * 1024, help='Approximate size of each body')
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    bodies = [make_body(rng, args.body_size) for _ in range(args.bodies)]
+    analyzer = TokenAnalyzer()
+    
+    combined = throughput(combined_scan(analyzer), bodies)
+    separate = throughput(per_pattern_scan(), bodies)
+    
+    print(f'Scanned:              {sum(map(len, bodies)) / 1e6:.1f} MB in {args.bodies} bodies')
+    print(f'Combined regex:       {combined:8.1f} MB/s')
+    print(f'One regex per type:   {separate:8.1f} MB/s')
+    print(f'Speedup:              {combined / separate:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
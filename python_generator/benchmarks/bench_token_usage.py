@@ -0,0 +1,113 @@
+"""
+Benchmark for finding token dependency edges.
+
+Compares TokenUsageIndex against the TypeScript approach of serializing
+each request and substring-searching it once per detected token.
+
+Usage:
+    python benchmarks/bench_token_usage.py [--entries N] [--tokens N]
+"""
+
+import argparse
+import json
+import random
+import string
+import sys
+import os
+import time
+from typing import List, Set, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from generator.analyzer import TokenUsageIndex
+from generator.types import (
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    RequestBody,
+    TokenInfo,
+)
+
+
+_ALPHABET = string.ascii_letters + string.digits + '-_'
+
+
+def make_tokens(rng: random.Random, count: int, entries: int) -> List[TokenInfo]:
+    """Build tokens defined by random entries."""
+    return [
+        TokenInfo(
+            type='APIKey',
+            value=''.join(rng.choice(_ALPHABET) for _ in range(rng.choice([16, 32, 64]))),
+            source_entry=rng.randrange(entries),
+            source_location='body'
+        )
+        for _ in range(count)
+    ]
+
+
+def make_entries(rng: random.Random, count: int, tokens: List[TokenInfo]) -> List[SemanticHarEntry]:
+    """Build requests, a third of which send one of the tokens."""
+    entries = []
+    for i in range(count):
+        headers = {
+            'host': 'api.example.com',
+            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+            'accept': 'application/json, text/plain, */*',
+            'x-request-id': f'{i:032x}',
+        }
+        if i % 3 == 0:
+            headers['authorization'] = 'Bearer ' + rng.choice(tokens).value
+        entries.append(SemanticHarEntry(
+            request=SemanticHarRequest(
+                url=f'https://api.example.com/v1/items/{i}?page={i % 10}',
+                method='POST',
+                headers=headers,
+                cookies={},
+                body=RequestBody(data=json.dumps({'id': i, 'name': f'item-{i}'}), content_type='json')
+            ),
+            response=SemanticHarResponse(status=200)
+        ))
+    return entries
+
+
+def substring_edges(entries: List[SemanticHarEntry], tokens: List[TokenInfo]) -> Set[Tuple[int, int]]:
+    """Find edges the way the TypeScript builder does."""
+    edges = set()
+    for i, entry in enumerate(entries):
+        request = entry.request
+        text = json.dumps(request.headers) + (request.body.data if request.body else '') + request.url
+        for token in tokens:
+            if i > token.source_entry and token.value in text:
+                edges.add((i, token.source_entry))
+    return edges
+
+
+def main() -> None:
+    """Run the benchmark and print timings for both strategies."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--entries', type=int, default=20_000, help='Number of requests')
+    parser.add_argument('--tokens', type=int, default=2_000, help='Number of detected tokens')
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    tokens = make_tokens(rng, args.tokens, args.entries)
+    entries = make_entries(rng, args.entries, tokens)
+    
+    start = time.perf_counter()
+    index = TokenUsageIndex(tokens)
+    indexed = set(index.dependencies(entries))
+    indexed_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    reference = substring_edges(entries, tokens)
+    substring_time = time.perf_counter() - start
+    
+    assert indexed == reference
+    print(f'Entries / tokens:     {args.entries} / {args.tokens} ({len(indexed)} edges)')
+    print(f'TokenUsageIndex:      {indexed_time:8.2f} s')
+    print(f'Per-token substring:  {substring_time:8.2f} s')
+    print(f'Speedup:              {substring_time / indexed_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
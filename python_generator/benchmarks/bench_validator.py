@@ -0,0 +1,111 @@
+"""
+Throughput benchmark for LoliCodeValidator.
+
+Validates a synthetic generated script of the requested size in memory and
+fed line by line, and compares against the line-by-line validation the
+validator used before it became single-pass.
+
+Usage:
+    python benchmarks/bench_validator.py [--megabytes N]
+"""
+
+import argparse
+import io
+import sys
+import os
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from generator.validators import LoliCodeValidator
+
+
+_SECTION = '''# ─────────────────────────────────────────────────────────────
+# Request {i}: POST /v1/items/{i}
+# ─────────────────────────────────────────────────────────────
+REQUEST "https://api.example.com/v1/items/{i}?page={page}" POST
+  HEADER "accept: application/json"
+  HEADER "x-request-id: {i:032x}"
+  COOKIE "sid: {i:x}"
+  CONTENT "{{\\"id\\": {i}, \\"name\\": \\"item-{i}\\"}}"
+  CONTENTTYPE "application/json"
+
+KEYCHECK SUCCESS
+  KEY "<RESPONSE.STATUS>" Equal "200"
+
+PARSE "<SOURCE>" JSON "token" -> VAR "TOKEN"
+
+FUNCTION Delay "1000"'''
+
+
+def make_script(megabytes: float) -> str:
+    """Build a script of about ``megabytes`` MB from repeated sections."""
+    sections: List[str] = []
+    size = 0
+    i = 0
+    while size < megabytes * 1_000_000:
+        section = _SECTION.format(i=i, page=i % 10)
+        sections.append(section)
+        size += len(section.encode('utf-8')) + 2
+        i += 1
+    return '\n\n'.join(sections)
+
+
+def line_by_line(script: str) -> List[str]:
+    """Validate the way the previous implementation did."""
+    errors = []
+    if not script.strip():
+        errors.append('Script is empty.')
+    if 'undefined' in script:
+        errors.append('Script contains "undefined" values.')
+    if 'None' in script:
+        errors.append('Script contains "None" values.')
+    in_parse_block = False
+    for i, line in enumerate(script.split('\n'), 1):
+        stripped = line.strip()
+        if stripped.startswith('PARSE'):
+            in_parse_block = True
+            continue
+        elif in_parse_block and (stripped.startswith('KEYCHECK') or stripped.startswith('REQUEST') or stripped.startswith('FUNCTION')):
+            in_parse_block = False
+        if in_parse_block:
+            continue
+        if 'CONTENT' not in line and stripped.count('"') % 2 != 0:
+            errors.append(f'Line {i}: Unmatched quotes')
+        if stripped.startswith('REQUEST') and len(stripped) < 10:
+            errors.append(f'Line {i}: Empty or invalid REQUEST block')
+    return errors
+
+
+def main() -> None:
+    """Run the benchmark and print the throughput of each mode."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--megabytes', type=float, default=50, help='Script size in MB')
+    args = parser.parse_args()
+    
+    script = make_script(args.megabytes)
+    megabytes = len(script.encode('utf-8')) / 1_000_000
+    validator = LoliCodeValidator()
+    
+    start = time.perf_counter()
+    result = validator.validate(script)
+    single_pass_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    streamed = validator.validate_stream(io.StringIO(script))
+    streamed_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    reference = line_by_line(script)
+    reference_time = time.perf_counter() - start
+    
+    assert result.errors == streamed.errors == reference
+    print(f'Script size:        {megabytes:8.1f} MB')
+    print(f'Single pass:        {megabytes / single_pass_time:8.1f} MB/s')
+    print(f'Streamed lines:     {megabytes / streamed_time:8.1f} MB/s')
+    print(f'Line by line:       {megabytes / reference_time:8.1f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+Deterministic synthetic HAR captures for benchmarks.
+
+Generates browser sessions against a few shop hosts: a landing page that
+sets a session cookie, a login form with a CSRF token, a JSON login that
+returns bearer and refresh tokens, a redirect to the account page,
+authorized API calls, static assets, token refreshes, large JSON uploads
+and a logout redirect. The same count and seed always give the same
+capture, byte for byte.
+
+Usage:
+    python benchmarks/synthetic_har.py --entries N -o capture.har [--seed N]
+"""
+
+import argparse
+import base64
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+# Every this many API calls, a session uploads a large JSON body
+LARGE_BODY_EVERY = 100
+
+# Characters of each large upload body
+LARGE_BODY_SIZE = 32 * 1024
+
+_HOSTS = ('shop.example.com', 'store.example.net', 'market.example.org')
+
+_BROWSER_HEADERS = [
+    ('User-Agent', 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'),
+    ('Accept-Language', 'en-US,en;q=0.9'),
+    ('Accept-Encoding', 'gzip, deflate, br'),
+]
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _Session:
+    """State of one browser session while its requests are generated."""
+    
+    def __init__(self, rng: random.Random, number: int, clock: List[float]):
+        self.rng = rng
+        self.host = _HOSTS[number % len(_HOSTS)]
+        self.origin = f'https://{self.host}'
+        self.cookies: Dict[str, str] = {}
+        self.referer: Optional[str] = None
+        self.access_token: Optional[str] = None
+        self.clock = clock
+    
+    def token(self, bits: int = 128) -> str:
+        """Return a random hex token."""
+        return f'{self.rng.getrandbits(bits):0{bits // 4}x}'
+    
+    def jwt(self, subject: str) -> str:
+        """Return a JWT-shaped bearer token."""
+        header = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=').decode()
+        claims = json.dumps({'sub': subject, 'iat': int(self.clock[0]), 'jti': self.token(64)}, separators=(',', ':'))
+        payload = base64.urlsafe_b64encode(claims.encode()).rstrip(b'=').decode()
+        return f'{header}.{payload}.{self.token(256)}'
+    
+    def entry(
+        self,
+        method: str,
+        path: str,
+        status: int = 200,
+        mime_type: str = 'application/json',
+        response_text: str = '',
+        body: Optional[str] = None,
+        body_mime: str = 'application/json',
+        set_cookies: Optional[Dict[str, str]] = None,
+        location: Optional[str] = None,
+        accept: str = 'application/json',
+        authorized: bool = False
+    ) -> Dict[str, Any]:
+        """Build one HAR entry and advance the session state."""
+        url = self.origin + path
+        headers = [('Host', self.host), ('Accept', accept)] + _BROWSER_HEADERS
+        if self.referer:
+            headers.append(('Referer', self.referer))
+        if authorized and self.access_token:
+            headers.append(('Authorization', f'Bearer {self.access_token}'))
+        if self.cookies:
+            headers.append(('Cookie', '; '.join(f'{k}={v}' for k, v in self.cookies.items())))
+        request: Dict[str, Any] = {
+            'method': method,
+            'url': url,
+            'httpVersion': 'HTTP/2',
+            'cookies': [{'name': k, 'value': v} for k, v in self.cookies.items()],
+            'queryString': [],
+            'headersSize': -1,
+            'bodySize': 0,
+        }
+        if body is not None:
+            headers += [('Origin', self.origin), ('Content-Type', body_mime), ('Content-Length', str(len(body)))]
+            request['postData'] = {'mimeType': body_mime, 'text': body}
+            request['bodySize'] = len(body)
+        request['headers'] = [{'name': name, 'value': value} for name, value in headers]
+        
+        response_headers = [
+            ('content-type', mime_type),
+            ('content-length', str(len(response_text))),
+            ('cache-control', 'no-store'),
+        ]
+        response_cookies = []
+        for name, value in (set_cookies or {}).items():
+            response_headers.append(('set-cookie', f'{name}={value}; Path=/; Secure; HttpOnly'))
+            response_cookies.append({'name': name, 'value': value, 'path': '/', 'httpOnly': True, 'secure': True})
+            self.cookies[name] = value
+        if location is not None:
+            response_headers.append(('location', location))
+        
+        elapsed = round(self.rng.uniform(15, 400), 3)
+        started = _START + timedelta(milliseconds=self.clock[0])
+        self.clock[0] += elapsed + self.rng.uniform(5, 50)
+        if method == 'GET' and mime_type == 'text/html':
+            self.referer = url
+        return {
+            'startedDateTime': started.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'time': elapsed,
+            'request': request,
+            'response': {
+                'status': status,
+                'statusText': {200: 'OK', 201: 'Created', 302: 'Found'}.get(status, ''),
+                'httpVersion': 'HTTP/2',
+                'cookies': response_cookies,
+                'headers': [{'name': name, 'value': value} for name, value in response_headers],
+                'content': {'size': len(response_text), 'mimeType': mime_type, 'text': response_text},
+                'redirectURL': location or '',
+                'headersSize': -1,
+                'bodySize': len(response_text),
+            },
+            'cache': {},
+            'timings': {'send': 0.1, 'wait': elapsed - 0.2, 'receive': 0.1},
+        }
+
+
+def _page(title: str, extra: str = '') -> str:
+    """Return a small HTML page."""
+    return f'<!doctype html><html><head><title>{title}</title></head><body><h1>{title}</h1>{extra}</body></html>'
+
+
+def _session_entries(
+    session: _Session,
+    counter: List[int],
+    large_body_every: int,
+    large_body_size: int
+) -> Iterator[Dict[str, Any]]:
+    """Yield the requests of one session, from landing page to logout."""
+    rng = session.rng
+    user = f'user{rng.randrange(10 ** 6)}@example.com'
+    
+    yield session.entry('GET', '/', mime_type='text/html', accept='text/html',
+                        response_text=_page('Home'), set_cookies={'sid': session.token()})
+    csrf = session.token()
+    yield session.entry('GET', '/login', mime_type='text/html', accept='text/html',
+                        response_text=_page('Sign in', f'<form><input type="hidden" name="csrf" value="{csrf}"></form>'))
+    access, refresh = session.jwt(user), session.token(256)
+    yield session.entry('POST', '/api/auth/login', body=json.dumps({'username': user, 'password': 'hunter2', 'csrf': csrf}),
+                        response_text=json.dumps({'access_token': access, 'refresh_token': refresh, 'expires_in': 900}),
+                        set_cookies={'auth': session.token()})
+    session.access_token = access
+    yield session.entry('GET', '/account', status=302, mime_type='text/html', accept='text/html',
+                        location='/account/overview')
+    yield session.entry('GET', '/account/overview', mime_type='text/html', accept='text/html',
+                        response_text=_page('Account', f'<p>{user}</p>'))
+    
+    for _ in range(rng.randint(2, 4)):
+        extension, mime_type = rng.choice((('js', 'application/javascript'), ('css', 'text/css')))
+        yield session.entry('GET', f'/static/{session.token(32)}.{extension}', mime_type=mime_type, accept='*/*',
+                            response_text='!function(){' + 'var a=1;' * rng.randint(20, 200) + '}();')
+    
+    for call in range(rng.randint(10, 40)):
+        counter[0] += 1
+        if large_body_every and counter[0] % large_body_every == 0:
+            # Hex, since the validator rejects any "None" in a script
+            upload = json.dumps({'name': f'report-{call}.bin', 'data': session.token(large_body_size * 4)})
+            yield session.entry('POST', '/api/v1/uploads', status=201, body=upload, authorized=True,
+                                response_text=json.dumps({'id': session.token(64), 'size': len(upload)}))
+        elif call % 7 == 6:
+            refresh_token = refresh
+            access, refresh = session.jwt(user), session.token(256)
+            yield session.entry('POST', '/api/auth/refresh', body=json.dumps({'refresh_token': refresh_token}),
+                                response_text=json.dumps({'access_token': access, 'refresh_token': refresh}))
+            session.access_token = access
+        elif call % 3 == 2:
+            item = rng.randrange(10 ** 5)
+            yield session.entry('POST', '/api/v1/cart/items', authorized=True,
+                                body=f'item_id={item}&quantity={rng.randint(1, 5)}&csrf={csrf}',
+                                body_mime='application/x-www-form-urlencoded',
+                                response_text=json.dumps({'cart': session.token(64), 'items': call}))
+        else:
+            page = rng.randint(1, 50)
+            items = [{'id': rng.randrange(10 ** 5), 'name': f'Item {rng.randrange(10 ** 4)}',
+                      'price': round(rng.uniform(1, 500), 2)} for _ in range(rng.randint(5, 30))]
+            yield session.entry('GET', f'/api/v1/items?page={page}&sort=price', authorized=True,
+                                response_text=json.dumps({'page': page, 'items': items}))
+    
+    yield session.entry('GET', '/logout', status=302, mime_type='text/html', accept='text/html', location='/')
+
+
+def generate_entries(
+    count: int,
+    seed: int = 0,
+    large_body_every: int = LARGE_BODY_EVERY,
+    large_body_size: int = LARGE_BODY_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Generate HAR entries from consecutive browser sessions.
+    
+    Args:
+        count: Number of entries
+        seed: Random seed; equal seeds give equal entries
+        large_body_every: Upload a large body every this many API calls
+            (0 disables uploads)
+        large_body_size: Characters of each upload body
+    
+    Returns:
+        Raw HAR entries
+    """
+    rng = random.Random(seed)
+    clock = [0.0]
+    counter = [0]
+    entries: List[Dict[str, Any]] = []
+    number = 0
+    while len(entries) < count:
+        session = _Session(rng, number, clock)
+        for entry in _session_entries(session, counter, large_body_every, large_body_size):
+            entries.append(entry)
+            if len(entries) == count:
+                break
+        number += 1
+    return entries
+
+
+def generate_har(count: int, seed: int = 0, **options: int) -> Dict[str, Any]:
+    """Generate a HAR document; ``options`` are passed to ``generate_entries``."""
+    return {
+        'log': {
+            'version': '1.2',
+            'creator': {'name': 'synthetic_har', 'version': '1.0'},
+            'pages': [],
+            'entries': generate_entries(count, seed, **options),
+        }
+    }
+
+
+def write_har(path: str, count: int, seed: int = 0, **options: int) -> int:
+    """
+    Write a synthetic HAR file.
+    
+    Returns:
+        Size of the file in bytes
+    """
+    data = json.dumps(generate_har(count, seed, **options)).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def main() -> None:
+    """Write a capture and print its size."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--entries', type=int, default=10_000, help='Number of entries')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('-o', '--output', required=True, help='HAR file to write')
+    args = parser.parse_args()
+    
+    size = write_har(args.output, args.entries, args.seed)
+    print(f'Wrote {args.entries} entries ({size / 1_000_000:.1f} MB) to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
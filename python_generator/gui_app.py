@@ -5,12 +5,13 @@ A comprehensive graphical user interface for generating LoliCode scripts.
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import json
-import asyncio
 import sys
 import os
+import queue
+from array import array
+from itertools import compress
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Sequence, Any
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
@@ -22,13 +23,273 @@ from generator import (
     SemanticHarRequest,
     SemanticHarResponse,
     RequestBody,
-    DependencyMatrix,
     CustomHeader,
     CustomAssertion,
     VariableExtraction,
+    EntryStore,
+    EntryTable,
+    Selection,
+    FilterRule,
+    FILTER_TARGETS,
+    FILTER_OPERATORS,
+    filter_mask,
+    BackgroundGenerator,
+    BackgroundLoader,
+    LoadBatch,
+    LoadResult,
+    TrigramIndex,
 )
 
 
+# Delay before regenerating the preview after a change, in seconds
+PREVIEW_DEBOUNCE = 0.3
+
+# Characters inserted into the preview text per Tk event loop tick
+PREVIEW_INSERT_CHUNK = 256 * 1024
+
+# Milliseconds between checks for HAR loading progress
+LOAD_POLL_INTERVAL = 50
+
+# Rows inserted into the data tree per Tk event loop tick while loading
+DATA_TREE_CHUNK = 500
+
+# Delay before applying the search box text, in milliseconds
+SEARCH_DEBOUNCE = 150
+
+# Fallback Treeview row and heading heights in pixels, when the theme has none
+ROW_HEIGHT = 20
+HEADING_HEIGHT = 24
+
+CHECKED = "☑"
+UNCHECKED = "☐"
+
+
+class VirtualRequestList:
+    """
+    Request selection list that only creates widgets for the visible rows.
+    
+    A Treeview holds a fixed pool of items, one per row that fits on
+    screen, and scrolling rewrites their values from the entry table. The
+    widget count therefore stays constant however many requests are
+    loaded. Clicking a row toggles its checkbox; clicking a heading sorts
+    by that column (again for descending) using the table's precomputed
+    sort keys, or puts the checked entries first for the checkbox column.
+    The selection is a ``Selection`` bitset, so bulk changes only redraw
+    the visible rows.
+    
+    ``set_filter`` hides the entries outside a search result without
+    changing the sort order; while it is set, select all, deselect all
+    and invert only act on the entries still shown.
+    """
+    
+    COLUMNS = (
+        ("check", "", 40),
+        ("index", "#", 70),
+        ("method", "Method", 80),
+        ("url", "URL", 800),
+        ("status", "Status", 70),
+    )
+    
+    def __init__(self, parent):
+        """
+        Create the list widgets.
+        
+        Args:
+            parent: Container to pack the list into
+        """
+        self.table: Optional[EntryTable] = None
+        self.selection = Selection(0)
+        # Entry index shown at each position of the list
+        self.order: Sequence[int] = range(0)
+        # Every entry in sort order, and one flag per entry shown (None for all)
+        self._sorted: Sequence[int] = range(0)
+        self.visible: Optional[bytearray] = None
+        self.sort_column: Optional[str] = None
+        self.sort_descending = False
+        self.offset = 0
+        self.items: List[str] = []
+        self.row_height = int(ttk.Style().lookup("Treeview", "rowheight") or ROW_HEIGHT)
+        
+        self.tree = ttk.Treeview(parent, columns=[name for name, _, _ in self.COLUMNS],
+                                 show="headings", selectmode="none")
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading, command=lambda n=name: self.sort_by(n))
+            self.tree.column(name, width=width, stretch=(name == "url"),
+                             anchor=tk.W if name == "url" else tk.CENTER)
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self._on_scrollbar)
+        
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    
+    def set_table(self, table: EntryTable):
+        """Show a new set of entries, all unselected and in capture order."""
+        self.table = table
+        self.selection = Selection(len(table))
+        self._sorted = range(len(table))
+        self.visible = None
+        self.sort_column = None
+        self.sort_descending = False
+        self._update_order()
+    
+    def set_filter(self, indices: Optional[Sequence[int]]):
+        """Show only the given entries, or every entry for None."""
+        if indices is None or self.table is None:
+            self.visible = None
+        else:
+            self.visible = bytearray(len(self.table))
+            for index in indices:
+                self.visible[index] = 1
+        self._update_order()
+    
+    def _update_order(self):
+        """Rebuild the shown order from the sort order and filter, back at the top."""
+        visible = self.visible
+        if visible is None:
+            self.order = self._sorted
+        else:
+            self.order = array("I", compress(self._sorted, map(visible.__getitem__, self._sorted)))
+        self.offset = 0
+        self._render()
+    
+    def select_all(self):
+        """Select every shown entry."""
+        if self.visible is None:
+            self.selection.select_all()
+        else:
+            self.selection.select_where(self.visible)
+        self._render()
+    
+    def deselect_all(self):
+        """Deselect every shown entry."""
+        if self.visible is None:
+            self.selection.clear()
+        else:
+            self.selection.deselect_where(self.visible)
+        self._render()
+    
+    def invert(self):
+        """Invert the selection of the shown entries."""
+        if self.visible is None:
+            self.selection.invert()
+        else:
+            self.selection.invert_where(self.visible)
+        self._render()
+    
+    def select_where(self, mask, select: bool = True):
+        """Select (or deselect) the entries of a filter mask."""
+        if select:
+            self.selection.select_where(mask)
+        else:
+            self.selection.deselect_where(mask)
+        self._render()
+    
+    def toggle(self, index: int):
+        """Toggle the selection of one entry."""
+        self.selection.toggle(index)
+        self._render()
+    
+    def sort_by(self, column: str):
+        """Sort by a column; sorting by the same column again reverses it."""
+        if self.table is None:
+            return
+        descending = column == self.sort_column and not self.sort_descending
+        if column == "index":
+            count = len(self.table)
+            self._sorted = range(count - 1, -1, -1) if descending else range(count)
+        elif column == "check":
+            # Checked entries first (last when descending), each group in capture order
+            checked = self.selection.indices()
+            flags = bytearray(len(self.table))
+            for index in checked:
+                flags[index] = 1
+            unchecked = [index for index, flag in enumerate(flags) if not flag]
+            self._sorted = array("I", unchecked + checked if descending else checked + unchecked)
+        else:
+            self._sorted = array("I", self.table.argsort(column, descending))
+        self.sort_column = column
+        self.sort_descending = descending
+        self._update_order()
+    
+    def scroll(self, rows: int):
+        """Scroll by a number of rows."""
+        self._scroll_to(self.offset + rows)
+        return "break"
+    
+    def _scroll_to(self, offset: int):
+        """Show the rows starting at ``offset`` of the current order."""
+        offset = max(0, min(offset, len(self.order) - len(self.items)))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+    
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None):
+        """Handle scrollbar drags and clicks."""
+        if action == "moveto":
+            self._scroll_to(round(float(amount) * len(self.order)))
+        elif action == "scroll":
+            step = len(self.items) if unit == "pages" else 1
+            self._scroll_to(self.offset + int(amount) * step)
+    
+    def _on_wheel(self, event):
+        """Scroll with the mouse wheel (Windows and macOS)."""
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll(-3 * delta)
+    
+    def _on_resize(self, event):
+        """Resize the item pool to the rows that fit in the widget."""
+        rows = max(1, (event.height - HEADING_HEIGHT) // self.row_height)
+        while len(self.items) < rows:
+            self.items.append(self.tree.insert("", "end", values=()))
+        while len(self.items) > rows:
+            self.tree.delete(self.items.pop())
+        self._scroll_to(self.offset)
+        self._render()
+    
+    def _on_click(self, event):
+        """Toggle the entry of a clicked row."""
+        if self.tree.identify_region(event.x, event.y) != "cell":
+            return None
+        item = self.tree.identify_row(event.y)
+        if item in self.items:
+            position = self.offset + self.items.index(item)
+            if position < len(self.order):
+                self.toggle(self.order[position])
+        return "break"
+    
+    def _render(self):
+        """Write the visible entries into the item pool."""
+        table = self.table
+        for row, item in enumerate(self.items):
+            position = self.offset + row
+            if table is None or position >= len(self.order):
+                self.tree.item(item, values=())
+                continue
+            index = self.order[position]
+            url = table.url(index)
+            if len(url) > 100:
+                url = url[:97] + "..."
+            self.tree.item(item, values=(
+                CHECKED if index in self.selection else UNCHECKED,
+                index,
+                table.method_name(index),
+                url,
+                int(table.status[index])
+            ))
+        
+        count = len(self.order)
+        if count:
+            first = self.offset / count
+            self.scrollbar.set(first, min(1.0, first + len(self.items) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
 class LoliCodeGUI:
     """Main GUI application for LoliCode Generator."""
     
@@ -38,8 +299,11 @@ class LoliCodeGUI:
         self.root.geometry("1400x900")
         
         # Data storage
-        self.har_data: List[Dict[str, Any]] = []
-        self.entries: List[SemanticHarEntry] = []
+        self.entries: Sequence[SemanticHarEntry] = []
+        self.entry_store: Optional[EntryStore] = None
+        self.entry_table: Optional[EntryTable] = None
+        self.search_index: Optional[TrigramIndex] = None
+        self._search_job: Optional[str] = None
         self.selected_indices: List[int] = []
         self.custom_headers: Dict[int, List[CustomHeader]] = {}
         self.custom_assertions: Dict[int, List[CustomAssertion]] = {}
@@ -51,12 +315,22 @@ class LoliCodeGUI:
             'retry_count': 0
         }
         
-        # Generator instance
+        # Generator instance, run by a background worker thread
         self.generator = LoliCodeGenerator()
+        self.preview_worker = BackgroundGenerator(self.generator, post=self._post_to_ui)
+        self.preview_generated = False
+        self._preview_insert_token = 0
+        self._preview_inserting = False
+        
+        # HAR file being loaded on a worker thread, and its batch being shown
+        self.loader: Optional[BackgroundLoader] = None
+        self._load_batch: Optional[LoadBatch] = None
+        self._load_position = 0
         
         # Setup UI
         self._setup_ui()
         self._apply_theme()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
     def _setup_ui(self):
         """Setup the main UI components."""
@@ -161,28 +435,24 @@ Tip: Use the toolbar buttons for quick access to common actions!
         ttk.Button(controls, text="✓ Select All", command=self._select_all_requests).pack(side=tk.LEFT, padx=2)
         ttk.Button(controls, text="✗ Deselect All", command=self._deselect_all_requests).pack(side=tk.LEFT, padx=2)
         ttk.Button(controls, text="🔄 Invert Selection", command=self._invert_selection).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="🔍 Select by Filter", command=self._show_filter_dialog).pack(side=tk.LEFT, padx=2)
         
-        # Requests listbox with checkboxes
-        list_frame = ttk.LabelFrame(frame, text="Requests", padding="10")
-        list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        
-        # Create canvas for scrollable checkboxes
-        canvas = tk.Canvas(list_frame)
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=canvas.yview)
-        self.requests_frame = ttk.Frame(canvas)
+        # Live search over URLs, headers and bodies
+        search = ttk.Frame(frame)
+        search.pack(fill=tk.X, pady=5)
         
-        self.requests_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        ttk.Label(search, text="Search:").pack(side=tk.LEFT, padx=2)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self._on_search_changed)
+        ttk.Entry(search, textvariable=self.search_var, width=50).pack(side=tk.LEFT, padx=2)
+        self.search_count_var = tk.StringVar()
+        ttk.Label(search, textvariable=self.search_count_var).pack(side=tk.LEFT, padx=10)
         
-        canvas.create_window((0, 0), window=self.requests_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Requests list with a checkbox column; only visible rows are drawn
+        list_frame = ttk.LabelFrame(frame, text="Requests (click a row to toggle, a heading to sort)", padding="10")
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        self.request_vars: List[tk.BooleanVar] = []
+        self.request_list = VirtualRequestList(list_frame)
         
     def _create_headers_tab(self):
         """Create the custom headers tab."""
@@ -530,8 +800,18 @@ Generated by: LoliCode Generator GUI v1.0
     def _create_status_bar(self, parent):
         """Create the status bar."""
         self.status_var = tk.StringVar(value="Ready")
-        status_bar = ttk.Label(parent, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+        status_bar = ttk.Frame(parent)
         status_bar.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=5)
+        ttk.Label(status_bar, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W).pack(
+            side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Loading progress, shown while a HAR file loads
+        self.load_frame = ttk.Frame(status_bar)
+        self.load_progress = ttk.Progressbar(self.load_frame, orient=tk.HORIZONTAL, length=200, mode="determinate")
+        self.load_progress.pack(side=tk.LEFT, padx=5)
+        self.load_var = tk.StringVar(value="")
+        ttk.Label(self.load_frame, textvariable=self.load_var).pack(side=tk.LEFT)
+        ttk.Button(self.load_frame, text="Cancel", command=self._cancel_load).pack(side=tk.LEFT, padx=5)
         
     def _apply_theme(self):
         """Apply visual theme to the application."""
@@ -556,27 +836,100 @@ Generated by: LoliCode Generator GUI v1.0
         if not filename:
             return
             
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                har_data = json.load(f)
+        # Clear the previous data; rows appear as the worker loads them
+        self._stop_loading()
+        self._close_entry_store()
+        self._process_har_data([])
+            
+        # Dependency detection reads response cookies, headers and bodies
+        self.loader = BackgroundLoader(filename, profile='analysis')
+        self.load_progress.configure(value=0, maximum=1)
+        self.load_var.set("Opening...")
+        self.load_frame.pack(side=tk.RIGHT)
+        self._update_status(f"Loading {os.path.basename(filename)}...")
+        self.root.after(LOAD_POLL_INTERVAL, self._poll_loader, self.loader)
+    
+    def _poll_loader(self, loader: BackgroundLoader):
+        """Show the next rows of a HAR file being loaded, a bounded number per tick."""
+        if loader is not self.loader:
+            return
+        inserted = 0
+        while inserted < DATA_TREE_CHUNK:
+            batch = self._load_batch
+            if batch is not None:
+                rows = batch.rows[self._load_position:self._load_position + DATA_TREE_CHUNK - inserted]
+                self._insert_data_rows(batch.start + self._load_position, rows)
+                self._load_position += len(rows)
+                inserted += len(rows)
+                if self._load_position == len(batch.rows):
+                    self._load_batch = None
+                continue
             
-            # Parse HAR file
-            if 'log' in har_data and 'entries' in har_data['log']:
-                self.har_data = har_data['log']['entries']
+            try:
+                message = loader.queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(message, LoadBatch):
+                self._load_batch = message
+                self._load_position = 0
+                self.load_progress.configure(value=message.bytes_read, maximum=max(message.total_bytes, 1))
+                self.load_var.set(f"{message.start + len(message.rows):,} entries, "
+                                  f"{message.bytes_read / 1e6:.1f} / {message.total_bytes / 1e6:.1f} MB")
+            elif isinstance(message, LoadResult):
+                self._finish_loading(message)
+                return
             else:
-                self.har_data = har_data if isinstance(har_data, list) else []
+                self._stop_loading()
+                self._update_status("Failed to load HAR file")
+                messagebox.showerror("Error", f"Failed to load HAR file: {str(message)}")
+                return
             
-            self._process_har_data()
-            self._update_status(f"Loaded {len(self.entries)} requests from HAR file")
-            messagebox.showinfo("Success", f"Successfully loaded {len(self.entries)} requests!")
+        # Come back right away while rows are waiting, else poll the worker
+        delay = 1 if inserted >= DATA_TREE_CHUNK else LOAD_POLL_INTERVAL
+        self.root.after(delay, self._poll_loader, loader)
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load HAR file: {str(e)}")
+    def _finish_loading(self, result: LoadResult):
+        """Use a fully loaded HAR file."""
+        self._stop_loading()
+        store = result.store
+        self.entry_store = store
+        self._process_har_data(store, result.table, result.search_index)
+        
+        message = f"Loaded {len(self.entries)} requests from HAR file"
+        if store.entries_skipped:
+            message += f" ({store.entries_skipped} malformed entries skipped)"
+        self._update_status(message)
+        messagebox.showinfo("Success", f"Successfully loaded {len(self.entries)} requests!")
+    
+    def _stop_loading(self):
+        """Cancel a load in progress, if any, and hide its progress."""
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader = None
+        self._load_batch = None
+        self.load_frame.pack_forget()
+    
+    def _cancel_load(self):
+        """Cancel loading a HAR file and clear the rows shown so far."""
+        if self.loader is None:
+            return
+        self._stop_loading()
+        self._process_har_data([])
+        self._update_status("Loading cancelled")
+    
+    def _close_entry_store(self):
+        """Release the memory-mapped store of the previously loaded HAR file."""
+        self.preview_worker.cancel()
+        if self.entry_store is not None:
+            self.entry_store.close()
+            self.entry_store = None
             
     def _load_example(self):
         """Load example data."""
+        self._stop_loading()
+        self._close_entry_store()
         # Create example entries
-        self.entries = [
+        entries = [
             SemanticHarEntry(
                 request=SemanticHarRequest(
                     url='https://example.com/login',
@@ -622,8 +975,7 @@ Generated by: LoliCode Generator GUI v1.0
             ]
         }
         
-        self._update_data_view()
-        self._update_requests_list()
+        self._process_har_data(entries)
         self._update_extractions_tree()
         self._update_status("Loaded example data with 3 requests")
         messagebox.showinfo("Example Loaded", "Example data loaded successfully!\n\nThis shows a typical login flow:\n1. GET login page\n2. POST credentials\n3. GET protected resource")
@@ -645,112 +997,151 @@ Generated by: LoliCode Generator GUI v1.0
                     "Yes" if extraction.is_global else "No"
                 ))
         
-    def _process_har_data(self):
-        """Process HAR data into entries."""
-        self.entries = []
-        
-        for item in self.har_data:
-            try:
-                request_data = item.get('request', {})
-                response_data = item.get('response', {})
-                
-                # Parse headers
-                headers = {}
-                for h in request_data.get('headers', []):
-                    headers[h.get('name', '').lower()] = h.get('value', '')
-                
-                # Parse cookies
-                cookies = {}
-                for c in request_data.get('cookies', []):
-                    cookies[c.get('name', '')] = c.get('value', '')
-                
-                # Parse body
-                body = None
-                post_data = request_data.get('postData', {})
-                if post_data:
-                    content_type = 'json' if 'json' in post_data.get('mimeType', '') else 'form'
-                    body = RequestBody(
-                        data=post_data.get('text', ''),
-                        content_type=content_type
-                    )
-                
-                entry = SemanticHarEntry(
-                    request=SemanticHarRequest(
-                        url=request_data.get('url', ''),
-                        method=request_data.get('method', 'GET'),
-                        headers=headers,
-                        cookies=cookies,
-                        body=body
-                    ),
-                    response=SemanticHarResponse(
-                        status=response_data.get('status', 0)
-                    )
-                )
-                
-                self.entries.append(entry)
-            except Exception as e:
-                print(f"Error processing HAR entry: {e}")
-                continue
+    def _process_har_data(
+        self,
+        entries: Sequence[SemanticHarEntry],
+        table: Optional[EntryTable] = None,
+        search_index: Optional[TrigramIndex] = None
+    ):
+        """
+        Use loaded HAR entries and refresh the views.
         
-        self._update_data_view()
+        With a ``table`` the data tree is assumed to already show its rows,
+        as it does after a background load. The search index is built here
+        unless one is given.
+        """
+        self.entries = entries
+        self.preview_generated = False
+        if table is None:
+            self.entry_table = EntryTable.from_entries(entries)
+            self._update_data_view()
+        else:
+            self.entry_table = table
+        self.search_index = search_index or TrigramIndex.from_entries(entries)
         self._update_requests_list()
         
     def _update_data_view(self):
         """Update the data tree view."""
         # Clear existing items
-        for item in self.data_tree.get_children():
-            self.data_tree.delete(item)
+        self.data_tree.delete(*self.data_tree.get_children())
         
         # Add entries
-        for i, entry in enumerate(self.entries):
-            url = entry.request.url
+        table = self.entry_table
+        self._insert_data_rows(0, [
+            (table.method_name(i), table.url(i), table.status[i])
+            for i in range(len(table))
+        ])
+    
+    def _insert_data_rows(self, start: int, rows: Sequence[tuple]):
+        """Append ``(method, url, status)`` rows to the data tree."""
+        for i, (method, url, status) in enumerate(rows, start):
             # Truncate long URLs
             if len(url) > 80:
                 url = url[:77] + "..."
             
-            self.data_tree.insert("", "end", text=str(i), values=(
-                entry.request.method,
-                url,
-                entry.response.status
-            ))
+            self.data_tree.insert("", "end", text=str(i), values=(method, url, int(status)))
             
     def _update_requests_list(self):
-        """Update the requests checkboxes list."""
-        # Clear existing checkboxes
-        for widget in self.requests_frame.winfo_children():
-            widget.destroy()
-        
-        self.request_vars = []
-        
-        for i, entry in enumerate(self.entries):
-            var = tk.BooleanVar(value=False)
-            self.request_vars.append(var)
-            
-            url = entry.request.url
-            if len(url) > 100:
-                url = url[:97] + "..."
-            
-            text = f"[{i}] {entry.request.method} - {url}"
-            cb = ttk.Checkbutton(self.requests_frame, text=text, variable=var)
-            cb.pack(anchor=tk.W, pady=2, padx=10)
+        """Show the loaded entries in the requests list."""
+        self.request_list.set_table(self.entry_table)
+        self._apply_search()
+        
+    def _on_search_changed(self, *args):
+        """Apply the search box text once typing pauses."""
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(SEARCH_DEBOUNCE, self._apply_search)
+        
+    def _apply_search(self):
+        """Show only the requests containing the search box text."""
+        self._search_job = None
+        query = self.search_var.get()
+        total = len(self.entry_table) if self.entry_table is not None else 0
+        if not query or self.search_index is None:
+            self.request_list.set_filter(None)
+            self.search_count_var.set(f"{total:,} requests" if total else "")
+            return
+        matches = self.search_index.search(query)
+        self.request_list.set_filter(matches)
+        self.search_count_var.set(f"Showing {len(matches):,} of {total:,}")
             
     def _select_all_requests(self):
         """Select all requests."""
-        for var in self.request_vars:
-            var.set(True)
+        self.request_list.select_all()
         self._update_status("Selected all requests")
         
     def _deselect_all_requests(self):
         """Deselect all requests."""
-        for var in self.request_vars:
-            var.set(False)
+        self.request_list.deselect_all()
         self._update_status("Deselected all requests")
         
     def _invert_selection(self):
         """Invert request selection."""
-        for var in self.request_vars:
-            var.set(not var.get())
+        self.request_list.invert()
         self._update_status("Inverted request selection")
+    
+    def _show_filter_dialog(self):
+        """Show the dialog for selecting requests by a filter rule."""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Select by Filter")
+        dialog.geometry("420x330")
+        
+        frame = ttk.Frame(dialog, padding="20")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        target_var = tk.StringVar(value="url")
+        operator_var = tk.StringVar(value="contains")
+        value_var = tk.StringVar()
+        header_var = tk.StringVar()
+        case_var = tk.BooleanVar(value=False)
+        
+        ttk.Label(frame, text="Target:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Combobox(frame, textvariable=target_var, values=FILTER_TARGETS, state="readonly").grid(
+            row=0, column=1, sticky=(tk.W, tk.E), pady=5)
+        ttk.Label(frame, text="Operator:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        ttk.Combobox(frame, textvariable=operator_var, values=FILTER_OPERATORS, state="readonly").grid(
+            row=1, column=1, sticky=(tk.W, tk.E), pady=5)
+        ttk.Label(frame, text="Value:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(frame, textvariable=value_var).grid(row=2, column=1, sticky=(tk.W, tk.E), pady=5)
+        ttk.Label(frame, text="Header name:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(frame, textvariable=header_var).grid(row=3, column=1, sticky=(tk.W, tk.E), pady=5)
+        ttk.Checkbutton(frame, text="Case sensitive", variable=case_var).grid(
+            row=4, column=0, columnspan=2, sticky=tk.W, pady=5)
+        frame.columnconfigure(1, weight=1)
+        
+        def apply(select: bool):
+            rule = FilterRule(
+                target=target_var.get(),
+                operator=operator_var.get(),
+                value=value_var.get(),
+                case_sensitive=case_var.get(),
+                header=header_var.get().strip() or None
+            )
+            if self._select_by_filter(rule, select):
+                dialog.destroy()
+        
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=5, column=0, columnspan=2, pady=15)
+        ttk.Button(buttons, text="Select Matching", command=lambda: apply(True)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="Deselect Matching", command=lambda: apply(False)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=2)
+    
+    def _select_by_filter(self, rule: FilterRule, select: bool) -> bool:
+        """Select or deselect the requests matching a rule."""
+        if not self.entries:
+            messagebox.showwarning("Warning", "Please load data first")
+            return False
+        try:
+            mask = filter_mask(self.entry_table, [rule])
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return False
+        
+        self.request_list.select_where(mask, select)
+        count = int(sum(mask))
+        action = "Selected" if select else "Deselected"
+        self._update_status(f"{action} {count} requests matching {rule.target} {rule.operator} {rule.value!r}")
+        return True
         
     def _add_custom_header(self):
         """Add a custom header."""
@@ -781,6 +1172,7 @@ Generated by: LoliCode Generator GUI v1.0
             self.header_value_var.set("")
             
             self._update_status(f"Added custom header to request {request_idx}")
+            self._refresh_preview()
             
         except ValueError:
             messagebox.showerror("Error", "Invalid request index")
@@ -808,6 +1200,7 @@ Generated by: LoliCode Generator GUI v1.0
             self.headers_tree.delete(item)
         
         self._update_status("Deleted selected header(s)")
+        self._refresh_preview()
         
     def _add_assertion(self):
         """Add a custom assertion."""
@@ -838,6 +1231,7 @@ Generated by: LoliCode Generator GUI v1.0
             self.assertion_value_var.set("")
             
             self._update_status(f"Added assertion to request {request_idx}")
+            self._refresh_preview()
             
         except ValueError:
             messagebox.showerror("Error", "Invalid request index")
@@ -865,6 +1259,7 @@ Generated by: LoliCode Generator GUI v1.0
             self.assertions_tree.delete(item)
         
         self._update_status("Deleted selected assertion(s)")
+        self._refresh_preview()
         
     def _add_extraction(self):
         """Add a variable extraction."""
@@ -904,6 +1299,7 @@ Generated by: LoliCode Generator GUI v1.0
             self.extraction_var_var.set("")
             
             self._update_status(f"Added variable extraction to request {request_idx}")
+            self._refresh_preview()
             
         except ValueError:
             messagebox.showerror("Error", "Invalid request index")
@@ -931,6 +1327,7 @@ Generated by: LoliCode Generator GUI v1.0
             self.extractions_tree.delete(item)
         
         self._update_status("Deleted selected extraction(s)")
+        self._refresh_preview()
         
     def _apply_settings(self):
         """Apply settings."""
@@ -942,6 +1339,7 @@ Generated by: LoliCode Generator GUI v1.0
                 'retry_count': int(self.retry_count_var.get())
             }
             self._update_status("Settings applied successfully")
+            self._refresh_preview()
             messagebox.showinfo("Success", "Settings have been applied")
         except ValueError:
             messagebox.showerror("Error", "Invalid settings values")
@@ -995,48 +1393,96 @@ Generated by: LoliCode Generator GUI v1.0
             messagebox.showwarning("Warning", "Please load data first")
             return
         
+        if not self._start_preview(switch_tab=True):
+            messagebox.showwarning("Warning", "Please select at least one request")
+    
+    def _refresh_preview(self):
+        """Regenerate a shown preview after a change, once changes settle."""
+        if self.preview_generated and self.entries:
+            self._start_preview(switch_tab=False, delay=PREVIEW_DEBOUNCE)
+    
+    def _start_preview(self, switch_tab: bool, delay: float = 0.0) -> bool:
+        """Submit the current configuration to the background worker."""
         # Get selected indices
-        self.selected_indices = [i for i, var in enumerate(self.request_vars) if var.get()]
+        self.selected_indices = self.request_list.selection.indices()
         
         if not self.selected_indices:
-            messagebox.showwarning("Warning", "Please select at least one request")
-            return
-        
-        try:
-            # Create configuration
-            config = LoliCodeConfig(
-                selected_indices=self.selected_indices,
-                custom_headers=self.custom_headers if self.custom_headers else None,
-                custom_assertions=self.custom_assertions if self.custom_assertions else None,
-                variable_extractions=self.variable_extractions if self.variable_extractions else None,
-                settings=self.settings
-            )
-            
-            # Create dependency matrix
-            dependency_matrix = DependencyMatrix(topological_order=self.selected_indices)
+            return False
+        
+        # Snapshot the configuration; the worker reads it on its own thread
+        config = LoliCodeConfig(
+            selected_indices=list(self.selected_indices),
+            custom_headers={i: list(v) for i, v in self.custom_headers.items()} or None,
+            custom_assertions={i: list(v) for i, v in self.custom_assertions.items()} or None,
+            variable_extractions={i: list(v) for i, v in self.variable_extractions.items()} or None,
+            settings=dict(self.settings)
+        )
             
-            # Generate script
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            script = loop.run_until_complete(
-                self.generator.generate(config, self.entries, dependency_matrix)
-            )
-            loop.close()
+        # The worker orders the requests by the dependencies detected among them
+        count = len(self.selected_indices)
+        self.preview_worker.submit(
+            config,
+            self.entries,
+            None,
+            on_done=lambda script: self._show_preview(script, count, switch_tab),
+            on_error=self._show_preview_error,
+            delay=delay
+        )
+        self._update_status(f"Generating script with {count} requests...")
+        return True
             
-            # Display in preview
-            self.preview_text.delete("1.0", tk.END)
-            self.preview_text.insert("1.0", script)
+    def _post_to_ui(self, callback, *args):
+        """Run a worker result callback on the Tk thread."""
+        self.root.after(0, callback, *args)
             
-            # Switch to preview tab
+    def _show_preview(self, script: str, count: int, switch_tab: bool):
+        """Display a generated script, inserting it a chunk per tick."""
+        self.preview_generated = True
+        self._preview_insert_token += 1
+        self._preview_inserting = True
+        self.preview_text.delete("1.0", tk.END)
+        
+        # Switch to preview tab
+        if switch_tab:
             self.notebook.select(6)  # Preview tab index
             
-            self._update_status(f"Generated script with {len(self.selected_indices)} requests")
+        self._insert_preview_chunk(self._preview_insert_token, script, 0, count)
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate script: {str(e)}")
+    def _insert_preview_chunk(self, token: int, script: str, start: int, count: int):
+        """Insert the next chunk of the preview unless a newer one replaced it."""
+        if token != self._preview_insert_token:
+            return
+        end = start + PREVIEW_INSERT_CHUNK
+        self.preview_text.insert(tk.END, script[start:end])
+        if end < len(script):
+            self.root.after(1, self._insert_preview_chunk, token, script, end, count)
+            return
+        self._preview_inserting = False
+        self._update_status(f"Generated script with {count} requests")
+    
+    def _show_preview_error(self, error: Exception):
+        """Report a failed generation."""
+        self._update_status("Script generation failed")
+        messagebox.showerror("Error", f"Failed to generate script: {str(error)}")
+    
+    def _preview_pending(self) -> bool:
+        """Warn and return True while the preview is still being produced."""
+        if self.preview_worker.busy or self._preview_inserting:
+            messagebox.showwarning("Warning", "The preview is still being generated")
+            return True
+        return False
+    
+    def _on_close(self):
+        """Stop the background workers and close the window."""
+        self._stop_loading()
+        self.preview_worker.close()
+        self._close_entry_store()
+        self.root.destroy()
             
     def _save_script(self):
         """Save script to file."""
+        if self._preview_pending():
+            return
         script = self.preview_text.get("1.0", tk.END).strip()
         
         if not script:
@@ -1060,6 +1506,8 @@ Generated by: LoliCode Generator GUI v1.0
                 
     def _copy_to_clipboard(self):
         """Copy script to clipboard."""
+        if self._preview_pending():
+            return
         script = self.preview_text.get("1.0", tk.END).strip()
         
         if not script:
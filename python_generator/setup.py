@@ -13,6 +13,9 @@ setup(
     python_requires='>=3.8',
     install_requires=[],
     extras_require={
+        'numpy': [
+            'numpy>=1.20',
+        ],
         'test': [
             'pytest>=8.0.0',
             'pytest-asyncio>=0.23.0',
@@ -21,6 +24,7 @@ setup(
     entry_points={
         'console_scripts': [
             'lolicode-gui=gui_app:main',
+            'lolicode-gen=generator.cli:main',
         ],
     },
     classifiers=[
@@ -1,8 +1,37 @@
 """Generator package initialization."""
 
 from .lolicode_generator import LoliCodeGenerator, generate_lolicode
+from .background import BackgroundGenerator, BackgroundLoader, LoadBatch, LoadResult
+from .batch import generate_many, generate_as_completed
+from .builders import BodyEmitter, BodyReport
+from .analyzer import TokenAnalyzer, DependencyMatrixBuilder, build_dependency_matrix
+from .body_store import BodyStore, BodyRef, store_entry_bodies
+from .entry_store import EntryStore
+from .entry_table import EntryTable
+from .selection import Selection
+from .search import TrigramIndex
+from .filter import (
+    FilterRule,
+    CompiledFilter,
+    compile_filter,
+    apply_filters,
+    filter_mask,
+    FILTER_TARGETS,
+    FILTER_OPERATORS,
+)
+from .ingest import IngestResult, transform_entries, ingest_har_file
+from .parser import (
+    HarStreamingParser,
+    ParseProfile,
+    PARSE_PROFILES,
+    get_profile,
+    iter_har_entries,
+    load_har_entries,
+    transform_entry,
+)
 from .types import (
     LoliCodeConfig,
+    BodyOptions,
     CustomHeader,
     CustomAssertion,
     VariableExtraction,
@@ -10,14 +39,25 @@ from .types import (
     SemanticHarRequest,
     SemanticHarResponse,
     RequestBody,
+    ResponseBody,
     DependencyMatrix,
     SettingsDict,
+    TokenInfo,
 )
 
 __all__ = [
     'LoliCodeGenerator',
     'generate_lolicode',
+    'generate_many',
+    'generate_as_completed',
+    'BodyEmitter',
+    'BodyReport',
+    'BackgroundGenerator',
+    'BackgroundLoader',
+    'LoadBatch',
+    'LoadResult',
     'LoliCodeConfig',
+    'BodyOptions',
     'CustomHeader',
     'CustomAssertion',
     'VariableExtraction',
@@ -25,6 +65,35 @@ __all__ = [
     'SemanticHarRequest',
     'SemanticHarResponse',
     'RequestBody',
+    'ResponseBody',
     'DependencyMatrix',
     'SettingsDict',
+    'TokenInfo',
+    'TokenAnalyzer',
+    'DependencyMatrixBuilder',
+    'build_dependency_matrix',
+    'BodyStore',
+    'BodyRef',
+    'store_entry_bodies',
+    'EntryStore',
+    'EntryTable',
+    'Selection',
+    'TrigramIndex',
+    'FilterRule',
+    'CompiledFilter',
+    'compile_filter',
+    'apply_filters',
+    'filter_mask',
+    'FILTER_TARGETS',
+    'FILTER_OPERATORS',
+    'IngestResult',
+    'transform_entries',
+    'ingest_har_file',
+    'HarStreamingParser',
+    'ParseProfile',
+    'PARSE_PROFILES',
+    'get_profile',
+    'iter_har_entries',
+    'load_har_entries',
+    'transform_entry',
 ]
@@ -0,0 +1,14 @@
+"""Analyzer package initialization."""
+
+from .dependency_matrix_builder import DependencyMatrixBuilder, build_dependency_matrix
+from .token_analyzer import TokenAnalyzer, TokenOccurrence, TrackedToken
+from .token_usage_index import TokenUsageIndex
+
+__all__ = [
+    'DependencyMatrixBuilder',
+    'build_dependency_matrix',
+    'TokenAnalyzer',
+    'TokenOccurrence',
+    'TrackedToken',
+    'TokenUsageIndex',
+]
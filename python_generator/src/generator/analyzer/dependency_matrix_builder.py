@@ -0,0 +1,94 @@
+"""Request dependency analysis using adjacency sets and hash indexes."""
+
+from typing import Dict, List, Optional, Sequence, Set
+
+from ..types import DependencyMatrix, SemanticHarEntry
+from .token_analyzer import TokenAnalyzer
+from .token_usage_index import TokenUsageIndex
+
+
+class DependencyMatrixBuilder:
+    """
+    Build a sparse dependency matrix from HAR entries.
+    
+    Tokens are detected first. Token, cookie, redirect and referrer
+    dependencies are then found in one forward pass over the entries using
+    hash indexes instead of comparing every pair of entries, so the cost is
+    O(n + edges) rather than O(n²), and only the edges themselves are stored.
+    """
+    
+    def __init__(self, token_analyzer: Optional[TokenAnalyzer] = None):
+        """
+        Initialize the builder.
+        
+        Args:
+            token_analyzer: Analyzer used to detect tokens (defaults to a
+                TokenAnalyzer with the standard patterns)
+        """
+        self.token_analyzer = token_analyzer or TokenAnalyzer()
+    
+    def build(self, entries: Sequence[SemanticHarEntry]) -> DependencyMatrix:
+        """
+        Build the dependency matrix.
+        
+        Args:
+            entries: Chronologically ordered HAR entries
+        
+        Returns:
+            Dependency matrix with one set of dependencies per entry
+        """
+        detected_tokens = self.token_analyzer.analyze(entries)
+        token_index = TokenUsageIndex(detected_tokens)
+        
+        # cookie name -> indices of the earlier entries whose response sets it
+        cookie_setters: Dict[str, List[int]] = {}
+        # redirect Location -> indices of redirects still waiting for a request to it
+        pending_redirects: Dict[str, List[int]] = {}
+        # URL -> indices of the earlier entries that requested it
+        requested: Dict[str, List[int]] = {}
+        
+        dependencies: List[Set[int]] = []
+        for i, entry in enumerate(entries):
+            request = entry.request
+            response = entry.response
+            targets: Set[int] = set()
+            
+            # Token: depends on the entries defining the tokens it uses
+            if token_index:
+                targets.update(token_index.sources_used_by(i, request))
+            
+            # Cookie: depends on every earlier response that set a sent cookie
+            for name in request.cookies:
+                targets.update(cookie_setters.get(name, ()))
+            
+            # Redirect: the first later request to a Location depends on the redirect
+            redirected_from = pending_redirects.pop(request.url, None)
+            if redirected_from:
+                targets.update(redirected_from)
+            
+            # Referrer: depends on every earlier request for the referring URL
+            referer = request.headers.get('referer') or request.headers.get('referrer')
+            if referer:
+                targets.update(requested.get(referer, ()))
+            
+            dependencies.append(targets)
+            requested.setdefault(request.url, []).append(i)
+            for name in response.cookies:
+                cookie_setters.setdefault(name, []).append(i)
+            if response.redirect_url:
+                pending_redirects.setdefault(response.redirect_url, []).append(i)
+        
+        return DependencyMatrix.from_dependencies(dependencies, detected_tokens)
+
+
+def build_dependency_matrix(entries: Sequence[SemanticHarEntry]) -> DependencyMatrix:
+    """
+    Convenience function to build a dependency matrix.
+    
+    Args:
+        entries: Chronologically ordered HAR entries
+    
+    Returns:
+        Dependency matrix
+    """
+    return DependencyMatrixBuilder().build(entries)
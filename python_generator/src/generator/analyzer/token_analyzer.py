@@ -0,0 +1,213 @@
+"""Single-pass detection and tracking of security tokens in HAR entries."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Pattern, Tuple
+
+from ..types import SemanticHarEntry, TokenInfo
+
+
+Location = Literal['request', 'response']
+Area = Literal['header', 'body', 'url', 'cookie']
+
+# Values shorter than this are too generic to be tokens
+MIN_TOKEN_LENGTH = 10
+
+# (type, pattern) pairs, each with a single ``value`` group. Patterns are
+# matched against lower-cased text and every one starts with a literal
+# character, which lets the regex engine skip ahead to the positions where
+# some pattern can start instead of trying each alternative everywhere.
+# The ``authorization`` pattern skips ``Bearer`` values so that the JWT
+# pattern can match them; on its own it would only capture the word
+# "bearer", which is discarded for being too short.
+TOKEN_PATTERNS: List[Tuple[str, str]] = [
+    ('JWT', r'bearer\s+(?P<value>[a-z0-9\-_]+\.[a-z0-9\-_]+\.[a-z0-9\-_]+)'),
+    ('CSRF', r'"(?:csrf_token|xsrf_token|x-csrf-token)["\']\s*:\s*["\'](?P<value>[^"\']+)["\']'),
+    ('CSRF', r"'(?:csrf_token|xsrf_token|x-csrf-token)[\"']\s*:\s*[\"'](?P<value>[^\"']+)[\"']"),
+    ('CSRF', r'name=["\'](?:_csrf|csrf-token)["\'][^>]*value=["\'](?P<value>[^"\']+)["\']'),
+    ('SessionID', r'session_id=(?P<value>[a-z0-9\-_]{16,})'),
+    ('SessionID', r'sid=(?P<value>[a-z0-9\-_]{16,})'),
+    ('SessionID', r'jsessionid=(?P<value>[a-z0-9\-_]{16,})'),
+    ('APIKey', r'"(?:api_key|access_token)["\']\s*:\s*["\'](?P<value>[^"\']+)["\']'),
+    ('APIKey', r"'(?:api_key|access_token)[\"']\s*:\s*[\"'](?P<value>[^\"']+)[\"']"),
+    ('APIKey', r'x-api-key:\s*(?!bearer\s)(?P<value>[a-z0-9\-_.]+)'),
+    ('APIKey', r'authorization:\s*(?!bearer\s)(?P<value>[a-z0-9\-_.]+)'),
+]
+
+
+def compile_token_pattern(patterns: List[Tuple[str, str]] = TOKEN_PATTERNS, flags: int = 0) -> Tuple[Pattern[str], Dict[str, str]]:
+    """
+    Combine token patterns into one alternation.
+    
+    Each pattern's ``value`` group is renamed to a unique ``t<N>`` group so
+    the alternative that matched can be read from ``match.lastgroup``.
+    
+    Args:
+        patterns: ``(type, pattern)`` pairs
+        flags: Regex flags for the combined pattern
+    
+    Returns:
+        The compiled regex and a map of group name to token type
+    """
+    alternatives = []
+    group_types = {}
+    for index, (token_type, pattern) in enumerate(patterns):
+        name = f't{index}'
+        alternatives.append(pattern.replace('(?P<value>', f'(?P<{name}>'))
+        group_types[name] = token_type
+    return re.compile('|'.join(alternatives), flags), group_types
+
+
+@dataclass
+class TokenOccurrence:
+    """One place a token value was seen."""
+    entry_index: int
+    location: Location
+    area: Area
+    # e.g. the header name for a header occurrence
+    context: str
+
+
+@dataclass
+class TrackedToken:
+    """A token value with every occurrence and its defining occurrence."""
+    type: str
+    value: str
+    occurrences: List[TokenOccurrence] = field(default_factory=list)
+    definition: Optional[TokenOccurrence] = None
+
+
+class TokenAnalyzer:
+    """
+    Find JWT, CSRF, session ID and API key tokens and track where they flow.
+    
+    All token patterns are combined into a single alternation regex, so each
+    header, URL and body is scanned once regardless of how many token types
+    are recognized. Text is lower-cased before matching and token values are
+    sliced from the original text. Matches are leftmost and non-overlapping.
+    """
+    
+    def __init__(self, patterns: List[Tuple[str, str]] = TOKEN_PATTERNS, min_length: int = MIN_TOKEN_LENGTH):
+        """
+        Initialize the analyzer.
+        
+        Args:
+            patterns: ``(type, pattern)`` pairs, each with a ``value`` group,
+                written to match lower-case text
+            min_length: Shortest value reported as a token
+        """
+        self.pattern, self._group_types = compile_token_pattern(patterns)
+        # Used when lower-casing changes the text length (some non-ASCII
+        # characters), so spans in the lowered text would not line up
+        self._fallback_pattern, _ = compile_token_pattern(patterns, re.IGNORECASE)
+        self.min_length = min_length
+    
+    def analyze(self, entries: Iterable[SemanticHarEntry]) -> List[TokenInfo]:
+        """
+        Detect tokens and the entry that first defines each one.
+        
+        Args:
+            entries: Chronologically ordered HAR entries
+        
+        Returns:
+            Tokens that are defined by a response, in order of first occurrence
+        """
+        tokens = self.track_tokens(self.find_occurrences(entries))
+        return [
+            TokenInfo(
+                type=token.type,
+                value=token.value,
+                source_entry=token.definition.entry_index,
+                source_location=token.definition.area
+            )
+            for token in tokens.values()
+            if token.definition is not None
+        ]
+    
+    def scan(self, text: str) -> Iterator[Tuple[str, str]]:
+        """
+        Yield ``(type, value)`` for every token found in a piece of text.
+        
+        Args:
+            text: Header line, URL or body text
+        """
+        group_types = self._group_types
+        min_length = self.min_length
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self.pattern.finditer(lowered)
+        else:
+            matches = self._fallback_pattern.finditer(text)
+        for match in matches:
+            name = match.lastgroup
+            start, end = match.span(name)
+            if end - start >= min_length:
+                yield group_types[name], text[start:end]
+    
+    def find_occurrences(self, entries: Iterable[SemanticHarEntry]) -> Dict[str, TrackedToken]:
+        """
+        Record every occurrence of every token value.
+        
+        Response headers and body are scanned before the request headers,
+        URL and body of the same entry.
+        
+        Args:
+            entries: Chronologically ordered HAR entries
+        
+        Returns:
+            Tracked tokens keyed by value, in order of first occurrence
+        """
+        tokens: Dict[str, TrackedToken] = {}
+        for index, entry in enumerate(entries):
+            response = entry.response
+            if response is not None:
+                for name, value in response.headers.items():
+                    self._find_in_text(tokens, f'{name}: {value}', index, 'response', 'header', name)
+                body = response.body
+                if body is not None and body.data:
+                    self._find_in_text(tokens, body.data, index, 'response', 'body', 'body')
+            
+            request = entry.request
+            for name, value in request.headers.items():
+                self._find_in_text(tokens, f'{name}: {value}', index, 'request', 'header', name)
+            if request.url:
+                self._find_in_text(tokens, request.url, index, 'request', 'url', 'url')
+            if request.body is not None and request.body.data:
+                self._find_in_text(tokens, request.body.data, index, 'request', 'body', 'body')
+        return tokens
+    
+    def _find_in_text(
+        self,
+        tokens: Dict[str, TrackedToken],
+        text: str,
+        entry_index: int,
+        location: Location,
+        area: Area,
+        context: str
+    ) -> None:
+        """Add the tokens found in ``text`` to ``tokens``."""
+        for token_type, value in self.scan(text):
+            occurrence = TokenOccurrence(entry_index, location, area, context)
+            token = tokens.get(value)
+            if token is None:
+                tokens[value] = TrackedToken(token_type, value, [occurrence])
+            else:
+                token.occurrences.append(occurrence)
+    
+    @staticmethod
+    def track_tokens(tokens: Dict[str, TrackedToken]) -> Dict[str, TrackedToken]:
+        """
+        Set each token's definition to its first occurrence in a response.
+        
+        Args:
+            tokens: Tracked tokens from ``find_occurrences``
+        
+        Returns:
+            The same mapping, updated in place
+        """
+        for token in tokens.values():
+            token.definition = next(
+                (o for o in token.occurrences if o.location == 'response'),
+                None
+            )
+        return tokens
@@ -0,0 +1,119 @@
+"""Inverted index for finding which requests use which detected tokens."""
+
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from ..types import SemanticHarEntry, SemanticHarRequest, TokenInfo
+
+
+DEFAULT_GRAM_SIZE = 6
+
+# Joins the parts of a request so no token value spans two of them
+_PART_SEPARATOR = '\0'
+
+
+class TokenUsageIndex:
+    """
+    Multi-pattern matcher over the values of detected tokens.
+    
+    Every token value of length ``L`` or more contains, at each of its first
+    ``L - K + 1`` offsets, a ``K``-character gram. An occurrence of the value
+    anywhere in a text therefore covers one of those grams at a text position
+    that is a multiple of ``L - K + 1``. The index maps each such gram to the
+    values it starts, so a text is scanned once by slicing grams at that
+    stride and intersecting them with the index; only values whose grams are
+    hit are confirmed with a substring check. Scanning cost depends on the
+    text length, not on the number of tokens.
+    """
+    
+    def __init__(self, tokens: Iterable[TokenInfo], gram_size: int = DEFAULT_GRAM_SIZE):
+        """
+        Build the index.
+        
+        Args:
+            tokens: Detected tokens, e.g. from ``TokenAnalyzer.analyze``
+            gram_size: Gram length ``K``; shortened to the shortest token value
+        
+        Raises:
+            ValueError: If ``gram_size`` is less than 1
+        """
+        if gram_size < 1:
+            raise ValueError('gram_size must be at least 1')
+        
+        self.sources: Dict[str, int] = {
+            token.value: token.source_entry for token in tokens if token.value
+        }
+        shortest = min(map(len, self.sources), default=gram_size)
+        self.gram_size = min(gram_size, shortest)
+        self.stride = shortest - self.gram_size + 1
+        
+        self._grams: Dict[str, List[str]] = {}
+        for value in self.sources:
+            for offset in range(self.stride):
+                gram = value[offset:offset + self.gram_size]
+                self._grams.setdefault(gram, []).append(value)
+    
+    def __len__(self) -> int:
+        return len(self.sources)
+    
+    def find(self, text: str) -> Set[str]:
+        """
+        Return the token values that occur in ``text``.
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Set of matching token values
+        """
+        if not self._grams or not text:
+            return set()
+        size = self.gram_size
+        stride = self.stride
+        length = len(text)
+        # Slice every ``stride``-th gram without a Python-level loop
+        grams = map(text.__getitem__, map(slice, range(0, length, stride), range(size, length + size, stride)))
+        hits = self._grams.keys() & set(grams)
+        return {value for gram in hits for value in self._grams[gram] if value in text}
+    
+    def find_in_request(self, request: SemanticHarRequest) -> Set[str]:
+        """
+        Return the token values used by a request's URL, headers or body.
+        
+        Args:
+            request: Request to scan
+        
+        Returns:
+            Set of matching token values
+        """
+        parts = [request.url]
+        parts.extend(request.headers.values())
+        if request.body is not None and request.body.data:
+            parts.append(request.body.data)
+        return self.find(_PART_SEPARATOR.join(parts))
+    
+    def sources_used_by(self, index: int, request: SemanticHarRequest) -> Set[int]:
+        """
+        Return the entries defining tokens that a request uses.
+        
+        A request cannot use a token defined by itself or a later entry.
+        
+        Args:
+            index: Index of the request's entry
+            request: Request to scan
+        
+        Returns:
+            Indices of the defining entries
+        """
+        sources = self.sources
+        return {sources[value] for value in self.find_in_request(request) if sources[value] < index}
+    
+    def dependencies(self, entries: Iterable[SemanticHarEntry]) -> Iterator[Tuple[int, int]]:
+        """
+        Yield ``(i, j)`` for each request ``i`` that uses a token defined by entry ``j``.
+        
+        Args:
+            entries: Chronologically ordered HAR entries
+        """
+        for i, entry in enumerate(entries):
+            for j in sorted(self.sources_used_by(i, entry.request)):
+                yield i, j
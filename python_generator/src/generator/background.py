@@ -0,0 +1,314 @@
+"""Script generation and HAR loading on background threads."""
+
+import asyncio
+import concurrent.futures
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+from .analyzer import build_dependency_matrix
+from .entry_store import EntryStore
+from .entry_table import EntryTable
+from .lolicode_generator import SECTION_SEPARATOR, LoliCodeGenerator
+from .parser import ProfileSpec
+from .search import TrigramIndex
+from .types import LoliCodeConfig, SemanticHarEntry, DependencyMatrix
+
+
+# Sections generated between checks for cancellation
+YIELD_EVERY = 64
+
+# Entries loaded between progress reports
+LOAD_BATCH = 1000
+
+# Delivers a callback and its arguments to the thread that should run it
+Poster = Callable[..., Any]
+
+
+def _call_directly(callback: Callable[..., Any], *args: Any) -> None:
+    """Run a callback on the worker thread itself."""
+    callback(*args)
+
+
+def _selection_matrix(entries: Sequence[SemanticHarEntry], indices: Sequence[int]) -> DependencyMatrix:
+    """Order the selected entries by the dependencies detected among them."""
+    # The builder expects entries in capture order; invalid indices are
+    # left for the generator to report
+    indices = sorted(index for index in indices if 0 <= index < len(entries))
+    matrix = build_dependency_matrix([entries[index] for index in indices])
+    return DependencyMatrix(topological_order=[indices[i] for i in matrix.topological_order])
+
+
+class BackgroundGenerator:
+    """
+    Generate scripts on a worker thread that owns one persistent event loop.
+    
+    Only the latest job matters: submitting a job cancels the one before
+    it, and a job can wait a short debounce delay before starting, so quick
+    successive changes only generate the last one. Results are handed to
+    ``post`` together with their callback, e.g. to run them on a GUI
+    thread via ``root.after``. A cancelled or superseded job posts nothing.
+    """
+    
+    def __init__(
+        self,
+        generator: Optional[LoliCodeGenerator] = None,
+        post: Optional[Poster] = None
+    ):
+        """
+        Start the worker thread.
+        
+        Args:
+            generator: Generator used by the worker; it should not be used
+                from other threads while the worker runs
+            post: ``post(callback, *args)`` runs a result callback on the
+                receiving thread; by default callbacks run on the worker
+        """
+        self.generator = generator or LoliCodeGenerator()
+        self._post = post or _call_directly
+        self._loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()
+        self._job_id = 0
+        self._current: Optional[concurrent.futures.Future] = None
+        self._thread = threading.Thread(target=self._run, name='lolicode-generator', daemon=True)
+        self._thread.start()
+    
+    def _run(self) -> None:
+        """Run the event loop until ``close``."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+        pending = asyncio.all_tasks(self._loop)
+        for task in pending:
+            task.cancel()
+        self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self._loop.close()
+    
+    @property
+    def busy(self) -> bool:
+        """Whether a job is waiting or running."""
+        with self._lock:
+            return self._current is not None and not self._current.done()
+    
+    def submit(
+        self,
+        config: LoliCodeConfig,
+        entries: Sequence[SemanticHarEntry],
+        dependency_matrix: Optional[DependencyMatrix],
+        on_done: Callable[[str], Any],
+        on_error: Optional[Callable[[Exception], Any]] = None,
+        delay: float = 0.0
+    ) -> concurrent.futures.Future:
+        """
+        Replace the current job with a new one.
+        
+        The inputs are read on the worker thread while the job runs, so the
+        caller should not modify them until the job finishes.
+        
+        Args:
+            config: Generation configuration
+            entries: HAR entries
+            dependency_matrix: Request dependencies, or None to detect
+                them among the selected entries on the worker thread
+            on_done: Posted with the generated script
+            on_error: Posted with the exception if generation fails
+            delay: Seconds to wait before starting, for debouncing
+        
+        Returns:
+            Future of the job's script
+        
+        Raises:
+            RuntimeError: If the worker has been closed
+        """
+        if self._loop.is_closed() or not self._thread.is_alive():
+            raise RuntimeError('BackgroundGenerator is closed')
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+            self._job_id += 1
+            job = self._generate(self._job_id, config, entries, dependency_matrix, on_done, on_error, delay)
+            self._current = asyncio.run_coroutine_threadsafe(job, self._loop)
+            return self._current
+    
+    async def _generate(
+        self,
+        job_id: int,
+        config: LoliCodeConfig,
+        entries: Sequence[SemanticHarEntry],
+        dependency_matrix: Optional[DependencyMatrix],
+        on_done: Callable[[str], Any],
+        on_error: Optional[Callable[[Exception], Any]],
+        delay: float
+    ) -> str:
+        """Run one job, checking for cancellation between sections."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            if dependency_matrix is None:
+                dependency_matrix = _selection_matrix(entries, config.selected_indices)
+                await asyncio.sleep(0)
+            sections = []
+            async for section in self.generator.iter_sections(config, entries, dependency_matrix):
+                sections.append(section)
+                if len(sections) % YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            script = SECTION_SEPARATOR.join(sections)
+        except Exception as e:
+            # Any failure, such as an OSError writing side files, ends the
+            # job; cancellation is a BaseException and posts nothing
+            if on_error is not None:
+                self._deliver(job_id, on_error, e)
+            raise
+        self._deliver(job_id, on_done, script)
+        return script
+    
+    def _deliver(self, job_id: int, callback: Callable[..., Any], *args: Any) -> None:
+        """Post a result unless a newer job has been submitted."""
+        with self._lock:
+            if job_id != self._job_id:
+                return
+        self._post(callback, *args)
+    
+    def cancel(self) -> None:
+        """Cancel the current job, if any."""
+        with self._lock:
+            self._job_id += 1
+            if self._current is not None:
+                self._current.cancel()
+                self._current = None
+    
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Cancel the current job and stop the worker thread.
+        
+        Args:
+            timeout: Seconds to wait for the thread to finish
+        """
+        self.cancel()
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+
+
+@dataclass
+class LoadBatch:
+    """Entries loaded since the previous batch."""
+    # Index of the first entry in ``rows``
+    start: int
+    # (method, url, status) of each entry
+    rows: List[Tuple[str, str, int]]
+    bytes_read: int
+    total_bytes: int
+
+
+@dataclass
+class LoadResult:
+    """A fully loaded HAR file."""
+    store: EntryStore
+    table: EntryTable
+    search_index: TrigramIndex
+
+
+# What a BackgroundLoader puts on its queue
+LoadMessage = Union[LoadBatch, LoadResult, Exception]
+
+
+class BackgroundLoader:
+    """
+    Open, index and tabulate a HAR file on a worker thread.
+    
+    The worker puts a ``LoadBatch`` on ``queue`` for every batch of
+    entries, so a UI can show the first rows and progress while the rest
+    of the file is scanned. It ends with a ``LoadResult`` holding the
+    store, its table and its search index, or with the exception that
+    stopped it.
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, 'os.PathLike[str]'],
+        batch_size: int = LOAD_BATCH,
+        profile: ProfileSpec = 'minimal'
+    ):
+        """
+        Start loading.
+        
+        Args:
+            path: Path to the HAR file
+            batch_size: Entries per ``LoadBatch``
+            profile: Parse profile for the store's entries; the default
+                keeps only what listing and generating scripts need
+        """
+        self.path = os.fspath(path)
+        self.batch_size = batch_size
+        self.profile = profile
+        self.queue: 'queue.Queue[LoadMessage]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._thread = threading.Thread(target=self._run, name='har-loader', daemon=True)
+        self._thread.start()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether ``cancel`` has been called."""
+        return self._cancelled
+    
+    def _run(self) -> None:
+        """Load the file, reporting progress and the outcome on the queue."""
+        store = None
+        try:
+            store = EntryStore(self.path, index=False, profile=self.profile)
+            table = EntryTable()
+            search_index = TrigramIndex()
+            for _, offset in store.index_batches(self.batch_size):
+                if self._cancelled:
+                    break
+                start = index = len(table)
+                rows = []
+                while index < len(store):
+                    try:
+                        entry = store[index]
+                    except (ValueError, TypeError, AttributeError):
+                        # Skip malformed entries, as HarStreamingParser does
+                        store.discard(index)
+                        continue
+                    table.append(entry)
+                    search_index.append(entry)
+                    rows.append((table.method_name(index), table.url(index), table.status[index]))
+                    index += 1
+                self.queue.put(LoadBatch(start, rows, offset, store.file_size))
+            else:
+                table.freeze()
+                table.source = store
+                search_index.freeze()
+                with self._lock:
+                    if not self._cancelled:
+                        self.queue.put(LoadResult(store, table, search_index))
+                        return
+        except Exception as e:
+            # Any failure ends the load; the receiver reports it
+            self.queue.put(e)
+        if store is not None:
+            store.close()
+    
+    def cancel(self) -> None:
+        """
+        Stop loading and discard what was loaded.
+        
+        Messages still on the queue are dropped; a finished store that
+        was not yet received is closed.
+        """
+        with self._lock:
+            self._cancelled = True
+        while True:
+            try:
+                message = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(message, LoadResult):
+                message.store.close()
+    
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the worker thread to finish."""
+        self._thread.join(timeout)
@@ -0,0 +1,158 @@
+"""Parallel generation of many scripts across a process pool."""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Awaitable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from .lolicode_generator import LoliCodeGenerator
+from .types import LoliCodeConfig, SemanticHarEntry, DependencyMatrix
+
+
+# One script to generate: (config, entries, dependency_matrix)
+GenerationJob = Tuple[LoliCodeConfig, Sequence[SemanticHarEntry], DependencyMatrix]
+
+# State of a worker process, set up once by ``_init_worker``
+_worker_entries: Sequence[Sequence[SemanticHarEntry]] = ()
+_worker_matrices: Sequence[DependencyMatrix] = ()
+_worker_generator: Optional[LoliCodeGenerator] = None
+
+T = TypeVar('T')
+
+
+def _run(awaitable: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    ``asyncio.run`` refuses to start inside a thread whose event loop is
+    running, as in a coroutine or a loop callback, so there the coroutine
+    runs on its own loop in a helper thread while the caller blocks.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, awaitable).result()
+
+
+def _share(objects: Sequence[object]) -> Tuple[List[object], List[int]]:
+    """
+    Deduplicate objects by identity.
+    
+    Args:
+        objects: One object per job, often the same one many times
+    
+    Returns:
+        ``(distinct, keys)``: each distinct object once, and the position
+        of every job's object in ``distinct``
+    """
+    positions: Dict[int, int] = {}
+    distinct: List[object] = []
+    keys = []
+    for obj in objects:
+        key = positions.get(id(obj))
+        if key is None:
+            key = positions[id(obj)] = len(distinct)
+            distinct.append(obj)
+        keys.append(key)
+    return distinct, keys
+
+
+def _init_worker(
+    entries: Sequence[Sequence[SemanticHarEntry]],
+    matrices: Sequence[DependencyMatrix]
+) -> None:
+    """
+    Receive the shared inputs once per worker process.
+    
+    Under the fork start method they are inherited rather than pickled.
+    """
+    global _worker_entries, _worker_matrices, _worker_generator
+    _worker_entries = entries
+    _worker_matrices = matrices
+    _worker_generator = LoliCodeGenerator()
+
+
+def _generate_job(config: LoliCodeConfig, entries_key: int, matrix_key: int) -> str:
+    """Generate one script from the worker's shared inputs."""
+    return _run(_worker_generator.generate(
+        config,
+        _worker_entries[entries_key],
+        _worker_matrices[matrix_key]
+    ))
+
+
+def generate_as_completed(
+    jobs: Sequence[GenerationJob],
+    max_workers: Optional[int] = None
+) -> Iterator[Tuple[int, str]]:
+    """
+    Generate scripts in a process pool, yielding each as soon as it is done.
+    
+    Entry lists and dependency matrices are shared by identity: each
+    distinct one is sent to every worker once when the pool starts, and
+    jobs carry only their config and two small keys. Each worker keeps one
+    LoliCodeGenerator, so jobs over the same entries reuse its cached
+    request sections. With a single worker or job the scripts are
+    generated in-process. This is a blocking call: from a coroutine it
+    works, but stalls that event loop until each script is done, so run
+    it in an executor there.
+    
+    Args:
+        jobs: ``(config, entries, dependency_matrix)`` triples
+        max_workers: Worker process count (defaults to the CPU count)
+    
+    Yields:
+        ``(job_index, script)`` pairs in completion order
+    
+    Raises:
+        ValueError: If a job's configuration is invalid
+        RuntimeError: If a generated script is invalid
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        generator = LoliCodeGenerator()
+        for index, (config, entries, dependency_matrix) in enumerate(jobs):
+            yield index, _run(generator.generate(config, entries, dependency_matrix))
+        return
+    
+    entries, entries_keys = _share([job[1] for job in jobs])
+    matrices, matrix_keys = _share([job[2] for job in jobs])
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(entries, matrices)
+    ) as executor:
+        futures = {
+            executor.submit(_generate_job, job[0], entries_keys[index], matrix_keys[index]): index
+            for index, job in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def generate_many(
+    jobs: Sequence[GenerationJob],
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Generate scripts in a process pool.
+    
+    See ``generate_as_completed`` for how inputs are shared.
+    
+    Args:
+        jobs: ``(config, entries, dependency_matrix)`` triples
+        max_workers: Worker process count (defaults to the CPU count)
+    
+    Returns:
+        Scripts in job order
+    
+    Raises:
+        ValueError: If a job's configuration is invalid
+        RuntimeError: If a generated script is invalid
+    """
+    scripts: List[str] = [''] * len(jobs)
+    for index, script in generate_as_completed(jobs, max_workers):
+        scripts[index] = script
+    return scripts
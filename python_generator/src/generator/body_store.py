@@ -0,0 +1,235 @@
+"""Content-addressed storage for HAR bodies with spill to disk."""
+
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Optional, Tuple, Union
+
+from .types import SemanticHarEntry
+
+
+# Bytes of distinct bodies kept in memory before the coldest spill to disk
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Bodies shorter than this, in characters, are cheaper to keep inline than
+# behind a reference
+DEFAULT_MIN_SIZE = 256
+
+
+class BodyRef:
+    """
+    Reference to a body in a BodyStore.
+    
+    Entries holding the same body share one reference. Pickling a
+    reference stores the body text itself, so entries sent to another
+    process arrive with plain strings.
+    """
+    
+    __slots__ = ('store', 'key', 'length')
+    
+    def __init__(self, store: 'BodyStore', key: bytes, length: int):
+        self.store = store
+        self.key = key
+        # Length of the body in characters
+        self.length = length
+    
+    def read(self) -> str:
+        """Return the body text."""
+        return self.store.get(self.key)
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BodyRef):
+            return self.key == other.key
+        if isinstance(other, str):
+            return self.read() == other
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash(self.key)
+    
+    def __repr__(self) -> str:
+        return f'BodyRef({self.key.hex()}, length={self.length})'
+    
+    def __reduce__(self):
+        return str, (self.read(),)
+
+
+# A body held inline or in a store
+StoredText = Union[str, BodyRef]
+
+
+class BodyStore:
+    """
+    Deduplicating store of body texts, keyed by a hash of their content.
+    
+    ``put`` keeps each distinct body once, as UTF-8, and returns a shared
+    BodyRef. The most recently used bodies stay in memory up to
+    ``memory_budget`` bytes; colder ones are appended to an anonymous
+    temporary file and read back from it on access, which brings them back
+    into memory. ``intern`` deduplicates texts that must stay plain
+    strings, such as request bodies, without spilling them.
+    
+    A store is locked, so it can be read from several threads. Close it to
+    delete the spill file; references to it can no longer be read then.
+    """
+    
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        min_size: int = DEFAULT_MIN_SIZE,
+        directory: Optional[str] = None
+    ):
+        """
+        Create an empty store.
+        
+        Args:
+            memory_budget: Bytes of distinct bodies kept in memory
+            min_size: Characters below which ``store_entry_bodies`` keeps
+                bodies inline
+            directory: Directory for the spill file (defaults to the
+                system temporary directory)
+        
+        Raises:
+            ValueError: If ``memory_budget`` is negative
+        """
+        if memory_budget < 0:
+            raise ValueError('memory_budget must not be negative')
+        self.memory_budget = memory_budget
+        self.min_size = min_size
+        self.directory = directory
+        # Bytes put, counting every duplicate, and bytes of distinct bodies
+        self.logical_bytes = 0
+        self.stored_bytes = 0
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self._hot: 'OrderedDict[bytes, bytes]' = OrderedDict()
+        self._spilled: Dict[bytes, Tuple[int, int]] = {}
+        self._refs: Dict[bytes, BodyRef] = {}
+        self._interned: Dict[str, str] = {}
+        self._file: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def __len__(self) -> int:
+        """Number of distinct bodies stored."""
+        return len(self._refs)
+    
+    def put(self, text: str) -> BodyRef:
+        """
+        Store a body.
+        
+        Args:
+            text: Body text
+        
+        Returns:
+            Reference shared by every body with the same content
+        
+        Raises:
+            RuntimeError: If the store is closed
+        """
+        data = text.encode('utf-8', 'surrogatepass')
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        with self._lock:
+            self._check_open()
+            self.logical_bytes += len(data)
+            ref = self._refs.get(key)
+            if ref is not None:
+                if key in self._hot:
+                    self._hot.move_to_end(key)
+                return ref
+            ref = self._refs[key] = BodyRef(self, key, len(text))
+            self.stored_bytes += len(data)
+            self._keep(key, data)
+            return ref
+    
+    def get(self, key: bytes) -> str:
+        """
+        Read a body by its key.
+        
+        Raises:
+            KeyError: If no body has this key
+            RuntimeError: If the store is closed
+        """
+        with self._lock:
+            self._check_open()
+            data = self._hot.get(key)
+            if data is not None:
+                self._hot.move_to_end(key)
+            else:
+                offset, length = self._spilled[key]
+                self._file.seek(offset)
+                data = self._file.read(length)
+                self._keep(key, data)
+        return data.decode('utf-8', 'surrogatepass')
+    
+    def intern(self, text: str) -> str:
+        """Return the one stored string equal to ``text``, adding it if new."""
+        with self._lock:
+            return self._interned.setdefault(text, text)
+    
+    def _keep(self, key: bytes, data: bytes) -> None:
+        """Hold a body in memory, spilling the coldest ones over the budget."""
+        self._hot[key] = data
+        self.memory_bytes += len(data)
+        while self.memory_bytes > self.memory_budget and self._hot:
+            cold_key, cold = self._hot.popitem(last=False)
+            self.memory_bytes -= len(cold)
+            # A body read back from disk is already there
+            if cold_key not in self._spilled:
+                if self._file is None:
+                    self._file = tempfile.TemporaryFile(dir=self.directory)
+                self._file.seek(self.disk_bytes)
+                self._file.write(cold)
+                self._spilled[cold_key] = (self.disk_bytes, len(cold))
+                self.disk_bytes += len(cold)
+    
+    def _check_open(self) -> None:
+        """Reject use of a closed store."""
+        if self._closed:
+            raise RuntimeError('BodyStore is closed')
+    
+    def close(self) -> None:
+        """Drop the bodies and delete the spill file."""
+        with self._lock:
+            self._closed = True
+            self._hot.clear()
+            self._interned.clear()
+            self.memory_bytes = 0
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def __enter__(self) -> 'BodyStore':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def store_entry_bodies(entry: SemanticHarEntry, store: BodyStore) -> SemanticHarEntry:
+    """
+    Move the bodies of an entry into a store.
+    
+    A response body of at least ``store.min_size`` characters is replaced
+    by a BodyRef; ``ResponseBody.data`` reads it back. Request bodies are
+    read directly by the builders, so they stay strings and are only
+    deduplicated with ``BodyStore.intern``.
+    
+    Args:
+        entry: Entry to update in place
+        store: Store receiving the bodies
+    
+    Returns:
+        The same entry
+    """
+    body = entry.response.body
+    if body is not None and isinstance(body.text, str) and len(body.text) >= store.min_size:
+        body.text = store.put(body.text)
+    request_body = entry.request.body
+    if request_body is not None and len(request_body.data) >= store.min_size:
+        request_body.data = store.intern(request_body.data)
+    return entry
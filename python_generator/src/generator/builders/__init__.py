@@ -3,9 +3,12 @@
 from .request_block_builder import RequestBlockBuilder
 from .keycheck_block_builder import KeycheckBlockBuilder
 from .parse_block_builder import ParseBlockBuilder
+from .body_emitter import BodyEmitter, BodyReport
 
 __all__ = [
     'RequestBlockBuilder',
     'KeycheckBlockBuilder',
     'ParseBlockBuilder',
+    'BodyEmitter',
+    'BodyReport',
 ]
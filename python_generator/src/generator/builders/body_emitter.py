@@ -0,0 +1,219 @@
+"""Request body emission for REQUEST blocks."""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional, Set
+
+from ..types import BodyOptions, RequestBody
+
+
+# Characters of a body escaped per pass; bounds the copies made while
+# escaping a large body
+ESCAPE_CHUNK = 64 * 1024
+
+# A JSON string literal, captured so that ``split`` keeps it
+_JSON_STRING = re.compile(r'("[^"\\]*(?:\\.[^"\\]*)*")')
+
+# File extension of a side file by body content type
+_SIDE_FILE_SUFFIX = {'json': '.json'}
+
+
+def _utf8_length(text: str) -> int:
+    """Return the UTF-8 size of text, without encoding ASCII-only strings."""
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-8', 'surrogatepass'))
+
+
+def escaped_length(text: str) -> int:
+    """Return the UTF-8 size of text once escaped for a LoliCode string."""
+    return _utf8_length(text) + text.count('\\') + text.count('"')
+
+
+def escape_chunks(text: str, write: Callable[[str], Any], chunk_size: int = ESCAPE_CHUNK) -> None:
+    """
+    Write text escaped for a LoliCode string literal.
+    
+    Backslashes and double quotes are escaped with a backslash. The text is
+    escaped ``chunk_size`` characters at a time, so a large body costs one
+    chunk of extra memory rather than two full copies; chunks without
+    anything to escape are written as they are.
+    
+    Args:
+        text: Text to escape
+        write: Sink for the escaped text
+        chunk_size: Characters escaped per pass
+    """
+    for start in range(0, len(text), chunk_size):
+        chunk = text[start:start + chunk_size] if len(text) > chunk_size else text
+        if '"' in chunk or '\\' in chunk:
+            chunk = chunk.replace('\\', '\\\\').replace('"', '\\"')
+        write(chunk)
+
+
+def minify_json(text: str) -> str:
+    """
+    Remove insignificant whitespace from a JSON document.
+    
+    Only whitespace outside string literals is removed, so numbers, key
+    order and duplicate keys are kept exactly as captured.
+    
+    Args:
+        text: JSON text
+    
+    Returns:
+        The minified text, or ``text`` itself if it is not valid JSON
+    """
+    try:
+        json.loads(text)
+    except ValueError:
+        return text
+    parts = _JSON_STRING.split(text)
+    # Even positions are outside strings, where valid JSON has whitespace
+    # only between tokens
+    parts[::2] = [''.join(part.split()) for part in parts[::2]]
+    return ''.join(parts)
+
+
+@dataclass
+class BodyReport:
+    """Sizes of the request bodies written into one script, in UTF-8 bytes."""
+    bodies: int = 0
+    # Escaped size of the bodies as captured
+    original_bytes: int = 0
+    # Size of the body text written into the script
+    written_bytes: int = 0
+    # Removed by JSON minification
+    minified_bytes: int = 0
+    side_files: int = 0
+    side_file_bytes: int = 0
+    
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes of body text kept out of the script."""
+        return self.original_bytes - self.written_bytes
+    
+    def to_dict(self) -> Dict[str, int]:
+        """Convert to a dictionary, including ``bytes_saved``."""
+        result = asdict(self)
+        result['bytes_saved'] = self.bytes_saved
+        return result
+
+
+class BodyEmitter:
+    """
+    Writes request bodies into REQUEST blocks according to BodyOptions.
+    
+    Bodies are escaped in chunks. With ``minify_json``, JSON bodies lose
+    their insignificant whitespace first. Bodies over the side file
+    threshold are written once to a file named after a hash of their
+    content; the block then reads the file into a variable with a UTILITY
+    line and sends that variable. ``report`` adds up the sizes involved.
+    """
+    
+    def __init__(self, options: Optional[BodyOptions] = None, chunk_size: int = ESCAPE_CHUNK):
+        """
+        Initialize the emitter.
+        
+        Args:
+            options: Body options (defaults to escaping only)
+            chunk_size: Characters escaped per pass
+        
+        Raises:
+            ValueError: If the side file options are inconsistent
+        """
+        self.options = options or BodyOptions()
+        self.chunk_size = chunk_size
+        self.report = BodyReport()
+        self._side_files: Set[str] = set()
+        if self.options.side_file_threshold is not None:
+            if self.options.side_file_threshold < 0:
+                raise ValueError('side_file_threshold must not be negative')
+            if not self.options.side_file_dir:
+                raise ValueError('side_file_dir is required with side_file_threshold')
+            if '"' in self.options.side_file_dir:
+                raise ValueError('side_file_dir must not contain double quotes')
+    
+    def prepare(self, body: RequestBody) -> str:
+        """
+        Return the body text to send, minified if configured.
+        
+        Args:
+            body: Request body
+        
+        Returns:
+            Body text
+        """
+        text = body.data
+        if self.options.minify_json and body.content_type == 'json':
+            minified = minify_json(text)
+            # Whitespace is ASCII, so the character difference is in bytes
+            self.report.minified_bytes += len(text) - len(minified)
+            return minified
+        return text
+    
+    def side_file(self, write: Callable[[str], Any], body: RequestBody, text: str) -> Optional[str]:
+        """
+        Move a body over the threshold into a side file.
+        
+        Writes the UTILITY line reading the file, followed by a newline,
+        so it must be called before the REQUEST line.
+        
+        Args:
+            write: Sink for the block text
+            body: Request body
+            text: Body text from ``prepare``
+        
+        Returns:
+            The variable reference to send as content, or None if the body
+            stays inline
+        
+        Raises:
+            OSError: If the side file cannot be written
+        """
+        threshold = self.options.side_file_threshold
+        if threshold is None:
+            return None
+        size = _utf8_length(text)
+        if size < threshold:
+            return None
+        
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+        name = digest + _SIDE_FILE_SUFFIX.get(body.content_type, '.txt')
+        path = os.path.join(self.options.side_file_dir, name)
+        # Equal bodies share one file, written once
+        if path not in self._side_files:
+            os.makedirs(self.options.side_file_dir, exist_ok=True)
+            with open(path, 'w', encoding='utf-8', errors='surrogatepass', newline='') as f:
+                f.write(text)
+            self._side_files.add(path)
+            self.report.side_files += 1
+            self.report.side_file_bytes += size
+        variable = f'BODY_{digest.upper()}'
+        escaped_path = path.replace('\\', '\\\\')
+        write(f'UTILITY File "{escaped_path}" Read -> VAR "{variable}"\n')
+        return f'<{variable}>'
+    
+    def write(self, write: Callable[[str], Any], body: RequestBody, text: str, reference: Optional[str] = None) -> None:
+        """
+        Write the content of a CONTENT line, without its quotes.
+        
+        Args:
+            write: Sink for the block text
+            body: Request body as captured
+            text: Body text from ``prepare``
+            reference: Variable reference from ``side_file``, sent instead
+                of the text
+        """
+        report = self.report
+        report.bodies += 1
+        report.original_bytes += escaped_length(body.data)
+        if reference is not None:
+            report.written_bytes += len(reference)
+            write(reference)
+            return
+        report.written_bytes += escaped_length(text)
+        escape_chunks(text, write, self.chunk_size)
@@ -1,11 +1,44 @@
 """Request block builder for LoliCode generation."""
 
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 from ..types import SemanticHarEntry, CustomHeader
+from .body_emitter import BodyEmitter
+
+
+# Writes one piece of script text, e.g. ``list.append`` or ``io.StringIO.write``
+Write = Callable[[str], Any]
+
+# Headers left out of REQUEST blocks: the User-Agent is replaced by a default,
+# cookies get their own line and the length is recomputed when sending
+SKIP_HEADERS = frozenset({'user-agent', 'cookie', 'content-length'})
+
+_USER_AGENT_LINE = '\n  "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"'
 
 
 class RequestBlockBuilder:
-    """Builder for REQUEST blocks in LoliCode."""
+    """
+    Builder for REQUEST blocks in LoliCode.
+    
+    ``write`` emits a block into a sink shared with the caller, as one
+    piece for the request line and headers plus the body, so the generator
+    joins nothing per block; ``build`` returns it as a string. Header names
+    repeat across a capture, so whether each name is skipped is decided
+    once and remembered.
+    """
+    
+    def __init__(self, skip_headers: Iterable[str] = SKIP_HEADERS, bodies: Optional[BodyEmitter] = None):
+        """
+        Initialize the builder.
+        
+        Args:
+            skip_headers: Header names (any case) to leave out of blocks
+            bodies: Emitter for request bodies (defaults to escaping only)
+        """
+        self.bodies = bodies or BodyEmitter()
+        self.skip_headers = frozenset(name.lower() for name in skip_headers)
+        # Header names already seen, as written, by whether they are kept
+        self._kept: Set[str] = set()
+        self._skipped: Set[str] = set()
     
     def build(self, entry: SemanticHarEntry, custom_headers: Optional[List[CustomHeader]] = None) -> str:
         """
@@ -14,46 +47,96 @@ class RequestBlockBuilder:
         Args:
             entry: The HAR entry to convert
             custom_headers: Optional list of custom headers to add
-            
+        
         Returns:
             The generated REQUEST block as a string
         """
-        lines: List[str] = []
+        parts: List[str] = []
+        self.write(parts.append, entry, custom_headers)
+        return ''.join(parts)
+    
+    def write(
+        self,
+        write: Write,
+        entry: SemanticHarEntry,
+        custom_headers: Optional[List[CustomHeader]] = None,
+        bodies: Optional[BodyEmitter] = None
+    ) -> None:
+        """
+        Write a REQUEST block from a HAR entry, without a trailing newline.
+        
+        Enabled custom headers replace request headers of the same
+        (lowercased) name in place and the others follow them, as if the
+        two were merged into one dict, but the request headers are not
+        copied.
+        
+        A body moved to a side file is read by a UTILITY line written
+        before the REQUEST line.
+        
+        Args:
+            write: Sink for the block text
+            entry: The HAR entry to convert
+            custom_headers: Optional list of custom headers to add
+            bodies: Emitter for the body, instead of the builder's own
+        """
         request = entry.request
+        body = request.body
+        if body:
+            bodies = bodies or self.bodies
+            text = bodies.prepare(body)
+            reference = bodies.side_file(write, body, text)
         
-        # Build REQUEST line
-        content = f'"{request.url}"'
+        # Build REQUEST line and the default User-Agent
         if request.method != 'GET':
-            content += f' {request.method}'
-        lines.append(f'REQUEST {content}')
-        
-        # Add default User-Agent
-        lines.append('  "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"')
+            head = f'REQUEST "{request.url}" {request.method}{_USER_AGENT_LINE}'
+        else:
+            head = f'REQUEST "{request.url}"{_USER_AGENT_LINE}'
         
-        # Merge custom headers if provided
-        headers = dict(request.headers)
+        # Add headers (skip some default ones), without calling back into
+        # the builder for names already classified
+        kept = self._kept
+        skipped = self._skipped
+        headers = request.headers
+        overrides: Dict[str, str] = {}
         if custom_headers:
-            for h in custom_headers:
-                if h.enabled:
-                    headers[h.key.lower()] = h.value
-        
-        # Add headers (skip some default ones)
-        skip_headers = ['user-agent', 'cookie', 'content-length']
-        for key, value in headers.items():
-            if key.lower() not in skip_headers:
-                lines.append(f'  "{key}: {value}"')
+            # Custom headers override by lowercased name; later ones win
+            overrides = {h.key.lower(): h.value for h in custom_headers if h.enabled}
+        if overrides:
+            lines = [
+                f'\n  "{key}: {overrides[key] if key in overrides else value}"' for key, value in headers.items()
+                if key in kept or (key not in skipped and self._keeps(key))
+            ]
+            for key, value in overrides.items():
+                if key not in headers and (key in kept or (key not in skipped and self._keeps(key))):
+                    lines.append(f'\n  "{key}: {value}"')
+            header_lines = ''.join(lines)
+        else:
+            header_lines = ''.join([
+                f'\n  "{key}: {value}"' for key, value in headers.items()
+                if key in kept or (key not in skipped and self._keeps(key))
+            ])
         
         # Add cookies if present
         if request.cookies:
-            cookie_string = '; '.join(f'{k}={v}' for k, v in request.cookies.items())
-            lines.append(f'  "Cookie: {cookie_string}"')
-        
-        # Add body if present
-        if request.body:
-            # Escape quotes in body content
-            body = request.body.data.replace('\\', '\\\\').replace('"', '\\"')
-            lines.append(f'  CONTENT "{body}"')
-            content_type = 'application/json' if request.body.content_type == 'json' else 'application/x-www-form-urlencoded'
-            lines.append(f'  "Content-Type: {content_type}"')
-        
-        return '\n'.join(lines)
+            cookie_string = '; '.join([f'{k}={v}' for k, v in request.cookies.items()])
+            write(f'{head}{header_lines}\n  "Cookie: {cookie_string}"')
+        else:
+            write(f'{head}{header_lines}')
+        
+        # Add body if present; it is written in escaped chunks, not copied
+        # into a line
+        if body:
+            write('\n  CONTENT "')
+            bodies.write(write, body, text, reference)
+            if body.content_type == 'json':
+                write('"\n  "Content-Type: application/json"')
+            else:
+                write('"\n  "Content-Type: application/x-www-form-urlencoded"')
+    
+    def _keeps(self, name: str) -> bool:
+        """Classify a header name not seen before and remember the answer."""
+        if name.lower() in self.skip_headers:
+            self._skipped.add(name)
+            return False
+        self._kept.add(name)
+        return True
@@ -0,0 +1,382 @@
+"""Command-line batch conversion of HAR files to LoliCode scripts."""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .analyzer import build_dependency_matrix
+from .ingest import ingest_har_file
+from .lolicode_generator import LoliCodeGenerator
+from .types import (
+    LoliCodeConfig,
+    BodyOptions,
+    CustomHeader,
+    CustomAssertion,
+    VariableExtraction,
+    DependencyMatrix,
+    SemanticHarEntry,
+)
+
+
+OUTPUT_SUFFIX = '.loli'
+
+# Keys accepted in the JSON config file
+CONFIG_KEYS = {
+    'selected_indices',
+    'refine',
+    'custom_headers',
+    'custom_assertions',
+    'variable_extractions',
+    'settings',
+    'body_options',
+    'dependency_order',
+}
+
+# Suffix of the directory of side files written next to a script
+SIDE_FILE_DIR_SUFFIX = '_bodies'
+
+
+@dataclass
+class FileReport:
+    """Outcome of converting one HAR file."""
+    source: str
+    output: str
+    entries: int = 0
+    seconds: float = 0.0
+    bytes_saved: int = 0
+    error: Optional[str] = None
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """
+    Read a JSON config file.
+    
+    The file holds an object with any of the ``LoliCodeConfig`` fields
+    (per-request options keyed by request index) and ``dependency_order``,
+    which orders requests by detected dependencies (the default) rather
+    than chronologically. Without ``selected_indices`` every request of
+    each capture is converted. ``body_options`` holds the ``BodyOptions``
+    fields; side files default to a directory next to each script.
+    
+    Args:
+        path: Path to the config file
+    
+    Returns:
+        The config options
+    
+    Raises:
+        ValueError: If the file is not a JSON object of known, well-formed
+            options
+    """
+    with open(path, encoding='utf-8') as f:
+        options = json.load(f)
+    if not isinstance(options, dict):
+        raise ValueError(f'{path}: config must be a JSON object')
+    unknown = sorted(set(options) - CONFIG_KEYS)
+    if unknown:
+        raise ValueError(f'{path}: unknown config option(s): {", ".join(unknown)}')
+    # Check the option shapes once here rather than in every worker
+    try:
+        build_config(options, 0)
+    except ValueError as e:
+        raise ValueError(f'{path}: {e}') from None
+    return options
+
+
+def build_config(options: Dict[str, Any], entry_count: int) -> LoliCodeConfig:
+    """
+    Build the generation configuration for one capture.
+    
+    Args:
+        options: Options from ``load_config``
+        entry_count: Number of entries in the capture
+    
+    Returns:
+        Generation configuration
+    
+    Raises:
+        ValueError: If an option does not have the expected shape
+    """
+    def per_index(key: str, item_type: type) -> Optional[Dict[int, list]]:
+        raw = options.get(key)
+        if not raw:
+            return None
+        return {
+            int(index): [item_type(**item) for item in items]
+            for index, items in raw.items()
+        }
+    
+    selected = options.get('selected_indices')
+    body_options = options.get('body_options')
+    try:
+        return LoliCodeConfig(
+            selected_indices=list(range(entry_count)) if selected is None else [int(i) for i in selected],
+            refine=bool(options.get('refine', False)),
+            custom_headers=per_index('custom_headers', CustomHeader),
+            custom_assertions=per_index('custom_assertions', CustomAssertion),
+            variable_extractions=per_index('variable_extractions', VariableExtraction),
+            settings=options.get('settings'),
+            body_options=BodyOptions(**body_options) if body_options is not None else None
+        )
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f'malformed config: {e}') from None
+
+
+def expand_inputs(patterns: Sequence[str], recursive: bool = False) -> List[str]:
+    """
+    Resolve files, glob patterns and directories to HAR file paths.
+    
+    Args:
+        patterns: Paths, glob patterns or directories
+        recursive: Also search subdirectories of directory inputs
+    
+    Returns:
+        Matching paths in argument order, each listed once
+    
+    Raises:
+        ValueError: If a pattern matches nothing
+    """
+    paths: Dict[str, None] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            sub = os.path.join('**', '*.har') if recursive else '*.har'
+            matches = sorted(glob.glob(os.path.join(pattern, sub), recursive=recursive))
+        elif os.path.isfile(pattern):
+            matches = [pattern]
+        else:
+            matches = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        if not matches:
+            raise ValueError(f'No HAR files match {pattern!r}')
+        for path in matches:
+            paths.setdefault(os.path.normpath(path), None)
+    return list(paths)
+
+
+def output_path(source: str, output_dir: Optional[str]) -> str:
+    """Return the script path for a HAR file."""
+    stem = os.path.splitext(source)[0]
+    if output_dir is not None:
+        stem = os.path.join(output_dir, os.path.basename(stem))
+    return stem + OUTPUT_SUFFIX
+
+
+def is_complete(output: str, inputs: Sequence[str]) -> bool:
+    """
+    Check whether an output is newer than all its inputs.
+    
+    Outputs are only created by an atomic rename once fully written, so
+    an existing one is complete; it is stale if an input changed since.
+    
+    Args:
+        output: Script path
+        inputs: The HAR file and config file it was generated from
+    
+    Returns:
+        Whether the output can be kept
+    """
+    try:
+        written = os.stat(output).st_mtime
+    except OSError:
+        return False
+    return all(os.stat(path).st_mtime <= written for path in inputs)
+
+
+def _check_entries(entries: Sequence[SemanticHarEntry]) -> None:
+    """
+    Check the entry fields that generation relies on.
+    
+    A malformed capture then fails with a message naming the entry and
+    field, rather than deep in a builder.
+    
+    Raises:
+        ValueError: If an entry has a field of the wrong type
+    """
+    for index, entry in enumerate(entries):
+        request = entry.request
+        status = entry.response.status
+        if not isinstance(request.url, str):
+            raise ValueError(f'entry {index}: request url must be a string, got {request.url!r}')
+        if not isinstance(request.method, str):
+            raise ValueError(f'entry {index}: request method must be a string, got {request.method!r}')
+        if not isinstance(status, int) or isinstance(status, bool):
+            raise ValueError(f'entry {index}: response status must be a number, got {status!r}')
+
+
+def convert_file(source: str, output: str, options: Dict[str, Any]) -> FileReport:
+    """
+    Parse one HAR file and write its LoliCode script.
+    
+    The script is streamed to a temporary file that replaces ``output``
+    only once complete. Errors are reported rather than raised, so one bad
+    capture does not stop a batch.
+    
+    Args:
+        source: HAR file path
+        output: Script path
+        options: Options from ``load_config``
+    
+    Returns:
+        Report for the file
+    """
+    report = FileReport(source=source, output=output)
+    start = time.perf_counter()
+    partial = output + '.part'
+    try:
+        # Response headers and bodies are only needed to find dependencies
+        dependency_order = options.get('dependency_order', True)
+        profile = 'analysis' if dependency_order else 'minimal'
+        entries = ingest_har_file(source, max_workers=1, profile=profile).entries
+        report.entries = len(entries)
+        _check_entries(entries)
+        config = build_config(options, len(entries))
+        body_options = config.body_options
+        if body_options is not None and body_options.side_file_threshold is not None and not body_options.side_file_dir:
+            # Absolute, since OpenBullet resolves paths against its own directory
+            body_options.side_file_dir = os.path.abspath(os.path.splitext(output)[0] + SIDE_FILE_DIR_SUFFIX)
+        if dependency_order:
+            dependency_matrix = build_dependency_matrix(entries)
+        else:
+            dependency_matrix = DependencyMatrix(topological_order=list(range(len(entries))))
+        
+        generator = LoliCodeGenerator(cache_max_bytes=0)
+        with open(partial, 'w', encoding='utf-8') as f:
+            asyncio.run(generator.generate_to(f, config, entries, dependency_matrix))
+        os.replace(partial, output)
+        if generator.body_report is not None:
+            report.bytes_saved = generator.body_report.bytes_saved
+    except Exception as e:
+        # Whatever goes wrong with one capture only fails that file
+        expected = isinstance(e, (OSError, ValueError, RuntimeError))
+        report.error = str(e) if expected else f'{type(e).__name__}: {e}'
+        if os.path.exists(partial):
+            os.remove(partial)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def convert_files(
+    jobs: Sequence[Tuple[str, str]],
+    options: Dict[str, Any],
+    max_workers: Optional[int] = None
+) -> Iterator[FileReport]:
+    """
+    Convert HAR files across a process pool.
+    
+    Args:
+        jobs: ``(source, output)`` path pairs
+        options: Options from ``load_config``
+        max_workers: Worker process count (defaults to the CPU count)
+    
+    Yields:
+        Reports in completion order
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for source, output in jobs:
+            yield convert_file(source, output, options)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(convert_file, source, output, options)
+            for source, output in jobs
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _rate(count: float, seconds: float) -> float:
+    """Return ``count`` per second, guarding against a zero duration."""
+    return count / seconds if seconds > 0 else 0.0
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='lolicode-gen',
+        description='Convert HAR files to LoliCode scripts for OpenBullet 2.'
+    )
+    parser.add_argument('inputs', nargs='+', help='HAR files, glob patterns or directories')
+    parser.add_argument('-c', '--config', help='JSON config file with generation options')
+    parser.add_argument('-o', '--output-dir', help='Directory for the scripts (default: next to each HAR file)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('-r', '--recursive', action='store_true', help='Search subdirectories of directory inputs')
+    parser.add_argument('-f', '--force', action='store_true', help='Regenerate scripts that are already up to date')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the batch converter.
+    
+    Args:
+        argv: Command-line arguments (defaults to ``sys.argv[1:]``)
+    
+    Returns:
+        Exit status: 0 on success, 1 if any file failed, 2 on bad arguments
+    """
+    args = _parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        print('lolicode-gen: --jobs must be at least 1', file=sys.stderr)
+        return 2
+    try:
+        sources = expand_inputs(args.inputs, args.recursive)
+        options = load_config(args.config) if args.config else {}
+    except (OSError, ValueError) as e:
+        print(f'lolicode-gen: {e}', file=sys.stderr)
+        return 2
+    
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    outputs = [output_path(source, args.output_dir) for source in sources]
+    if len(set(outputs)) != len(outputs):
+        print('lolicode-gen: several inputs would write the same script; '
+              'drop --output-dir or rename the captures', file=sys.stderr)
+        return 2
+    
+    config_inputs = [args.config] if args.config else []
+    jobs = []
+    skipped = 0
+    for source, output in zip(sources, outputs):
+        if not args.force and is_complete(output, [source] + config_inputs):
+            skipped += 1
+            print(f'skip  {source} -> {output} (up to date)')
+        else:
+            jobs.append((source, output))
+    
+    start = time.perf_counter()
+    converted = 0
+    failed = 0
+    entries = 0
+    bytes_saved = 0
+    for done, report in enumerate(convert_files(jobs, options, args.jobs), 1):
+        progress = f'[{done}/{len(jobs)}]'
+        if report.error is not None:
+            failed += 1
+            print(f'{progress} FAILED {report.source}: {report.error}', file=sys.stderr)
+            continue
+        converted += 1
+        entries += report.entries
+        bytes_saved += report.bytes_saved
+        saved = f', {report.bytes_saved} body bytes saved' if report.bytes_saved else ''
+        print(f'{progress} {report.source} -> {report.output}: {report.entries} entries '
+              f'in {report.seconds:.2f}s ({_rate(report.entries, report.seconds):.0f} entries/s){saved}')
+    elapsed = time.perf_counter() - start
+    
+    print(f'Converted {converted} file(s), {entries} entries in {elapsed:.2f}s '
+          f'({_rate(converted, elapsed):.2f} files/s, {_rate(entries, elapsed):.0f} entries/s); '
+          f'{skipped} up to date, {failed} failed')
+    if bytes_saved:
+        print(f'Body options saved {bytes_saved} bytes of script text')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Memory-mapped HAR entry store with lazy decoding."""
+
+import json
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Sequence, Tuple, Union, overload
+
+from .parser import DEFAULT_PROFILE, ProfileSpec, _JsonScanner, get_profile, transform_entry
+from .types import SemanticHarEntry
+
+
+class EntryStore(Sequence[SemanticHarEntry]):
+    """
+    Read-only sequence of HAR entries backed by a memory-mapped file.
+    
+    Opening a store makes a single pass over the file that records the byte
+    span of every entry in two ``array('Q')`` columns (16 bytes per entry).
+    Entries are only decoded into SemanticHarEntry objects when they are
+    accessed, and a small LRU cache keeps recently used ones around; it is
+    locked, so a store can be read from several threads. The
+    resident cost of a store is therefore the index plus the cache, not the
+    size of the capture.
+    
+    Entries without a request object are left out of the index, matching
+    the skipping behaviour of HarStreamingParser; entries that only fail
+    when decoded can be dropped afterwards with ``discard``. A store can also be opened
+    without an index and indexed in batches with ``index_batches``, to
+    report progress or use the first entries while the rest of a large file
+    is still being scanned.
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, 'os.PathLike[str]'],
+        cache_size: int = 256,
+        index: bool = True,
+        profile: ProfileSpec = DEFAULT_PROFILE
+    ):
+        """
+        Open and index a HAR file.
+        
+        Args:
+            path: Path to the HAR file
+            cache_size: Maximum number of decoded entries to keep cached
+            index: Index the whole file now; if False, call
+                ``index_batches`` to index it
+            profile: Parse profile, or its name, used to decode entries
+        
+        Raises:
+            ValueError: If the file is not valid HAR JSON or the profile
+                is unknown
+        """
+        self.path = os.fspath(path)
+        self.cache_size = cache_size
+        self.profile = get_profile(profile)
+        self.entries_skipped = 0
+        self._starts = array('Q')
+        self._ends = array('Q')
+        self._cache: 'OrderedDict[int, SemanticHarEntry]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._indexed = False
+        
+        self._file = open(self.path, 'rb')
+        try:
+            if os.fstat(self._file.fileno()).st_size == 0:
+                raise ValueError('Invalid HAR file: file is empty')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self.file_size = len(self._map)
+        
+        if index:
+            try:
+                for _ in self.index_batches():
+                    pass
+            except Exception:
+                self.close()
+                raise
+    
+    def index_batches(self, batch_size: int = 1000) -> Iterator[Tuple[int, int]]:
+        """
+        Record the byte span of every entry that has a request object.
+        
+        Indexed entries can be read while indexing goes on; the length of
+        the store grows with every batch.
+        
+        Args:
+            batch_size: Entries to index between yields
+        
+        Yields:
+            ``(entries, offset)``: entries indexed so far and the byte offset
+            scanned up to; the last yield has ``offset == file_size``
+        
+        Raises:
+            RuntimeError: If the store has already been indexed
+            ValueError: If the file is not valid HAR JSON
+        """
+        if self._indexed:
+            raise RuntimeError('EntryStore is already indexed')
+        self._indexed = True
+        scanner = _JsonScanner(self._map)
+        if scanner.seek_entries():
+            pending = 0
+            for start, end in scanner.iter_spans():
+                if _has_request(scanner, start, end):
+                    self._starts.append(start)
+                    self._ends.append(end)
+                    pending += 1
+                else:
+                    self.entries_skipped += 1
+                if pending >= batch_size:
+                    pending = 0
+                    yield len(self), end
+        yield len(self), self.file_size
+    
+    @property
+    def index_size(self) -> int:
+        """Size in bytes of the offset index."""
+        return (
+            self._starts.itemsize * len(self._starts)
+            + self._ends.itemsize * len(self._ends)
+        )
+    
+    def __len__(self) -> int:
+        return len(self._starts)
+    
+    @overload
+    def __getitem__(self, index: int) -> SemanticHarEntry: ...
+    
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[SemanticHarEntry]: ...
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('EntryStore index out of range')
+        
+        with self._cache_lock:
+            entry = self._cache.get(index)
+            if entry is not None:
+                self._cache.move_to_end(index)
+                return entry
+        
+        entry = transform_entry(self.raw_entry(index), self.profile)
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[index] = entry
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return entry
+    
+    def __iter__(self) -> Iterator[SemanticHarEntry]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def raw_entry(self, index: int) -> Dict[str, Any]:
+        """
+        Decode the raw HAR object of an entry without transforming it.
+        
+        Args:
+            index: Entry index
+        
+        Returns:
+            The decoded HAR entry dict
+        """
+        return json.loads(self._map[self._starts[index]:self._ends[index]])
+    
+    def discard(self, index: int) -> None:
+        """
+        Drop an entry from the index, such as one that fails to decode.
+        
+        Later entries move down by one index and the decoded entry cache is
+        cleared. The entry is counted in ``entries_skipped``.
+        
+        Args:
+            index: Entry index
+        """
+        del self._starts[index]
+        del self._ends[index]
+        with self._cache_lock:
+            self._cache.clear()
+        self.entries_skipped += 1
+    
+    def span(self, index: int) -> Tuple[int, int]:
+        """Return the ``(start, end)`` byte offsets of an entry in the file."""
+        return self._starts[index], self._ends[index]
+    
+    def close(self) -> None:
+        """Release the memory map and the underlying file."""
+        self._cache.clear()
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+    
+    def __enter__(self) -> 'EntryStore':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _has_request(scanner: _JsonScanner, start: int, end: int) -> bool:
+    """Check, without decoding, that the object at ``start`` has a request object."""
+    scanner.pos = start
+    try:
+        found = scanner.seek_key('request') and scanner.peek() == ord('{')
+    except ValueError:
+        found = False
+    scanner.pos = end
+    return found
+
@@ -0,0 +1,419 @@
+"""Columnar table of HAR entry scalar fields for bulk queries."""
+
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .types import RequestBody, SemanticHarEntry, SemanticHarRequest, SemanticHarResponse
+
+
+# array typecodes and the matching numpy dtypes for each column
+_COLUMNS = {
+    'status': ('i', 'int32'),
+    'method': ('B', 'uint8'),
+    'host': ('i', 'int32'),
+    'timestamp': ('d', 'float64'),
+    'duration': ('d', 'float64'),
+    'body_size': ('q', 'int64'),
+}
+
+
+def _parse_timestamp(value: str) -> float:
+    """Convert an ISO 8601 ``startedDateTime`` to epoch seconds (NaN if invalid)."""
+    if not value:
+        return math.nan
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return math.nan
+
+
+def _as_int(value: Any) -> int:
+    """Coerce a captured number, such as a ``"200"`` status, to int (0 if invalid)."""
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError, OverflowError):
+        return 0
+
+
+def _as_float(value: Any) -> float:
+    """Coerce a captured number, such as a ``"12.5"`` time, to float (0.0 if invalid)."""
+    if type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _body_size(body: Optional[RequestBody]) -> int:
+    """Return the length of a request body (0 if there is none)."""
+    if body is None:
+        return 0
+    try:
+        return len(body.data)
+    except TypeError:
+        return 0
+
+
+def _url_hostname(url: str) -> str:
+    """Return the hostname of a URL ('' if it has none or cannot be split)."""
+    try:
+        return urlsplit(url).hostname or ''
+    except ValueError:
+        return ''
+
+
+def _format_timestamp(value: float) -> str:
+    """Convert epoch seconds back to an ISO 8601 UTC timestamp ('' if unknown)."""
+    if math.isnan(value):
+        return ''
+    iso = datetime.fromtimestamp(value, timezone.utc).isoformat(timespec='milliseconds')
+    return iso.replace('+00:00', 'Z')
+
+
+class EntryTable:
+    """
+    Column-wise store of the scalar fields of parsed HAR entries.
+    
+    Each of ``status``, ``method``, ``host``, ``timestamp``, ``duration`` and
+    ``body_size`` is one contiguous column. Methods and hosts are stored as
+    small integer codes into ``methods`` and ``hosts``. URLs live in a single
+    string with an offset column. When NumPy is installed the columns are
+    NumPy arrays and queries are vectorized mask operations; otherwise they
+    are ``array.array`` columns queried with plain loops.
+    
+    The table keeps an optional reference to the sequence it was built from
+    (for example an EntryStore) so rows can be turned back into full
+    SemanticHarEntry objects on demand.
+    """
+    
+    def __init__(self, use_numpy: Optional[bool] = None):
+        """
+        Create an empty table.
+        
+        Args:
+            use_numpy: Force NumPy columns on or off (defaults to whether
+                NumPy is installed)
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError('NumPy is not installed')
+        self.use_numpy = use_numpy
+        self.methods: List[str] = []
+        self.hosts: List[str] = []
+        self.source: Optional[Sequence[SemanticHarEntry]] = None
+        self._method_codes: Dict[str, int] = {}
+        self._host_codes: Dict[str, int] = {}
+        self._columns = {name: array(code) for name, (code, _) in _COLUMNS.items()}
+        self._url_parts: List[str] = []
+        self._url_offsets = array('Q', [0])
+        self._urls = ''
+        self._sort_keys: Dict[str, Any] = {}
+        self._frozen = False
+    
+    @classmethod
+    def from_entries(
+        cls,
+        entries: Iterable[SemanticHarEntry],
+        keep_source: bool = True,
+        use_numpy: Optional[bool] = None
+    ) -> 'EntryTable':
+        """
+        Build a table from parsed entries.
+        
+        Args:
+            entries: Entries to tabulate
+            keep_source: Keep a reference to ``entries`` (if it is a
+                sequence) for converting rows back into entries
+            use_numpy: Force NumPy columns on or off
+        
+        Returns:
+            The frozen table
+        """
+        table = cls(use_numpy)
+        for entry in entries:
+            table.append(entry)
+        table.freeze()
+        if keep_source and isinstance(entries, Sequence):
+            table.source = entries
+        return table
+    
+    def _code(self, codes: Dict[str, int], names: List[str], name: str) -> int:
+        """Return the code of ``name``, assigning the next one if needed."""
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+        return code
+    
+    def append(self, entry: SemanticHarEntry) -> None:
+        """
+        Add one entry as a new row.
+        
+        Captures are not always well typed: a status, time or timestamp
+        that is not a number or date is stored as 0 (NaN for timestamps)
+        rather than failing the load.
+        
+        Raises:
+            RuntimeError: If the table has already been frozen
+        """
+        if self._frozen:
+            raise RuntimeError('EntryTable is frozen')
+        request = entry.request
+        url = request.url
+        columns = self._columns
+        columns['status'].append(_as_int(entry.response.status))
+        columns['method'].append(self._code(self._method_codes, self.methods, request.method.upper()))
+        columns['host'].append(self._code(self._host_codes, self.hosts, _url_hostname(url)))
+        columns['timestamp'].append(_parse_timestamp(entry.timestamp))
+        columns['duration'].append(_as_float(entry.duration))
+        columns['body_size'].append(_body_size(request.body))
+        self._url_parts.append(url)
+        self._url_offsets.append(self._url_offsets[-1] + len(url))
+    
+    def freeze(self) -> None:
+        """Finish building: join the URL table and expose columns for querying."""
+        if self._frozen:
+            return
+        self._urls = ''.join(self._url_parts)
+        self._url_parts = []
+        if self.use_numpy:
+            # Zero-copy views over the array buffers
+            self._columns = {
+                name: np.frombuffer(column, dtype=_COLUMNS[name][1])
+                for name, column in self._columns.items()
+            }
+        self._frozen = True
+    
+    def __len__(self) -> int:
+        return len(self._url_offsets) - 1
+    
+    def column(self, name: str) -> Any:
+        """Return a column as a NumPy array or ``array.array``."""
+        return self._columns[name]
+    
+    @property
+    def status(self) -> Any:
+        """HTTP status column."""
+        return self._columns['status']
+    
+    @property
+    def method(self) -> Any:
+        """Method code column; codes index into ``methods``."""
+        return self._columns['method']
+    
+    @property
+    def host(self) -> Any:
+        """Host id column; ids index into ``hosts``."""
+        return self._columns['host']
+    
+    @property
+    def timestamp(self) -> Any:
+        """Start time column in epoch seconds (NaN when unknown)."""
+        return self._columns['timestamp']
+    
+    @property
+    def duration(self) -> Any:
+        """Duration column in milliseconds."""
+        return self._columns['duration']
+    
+    @property
+    def body_size(self) -> Any:
+        """Request body length column."""
+        return self._columns['body_size']
+    
+    def url(self, index: int) -> str:
+        """Return the URL of a row."""
+        if not self._frozen:
+            return self._url_parts[index]
+        return self._urls[self._url_offsets[index]:self._url_offsets[index + 1]]
+    
+    def method_name(self, index: int) -> str:
+        """Return the method of a row."""
+        return self.methods[self._columns['method'][index]]
+    
+    def host_name(self, index: int) -> str:
+        """Return the hostname of a row."""
+        return self.hosts[self._columns['host'][index]]
+    
+    def mask(
+        self,
+        method: Optional[str] = None,
+        host: Optional[str] = None,
+        status: Optional[Tuple[int, int]] = None
+    ) -> Any:
+        """
+        Compute a boolean row mask for the given conditions (all must hold).
+        
+        Args:
+            method: Request method, case-insensitive
+            host: Exact hostname
+            status: Half-open ``(low, high)`` status range, e.g. ``(200, 300)``
+        
+        Returns:
+            A NumPy bool array, or a list of bools without NumPy
+        """
+        method_code = self._method_codes.get(method.upper()) if method is not None else None
+        host_code = self._host_codes.get(host) if host is not None else None
+        missing = (method is not None and method_code is None) or (host is not None and host_code is None)
+        
+        if self.use_numpy:
+            result = np.full(len(self), not missing, dtype=bool)
+            if missing:
+                return result
+            if method_code is not None:
+                result &= self.method == method_code
+            if host_code is not None:
+                result &= self.host == host_code
+            if status is not None:
+                result &= (self.status >= status[0]) & (self.status < status[1])
+            return result
+        
+        if missing:
+            return [False] * len(self)
+        low, high = status if status is not None else (None, None)
+        return [
+            (method_code is None or m == method_code)
+            and (host_code is None or h == host_code)
+            and (low is None or low <= s < high)
+            for m, h, s in zip(self.method, self.host, self.status)
+        ]
+    
+    def select(
+        self,
+        method: Optional[str] = None,
+        host: Optional[str] = None,
+        status: Optional[Tuple[int, int]] = None
+    ) -> List[int]:
+        """
+        Return the indices of rows matching all given conditions.
+        
+        See ``mask`` for the meaning of the arguments.
+        """
+        result = self.mask(method, host, status)
+        if self.use_numpy:
+            return np.flatnonzero(result).tolist()
+        return [i for i, keep in enumerate(result) if keep]
+    
+    def sort_keys(self, name: str) -> Any:
+        """
+        Return a numeric key per row that orders rows by a column.
+        
+        Methods and hosts are ranked by name rather than by code, and URLs
+        by their text (equal URLs share a rank), so sorting any column is a
+        plain numeric sort. Keys of a frozen table are computed once and
+        cached.
+        
+        Args:
+            name: Column name, or ``'url'``
+        
+        Returns:
+            A NumPy array or ``array.array`` of keys
+        """
+        keys = self._sort_keys.get(name)
+        if keys is not None:
+            return keys
+        
+        if name == 'url':
+            ranks = array('i', [0]) * len(self)
+            rank = -1
+            previous = None
+            for index in sorted(range(len(self)), key=self.url):
+                url = self.url(index)
+                if url != previous:
+                    rank += 1
+                    previous = url
+                ranks[index] = rank
+            keys = np.frombuffer(ranks, dtype='int32') if self.use_numpy and self._frozen else ranks
+        elif name in ('method', 'host'):
+            names = self.methods if name == 'method' else self.hosts
+            name_ranks = [0] * len(names)
+            for rank, code in enumerate(sorted(range(len(names)), key=names.__getitem__)):
+                name_ranks[code] = rank
+            codes = self._columns[name]
+            if self.use_numpy and self._frozen:
+                keys = np.asarray(name_ranks, dtype='int32')[codes]
+            else:
+                keys = array('i', [name_ranks[code] for code in codes])
+        else:
+            keys = self._columns[name]
+        
+        if self._frozen:
+            self._sort_keys[name] = keys
+        return keys
+    
+    def argsort(self, name: str, descending: bool = False) -> List[int]:
+        """
+        Return row indices ordered by a column (stable).
+        
+        Args:
+            name: Column name, or ``'url'`` to sort by URL text
+            descending: Sort from largest to smallest
+        """
+        keys = self.sort_keys(name)
+        if self.use_numpy and self._frozen:
+            if not descending:
+                return np.argsort(keys, kind='stable').tolist()
+            # Stable descending order: sort the reversed keys and map back
+            order = np.argsort(keys[::-1], kind='stable')[::-1]
+            return (len(keys) - 1 - order).tolist()
+        return sorted(range(len(self)), key=keys.__getitem__, reverse=descending)
+    
+    def value_counts(self, name: str) -> Dict[Any, int]:
+        """
+        Count rows per distinct value of a column.
+        
+        Method and host columns are reported by name rather than by code.
+        """
+        column = self._columns[name]
+        labels = {'method': self.methods, 'host': self.hosts}.get(name)
+        if self.use_numpy:
+            values, counts = np.unique(column, return_counts=True)
+            pairs = zip(values.tolist(), counts.tolist())
+        else:
+            counts_by_value: Dict[Any, int] = {}
+            for value in column:
+                counts_by_value[value] = counts_by_value.get(value, 0) + 1
+            pairs = counts_by_value.items()
+        if labels is None:
+            return dict(pairs)
+        return {labels[value]: count for value, count in pairs}
+    
+    def to_entry(self, index: int) -> SemanticHarEntry:
+        """
+        Convert a row back into a SemanticHarEntry.
+        
+        Returns the original entry when the table kept its source sequence;
+        otherwise rebuilds an entry from the stored scalar fields only
+        (headers, cookies and body are not stored in the table).
+        """
+        if self.source is not None:
+            return self.source[index]
+        duration = self._columns['duration'][index]
+        timestamp = self._columns['timestamp'][index]
+        return SemanticHarEntry(
+            request=SemanticHarRequest(
+                url=self.url(index),
+                method=self.method_name(index),
+                headers={},
+                cookies={}
+            ),
+            response=SemanticHarResponse(status=int(self._columns['status'][index])),
+            timestamp=_format_timestamp(float(timestamp)),
+            duration=float(duration)
+        )
+    
+    def to_entries(self, indices: Iterable[int]) -> List[SemanticHarEntry]:
+        """Convert several rows back into entries."""
+        return [self.to_entry(i) for i in indices]
@@ -0,0 +1,443 @@
+"""HAR entry filtering with rules compiled once into predicates."""
+
+import operator
+import re
+import weakref
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .entry_table import EntryTable, _url_hostname, np
+from .types import SemanticHarEntry
+
+
+FILTER_TARGETS = (
+    'url',
+    'url-hostname',
+    'url-path',
+    'url-query',
+    'request-method',
+    'request-header',
+    'response-status',
+    'body-size',
+)
+
+STRING_OPERATORS = ('contains', 'not-contains', 'equals', 'not-equals', 'starts-with', 'ends-with', 'regex')
+NUMERIC_OPERATORS = ('greater-than', 'less-than', 'in-range')
+FILTER_OPERATORS = STRING_OPERATORS + NUMERIC_OPERATORS
+
+FILTER_LOGIC = ('AND', 'OR')
+
+# Targets stored as EntryTable columns
+_COLUMN_TARGETS = {
+    'request-method': 'method',
+    'url-hostname': 'host',
+    'response-status': 'status',
+    'body-size': 'body_size',
+}
+
+# Targets whose columns hold codes into a list of names
+_NAMED_COLUMNS = {'method': 'methods', 'host': 'hosts'}
+
+# Evaluation order in ``CompiledFilter.mask``: cheapest first
+_COST = {'url': 1, 'url-path': 1, 'url-query': 1, 'request-header': 2}
+
+# (function(text, needle) -> bool, negated) per string operator
+_STRING_TESTS = {
+    'contains': (operator.contains, False),
+    'not-contains': (operator.contains, True),
+    'equals': (operator.eq, False),
+    'not-equals': (operator.eq, True),
+    'starts-with': (str.startswith, False),
+    'ends-with': (str.endswith, False),
+}
+
+# Per-table string columns for URL targets, keyed by (target, case folded)
+_string_columns: 'weakref.WeakKeyDictionary[EntryTable, Dict[Tuple[str, bool], List[str]]]' = (
+    weakref.WeakKeyDictionary()
+)
+
+Predicate = Callable[[SemanticHarEntry], bool]
+
+
+@dataclass
+class FilterRule:
+    """
+    One filter condition, like ``SemanticFilterRule`` in the web app.
+    
+    String operators compare the target as text; numeric operators parse it
+    as a number, and ``in-range`` takes an inclusive ``"min-max"`` value
+    whose bounds may be signed, like ``"-10--1"``.
+    Matching ignores case unless ``case_sensitive`` is set, for regexes too.
+    A ``request-header`` rule tests the value of the header named by
+    ``header`` (case-insensitively), or all headers as ``"name: value"``
+    lines when ``header`` is None.
+    """
+    target: str
+    operator: str
+    value: str
+    case_sensitive: bool = False
+    enabled: bool = True
+    header: Optional[str] = None
+
+
+# The URL splitting regex of RFC 3986, appendix B; it matches any string
+_URL_PARTS_RE = re.compile(r'(?:[^:/?#]+:)?(?://[^/?#]*)?(?P<path>[^?#]*)(?P<query>(?:\?[^#]*)?)')
+
+# The dash between the bounds of an in-range value; a dash that starts a
+# bound or an exponent is a sign, as in "-10--1" or "1e-3-2"
+_RANGE_SEPARATOR_RE = re.compile(r'(?<=[\d.\s])-')
+
+
+def _url_path(url: str) -> str:
+    """Return the path of a URL."""
+    return _URL_PARTS_RE.match(url).group('path')
+
+
+def _url_query(url: str) -> str:
+    """Return the query of a URL with its ``?``, or an empty string."""
+    return _URL_PARTS_RE.match(url).group('query')
+
+
+_URL_PARTS: Dict[str, Callable[[str], str]] = {
+    'url': str,
+    'url-path': _url_path,
+    'url-query': _url_query,
+    'url-hostname': _url_hostname,
+}
+
+
+def _header_text(headers: Dict[str, str], name: Optional[str]) -> Optional[str]:
+    """Return one header's value, or all headers as lines when ``name`` is None."""
+    if name is None:
+        return '\n'.join(f'{key}: {value}' for key, value in headers.items())
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class _CompiledRule:
+    """A rule with its operands parsed and its regex compiled."""
+    
+    def __init__(self, rule: FilterRule):
+        if rule.target not in FILTER_TARGETS:
+            raise ValueError(f'Unknown filter target: {rule.target!r}')
+        if rule.operator not in FILTER_OPERATORS:
+            raise ValueError(f'Unknown filter operator: {rule.operator!r}')
+        self.target = rule.target
+        self.operator = rule.operator
+        self.header = rule.header
+        self.fold = not rule.case_sensitive
+        self.cost = _COST.get(rule.target, 0)
+        self.pattern: Optional['re.Pattern[str]'] = None
+        self.bounds: Tuple[float, float] = (0.0, 0.0)
+        
+        if rule.operator == 'regex':
+            try:
+                self.pattern = re.compile(rule.value, re.IGNORECASE if self.fold else 0)
+            except re.error as e:
+                raise ValueError(f'Invalid filter regex {rule.value!r}: {e}') from e
+        elif rule.operator in NUMERIC_OPERATORS:
+            self.bounds = self._parse_bounds(rule)
+        else:
+            self.needle = rule.value.lower() if self.fold else rule.value
+            self.function, self.negated = _STRING_TESTS[rule.operator]
+        self.extract = self._extractor()
+    
+    @staticmethod
+    def _parse_bounds(rule: FilterRule) -> Tuple[float, float]:
+        """Parse a numeric operand into inclusive or exclusive bounds."""
+        try:
+            if rule.operator == 'in-range':
+                low, high = _RANGE_SEPARATOR_RE.split(rule.value, 1)
+                return float(low), float(high)
+            number = float(rule.value)
+        except ValueError:
+            raise ValueError(f'Invalid numeric filter value {rule.value!r} for {rule.operator}') from None
+        if rule.operator == 'greater-than':
+            return number, float('inf')
+        return float('-inf'), number
+    
+    def _extractor(self) -> Callable[[SemanticHarEntry], Any]:
+        """Return a function reading the target value from an entry."""
+        target = self.target
+        if target in _URL_PARTS:
+            part = _URL_PARTS[target]
+            return lambda entry: part(entry.request.url)
+        if target == 'request-method':
+            return lambda entry: entry.request.method.upper()
+        if target == 'response-status':
+            return lambda entry: entry.response.status
+        if target == 'body-size':
+            return lambda entry: len(entry.request.body.data) if entry.request.body else 0
+        header = self.header
+        return lambda entry: _header_text(entry.request.headers, header)
+    
+    def test(self, value: Any) -> bool:
+        """Check one target value."""
+        if value is None:
+            return False
+        if self.operator in NUMERIC_OPERATORS:
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                return False
+            low, high = self.bounds
+            if self.operator == 'in-range':
+                return low <= number <= high
+            return low < number < high
+        text = str(value)
+        if self.pattern is not None:
+            return self.pattern.search(text) is not None
+        if self.fold:
+            text = text.lower()
+        return self.function(text, self.needle) != self.negated
+    
+    def matches(self, entry: SemanticHarEntry) -> bool:
+        """Check an entry."""
+        return self.test(self.extract(entry))
+    
+    def hits(self, table: EntryTable, rows: Optional[Sequence[int]]) -> Any:
+        """
+        Evaluate the rule on table rows.
+        
+        Args:
+            table: Frozen table
+            rows: Row indices, or None for all rows
+        
+        Returns:
+            One bool per row, as a NumPy array or a list
+        """
+        column = _COLUMN_TARGETS.get(self.target)
+        if column is not None:
+            return self._column_hits(table, column, rows)
+        if self.target == 'request-header':
+            if table.source is None:
+                raise ValueError('Header filters need the entries the table was built from')
+            source = table.source
+            indices = range(len(table)) if rows is None else list(map(int, rows))
+            return self._collect((self.matches(source[i]) for i in indices), len(indices), table.use_numpy)
+        
+        strings = _strings(table, self.target, self.fold and self.operator in _STRING_TESTS)
+        if rows is not None:
+            strings = list(map(strings.__getitem__, rows))
+        if self.pattern is not None:
+            results: Iterable[Any] = map(self.pattern.search, strings)
+        elif self.operator in NUMERIC_OPERATORS:
+            results = map(self.test, strings)
+        else:
+            results = map(self.function, strings, repeat(self.needle))
+        hits = self._collect(results, len(strings), table.use_numpy)
+        if self.pattern is None and self.operator not in NUMERIC_OPERATORS and self.negated:
+            return ~hits if table.use_numpy else [not hit for hit in hits]
+        return hits
+    
+    def _column_hits(self, table: EntryTable, column: str, rows: Optional[Sequence[int]]) -> Any:
+        """Evaluate the rule on a table column."""
+        values = table.column(column)
+        if rows is not None:
+            values = values[rows] if table.use_numpy else [values[i] for i in rows]
+        
+        names = _NAMED_COLUMNS.get(column)
+        if names is not None:
+            # Test each distinct name once, then look rows up by code
+            passed = [self.test(name) for name in getattr(table, names)]
+            if table.use_numpy:
+                return np.asarray(passed, dtype=bool)[values] if passed else np.zeros(len(values), dtype=bool)
+            return [passed[code] for code in values]
+        
+        if table.use_numpy:
+            if self.operator in NUMERIC_OPERATORS:
+                low, high = self.bounds
+                if self.operator == 'in-range':
+                    return (values >= low) & (values <= high)
+                return (values > low) & (values < high)
+            distinct, inverse = np.unique(values, return_inverse=True)
+            passed = np.fromiter(map(self.test, distinct.tolist()), dtype=bool, count=len(distinct))
+            return passed[inverse]
+        
+        tested: Dict[Any, bool] = {}
+        hits = []
+        for value in values:
+            hit = tested.get(value)
+            if hit is None:
+                hit = tested[value] = self.test(value)
+            hits.append(hit)
+        return hits
+    
+    @staticmethod
+    def _collect(results: Iterable[Any], count: int, use_numpy: bool) -> Any:
+        """Turn truthy results into a bool array or list."""
+        if use_numpy:
+            return np.fromiter(results, dtype=bool, count=count)
+        return list(map(bool, results))
+
+
+def _strings(table: EntryTable, target: str, fold: bool) -> List[str]:
+    """Return a URL-derived string column of a table, built once per table."""
+    columns = _string_columns.setdefault(table, {})
+    key = (target, fold)
+    strings = columns.get(key)
+    if strings is None:
+        if fold:
+            strings = list(map(str.lower, _strings(table, target, False)))
+        elif target == 'url':
+            strings = list(map(table.url, range(len(table))))
+        else:
+            group = operator.methodcaller('group', target[len('url-'):])
+            strings = list(map(group, map(_URL_PARTS_RE.match, _strings(table, 'url', False))))
+        columns[key] = strings
+    return strings
+
+
+class CompiledFilter:
+    """
+    Filter rules compiled once for repeated evaluation.
+    
+    Rules are parsed and their regexes compiled up front, and AND/OR
+    combinations short-circuit. Entries are tested with the filter as a
+    predicate; ``mask`` evaluates whole EntryTable columns instead: rules on
+    method, host, status and body size are vector operations or test each
+    distinct value once, and the more expensive URL and header rules only
+    look at rows the cheaper rules left undecided.
+    """
+    
+    def __init__(self, rules: Iterable[FilterRule], logic: str = 'AND'):
+        """
+        Compile rules.
+        
+        Args:
+            rules: Filter rules; disabled ones are ignored
+            logic: ``'AND'`` (all rules must match) or ``'OR'`` (any rule)
+        
+        Raises:
+            ValueError: If a rule or the logic is invalid
+        """
+        if logic not in FILTER_LOGIC:
+            raise ValueError(f'Unknown filter logic: {logic!r}')
+        self.logic = logic
+        self._rules = [_CompiledRule(rule) for rule in rules if rule.enabled]
+        
+        checks = [rule.matches for rule in self._rules]
+        if not checks:
+            self._predicate: Predicate = lambda entry: True
+        elif len(checks) == 1:
+            self._predicate = checks[0]
+        elif logic == 'AND':
+            self._predicate = lambda entry: all(check(entry) for check in checks)
+        else:
+            self._predicate = lambda entry: any(check(entry) for check in checks)
+    
+    def __call__(self, entry: SemanticHarEntry) -> bool:
+        """Check whether an entry passes the filter."""
+        return self._predicate(entry)
+    
+    def filter(self, entries: Iterable[SemanticHarEntry]) -> List[SemanticHarEntry]:
+        """Return the entries that pass the filter."""
+        return [entry for entry in entries if self._predicate(entry)]
+    
+    def indices(self, entries: Iterable[SemanticHarEntry]) -> List[int]:
+        """Return the indices of the entries that pass the filter."""
+        return [index for index, entry in enumerate(entries) if self._predicate(entry)]
+    
+    def mask(self, table: EntryTable) -> Any:
+        """
+        Evaluate the filter over a table.
+        
+        Args:
+            table: Frozen table; header rules also need its ``source``
+        
+        Returns:
+            A NumPy bool array, or a list of bools without NumPy
+        
+        Raises:
+            ValueError: If a header rule is used on a table without source
+        """
+        count = len(table)
+        if not self._rules:
+            return np.ones(count, dtype=bool) if table.use_numpy else [True] * count
+        
+        conjunction = self.logic == 'AND'
+        result = None
+        rows: Optional[Sequence[int]] = None
+        for rule in sorted(self._rules, key=lambda rule: rule.cost):
+            hits = rule.hits(table, rows)
+            if result is None:
+                result = hits
+            elif rows is None:
+                result[:] = hits
+            elif table.use_numpy:
+                result[rows] = hits
+            else:
+                for row, hit in zip(rows, hits):
+                    result[row] = hit
+            
+            # Only rows the next rule can still change need evaluating
+            if table.use_numpy:
+                rows = np.flatnonzero(result if conjunction else ~result)
+            else:
+                rows = [row for row, hit in enumerate(result) if hit == conjunction]
+            if len(rows) == 0:
+                break
+            if len(rows) == count:
+                rows = None
+        return result
+
+
+def compile_filter(rules: Iterable[FilterRule], logic: str = 'AND') -> CompiledFilter:
+    """
+    Compile filter rules.
+    
+    Args:
+        rules: Filter rules; disabled ones are ignored
+        logic: ``'AND'`` or ``'OR'``
+    
+    Returns:
+        The compiled filter
+    
+    Raises:
+        ValueError: If a rule or the logic is invalid
+    """
+    return CompiledFilter(rules, logic)
+
+
+def apply_filters(
+    entries: Iterable[SemanticHarEntry],
+    rules: Iterable[FilterRule],
+    logic: str = 'AND'
+) -> List[SemanticHarEntry]:
+    """
+    Return the entries that pass the filter rules.
+    
+    Args:
+        entries: Entries to filter
+        rules: Filter rules; disabled ones are ignored
+        logic: ``'AND'`` or ``'OR'``
+    
+    Returns:
+        Matching entries in their original order
+    
+    Raises:
+        ValueError: If a rule or the logic is invalid
+    """
+    return CompiledFilter(rules, logic).filter(entries)
+
+
+def filter_mask(table: EntryTable, rules: Iterable[FilterRule], logic: str = 'AND') -> Any:
+    """
+    Evaluate filter rules over the columns of a table.
+    
+    Args:
+        table: Frozen table; header rules also need its ``source``
+        rules: Filter rules; disabled ones are ignored
+        logic: ``'AND'`` or ``'OR'``
+    
+    Returns:
+        A NumPy bool array, or a list of bools without NumPy
+    
+    Raises:
+        ValueError: If a rule or the logic is invalid
+    """
+    return CompiledFilter(rules, logic).mask(table)
@@ -0,0 +1,226 @@
+"""Graph algorithms over per-request dependency sets."""
+
+import heapq
+from typing import Iterable, List, Sequence, Tuple
+
+
+# ``dependencies[i]`` holds the nodes that node ``i`` depends on
+Dependencies = Sequence[Iterable[int]]
+
+
+def _is_chronological(dependencies: Dependencies) -> bool:
+    """Return whether every node depends only on existing lower-numbered nodes."""
+    for i, targets in enumerate(dependencies):
+        if targets and (max(targets) >= i or min(targets) < 0):
+            return False
+    return True
+
+
+def strongly_connected_components(dependencies: Dependencies) -> List[List[int]]:
+    """
+    Find strongly connected components with an iterative Tarjan's algorithm.
+    
+    Components are returned dependencies-first: every dependency of a
+    component lies in the component itself or in one returned before it.
+    
+    Args:
+        dependencies: Dependency sets per node
+    
+    Returns:
+        Components, each a sorted list of nodes
+    
+    Raises:
+        ValueError: If a dependency refers to a node that does not exist
+    """
+    n = len(dependencies)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+    
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(dependencies[root]))]
+        
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if not 0 <= child < n:
+                    raise ValueError(f'Node {node} depends on unknown node {child}')
+                if index[child] == -1:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, iter(dependencies[child])))
+                    break
+                if on_stack[child] and index[child] < low[node]:
+                    low[node] = index[child]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.sort()
+                    components.append(component)
+    
+    return components
+
+
+def condensation(dependencies: Dependencies) -> Tuple[List[List[int]], List[int], Dependencies]:
+    """
+    Collapse each strongly connected component into a single node.
+    
+    Args:
+        dependencies: Dependency sets per node
+    
+    Returns:
+        ``(components, component_of, component_dependencies)``: the
+        components, the component index of each node, and the acyclic
+        dependencies between components
+    """
+    if _is_chronological(dependencies):
+        # Already acyclic: every component is a single node
+        n = len(dependencies)
+        return [[i] for i in range(n)], list(range(n)), dependencies
+    
+    components = strongly_connected_components(dependencies)
+    component_of = [0] * len(dependencies)
+    for k, component in enumerate(components):
+        for node in component:
+            component_of[node] = k
+    
+    component_dependencies: List[List[int]] = []
+    for k, component in enumerate(components):
+        targets = {
+            component_of[j]
+            for node in component
+            for j in dependencies[node]
+        }
+        targets.discard(k)
+        component_dependencies.append(sorted(targets))
+    return components, component_of, component_dependencies
+
+
+def topological_sort(dependencies: Dependencies) -> List[int]:
+    """
+    Order nodes so that every node comes after its dependencies.
+    
+    Uses Kahn's algorithm over the condensation, so cycles do not stop the
+    sort: the members of a cycle are emitted together, in index order. When
+    several nodes are ready, the lowest index goes first, which keeps the
+    order chronological wherever the dependencies allow.
+    
+    Args:
+        dependencies: Dependency sets per node
+    
+    Returns:
+        Every node exactly once, in dependency order
+    """
+    if _is_chronological(dependencies):
+        return list(range(len(dependencies)))
+    
+    components, _, component_dependencies = condensation(dependencies)
+    dependents: List[List[int]] = [[] for _ in components]
+    remaining = [len(targets) for targets in component_dependencies]
+    for k, targets in enumerate(component_dependencies):
+        for target in targets:
+            dependents[target].append(k)
+    
+    ready = [(components[k][0], k) for k, count in enumerate(remaining) if count == 0]
+    heapq.heapify(ready)
+    order: List[int] = []
+    while ready:
+        _, k = heapq.heappop(ready)
+        order.extend(components[k])
+        for dependent in dependents[k]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                heapq.heappush(ready, (components[dependent][0], dependent))
+    return order
+
+
+def dependency_depths(dependencies: Dependencies) -> List[int]:
+    """
+    Compute the length of the longest dependency chain below each node.
+    
+    Nodes without dependencies have depth 0. Members of a cycle share the
+    depth of their component.
+    
+    Args:
+        dependencies: Dependency sets per node
+    
+    Returns:
+        Depth of each node
+    """
+    components, _, component_dependencies = condensation(dependencies)
+    # Components come dependencies-first, so one pass in order suffices
+    component_depths = [0] * len(components)
+    for k, targets in enumerate(component_dependencies):
+        if targets:
+            component_depths[k] = 1 + max(map(component_depths.__getitem__, targets))
+    
+    depths = [0] * len(dependencies)
+    for k, component in enumerate(components):
+        for node in component:
+            depths[node] = component_depths[k]
+    return depths
+
+
+def critical_path(dependencies: Dependencies, depths: Sequence[int]) -> List[int]:
+    """
+    Find a longest dependency chain.
+    
+    The chain ends at the first node with the greatest depth and is traced
+    back through dependencies one level shallower at each step, preferring
+    the lowest index. Inside a cycle the trace moves to the member that
+    leads out of it.
+    
+    Args:
+        dependencies: Dependency sets per node
+        depths: Depths from ``dependency_depths``
+    
+    Returns:
+        Nodes of the chain, first dependency first; ``[0]`` when nothing
+        depends on anything
+    """
+    n = len(dependencies)
+    if n == 0:
+        return []
+    end = max(range(n), key=depths.__getitem__)
+    if depths[end] == 0:
+        return [0]
+    
+    path = [end]
+    current = end
+    while depths[current] > 0:
+        wanted = depths[current] - 1
+        previous = min((j for j in dependencies[current] if depths[j] == wanted), default=None)
+        if previous is None:
+            # The way down leaves the cycle from another of its members
+            components, component_of, _ = condensation(dependencies)
+            for member in components[component_of[current]]:
+                previous = min((j for j in dependencies[member] if depths[j] == wanted), default=None)
+                if previous is not None:
+                    path.append(member)
+                    break
+        path.append(previous)
+        current = previous
+    path.reverse()
+    return path
@@ -0,0 +1,201 @@
+"""Parallel transformation of HAR entries across a process pool."""
+
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .body_store import BodyStore, store_entry_bodies
+from .entry_store import EntryStore
+from .parser import DEFAULT_PROFILE, ParseProfile, ProfileSpec, get_profile, transform_entry
+from .types import SemanticHarEntry
+
+
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_SERIAL_THRESHOLD = 5000
+
+
+@dataclass
+class IngestResult:
+    """Result of transforming a batch of raw HAR entries."""
+    entries: List[SemanticHarEntry] = field(default_factory=list)
+    skipped: int = 0
+
+
+def _transform_chunk(
+    raw_entries: Sequence[Dict[str, Any]],
+    profile: ParseProfile,
+    body_store: Optional[BodyStore] = None
+) -> IngestResult:
+    """
+    Transform one chunk of raw entries, skipping malformed ones.
+    
+    Args:
+        raw_entries: Decoded HAR entry objects
+        profile: Parse profile
+        body_store: Store to move large bodies into, in-process only
+    
+    Returns:
+        The transformed entries and the number skipped
+    """
+    result = IngestResult()
+    for raw in raw_entries:
+        try:
+            result.entries.append(transform_entry(raw, profile, body_store))
+        except (ValueError, TypeError, AttributeError):
+            result.skipped += 1
+    return result
+
+
+def _transform_file_chunk(
+    path: str,
+    spans: Sequence[Tuple[int, int]],
+    profile: ParseProfile,
+    body_store: Optional[BodyStore] = None
+) -> IngestResult:
+    """
+    Decode and transform the entries at the given byte spans of a HAR file.
+    
+    Each worker maps the file itself, so only offsets are sent to it.
+    
+    Args:
+        path: Path to the HAR file
+        spans: ``(start, end)`` byte offsets of the entries
+        profile: Parse profile
+        body_store: Store to move large bodies into, in-process only
+    
+    Returns:
+        The transformed entries and the number skipped
+    """
+    result = IngestResult()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for start, end in spans:
+            try:
+                result.entries.append(transform_entry(json.loads(data[start:end]), profile, body_store))
+            except (ValueError, TypeError, AttributeError):
+                result.skipped += 1
+    return result
+
+
+def _run_serially(count: int, max_workers: Optional[int], serial_threshold: int) -> bool:
+    """Decide whether a pool is worth starting for ``count`` entries."""
+    workers = max_workers or os.cpu_count() or 1
+    return count < serial_threshold or workers == 1
+
+
+def _merge(results, body_store: Optional[BodyStore] = None) -> IngestResult:
+    """Concatenate chunk results in order, moving their bodies into a store."""
+    merged = IngestResult()
+    for result in results:
+        if body_store is not None:
+            for entry in result.entries:
+                store_entry_bodies(entry, body_store)
+        merged.entries.extend(result.entries)
+        merged.skipped += result.skipped
+    return merged
+
+
+def transform_entries(
+    raw_entries: Sequence[Dict[str, Any]],
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    serial_threshold: int = DEFAULT_SERIAL_THRESHOLD,
+    profile: ProfileSpec = DEFAULT_PROFILE,
+    body_store: Optional[BodyStore] = None
+) -> IngestResult:
+    """
+    Transform raw HAR entries, in parallel for large inputs.
+    
+    The entries are split into chunks of ``chunk_size``, transformed in a
+    ProcessPoolExecutor and reassembled in their original order. Malformed
+    entries are skipped per chunk and counted in the result.
+    
+    Args:
+        raw_entries: Decoded HAR entry objects
+        max_workers: Worker process count (defaults to the CPU count)
+        chunk_size: Number of entries sent to a worker at a time
+        serial_threshold: Inputs smaller than this are transformed in-process,
+            as are all inputs when only one worker is available
+        profile: Parse profile or its name, deciding which response fields
+            are kept
+        body_store: Store to move large bodies into; with a process pool
+            each chunk's bodies are moved as it arrives
+    
+    Returns:
+        The transformed entries and the number skipped
+    
+    Raises:
+        ValueError: If ``chunk_size`` is below 1 or the profile is unknown
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    profile = get_profile(profile)
+    
+    if _run_serially(len(raw_entries), max_workers, serial_threshold):
+        return _transform_chunk(raw_entries, profile, body_store)
+    
+    chunks = [
+        raw_entries[i:i + chunk_size]
+        for i in range(0, len(raw_entries), chunk_size)
+    ]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return _merge(executor.map(_transform_chunk, chunks, [profile] * len(chunks)), body_store)
+
+
+def ingest_har_file(
+    path: Union[str, 'os.PathLike[str]'],
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    serial_threshold: int = DEFAULT_SERIAL_THRESHOLD,
+    profile: ProfileSpec = DEFAULT_PROFILE,
+    body_store: Optional[BodyStore] = None
+) -> IngestResult:
+    """
+    Parse a HAR file into entries, in parallel for large captures.
+    
+    The file is indexed once in this process; workers receive only byte
+    offsets and decode their own chunk from a memory map of the file, so
+    raw entries are never pickled.
+    
+    Args:
+        path: Path to the HAR file
+        max_workers: Worker process count (defaults to the CPU count)
+        chunk_size: Number of entries sent to a worker at a time
+        serial_threshold: Captures smaller than this are parsed in-process,
+            as are all captures when only one worker is available
+        profile: Parse profile or its name, deciding which response fields
+            are kept
+        body_store: Store to move large bodies into; with a process pool
+            each chunk's bodies are moved as it arrives
+    
+    Returns:
+        The transformed entries and the number skipped
+    
+    Raises:
+        ValueError: If ``chunk_size`` is below 1 or the profile is unknown
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    profile = get_profile(profile)
+    
+    path = os.fspath(path)
+    with EntryStore(path, cache_size=0) as store:
+        spans = [store.span(i) for i in range(len(store))]
+        index_skipped = store.entries_skipped
+    
+    if _run_serially(len(spans), max_workers, serial_threshold):
+        result = _transform_file_chunk(path, spans, profile, body_store)
+    else:
+        chunks = [spans[i:i + chunk_size] for i in range(0, len(spans), chunk_size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            result = _merge(executor.map(
+                _transform_file_chunk,
+                [path] * len(chunks),
+                chunks,
+                [profile] * len(chunks)
+            ), body_store)
+    
+    result.skipped += index_skipped
+    return result
@@ -1,7 +1,8 @@
 """LoliCode script generator for OpenBullet 2."""
 
+import io
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence, TextIO
 from urllib.parse import urlparse
 
 from .types import (
@@ -13,30 +14,45 @@ from .builders import (
     RequestBlockBuilder,
     KeycheckBlockBuilder,
     ParseBlockBuilder,
+    BodyEmitter,
+    BodyReport,
 )
-from .validators import LoliCodeValidator
+from .validators import LoliCodeValidator, StreamingValidator
+from .section_cache import DEFAULT_MAX_BYTES, SectionCache, section_key
+
+
+# Joins script sections with a blank line
+SECTION_SEPARATOR = '\n\n'
+
+# Rule above and below the comment heading each request section
+_SECTION_RULE = '# ─────────────────────────────────────────────────────────────'
 
 
 class LoliCodeGenerator:
     """Generator for LoliCode scripts from HAR analysis."""
     
-    def __init__(self, retries: int = 0):
+    def __init__(self, retries: int = 0, cache_max_bytes: int = DEFAULT_MAX_BYTES):
         """
         Initialize the LoliCode generator.
         
         Args:
             retries: Number of retry attempts for generation
+            cache_max_bytes: Size limit of the rendered request section
+                cache; 0 disables caching
         """
         self.request_builder = RequestBlockBuilder()
         self.keycheck_builder = KeycheckBlockBuilder()
         self.parse_builder = ParseBlockBuilder()
         self.validator = LoliCodeValidator()
+        self.section_cache = SectionCache(cache_max_bytes)
         self.retries = retries
+        # Body sizes of the last script generated with body options
+        self.body_report: Optional[BodyReport] = None
     
     async def generate(
         self,
         config: LoliCodeConfig,
-        entries: List[SemanticHarEntry],
+        entries: Sequence[SemanticHarEntry],
         dependency_matrix: DependencyMatrix
     ) -> str:
         """
@@ -46,56 +62,142 @@ class LoliCodeGenerator:
             config: Generation configuration
             entries: Filtered HAR entries
             dependency_matrix: Request dependencies
-            
+        
         Returns:
             Valid LoliCode script
-            
+        
         Raises:
             ValueError: If configuration is invalid
             RuntimeError: If generated script is invalid
         """
+        buffer = io.StringIO()
+        await self.generate_to(buffer, config, entries, dependency_matrix)
+        return buffer.getvalue()
+    
+    async def generate_to(
+        self,
+        stream: TextIO,
+        config: LoliCodeConfig,
+        entries: Sequence[SemanticHarEntry],
+        dependency_matrix: DependencyMatrix
+    ) -> int:
+        """
+        Generate a LoliCode script directly into a text stream.
+        
+        Sections are written as soon as they are generated and validated, so
+        memory use is bounded by the largest section. The written text is
+        identical to the result of ``generate``. If a section fails
+        validation, the sections before it have already been written.
+        
+        Args:
+            stream: Writable text stream, e.g. an open file
+            config: Generation configuration
+            entries: Filtered HAR entries
+            dependency_matrix: Request dependencies
+        
+        Returns:
+            Number of characters written
+        
+        Raises:
+            ValueError: If configuration is invalid
+            RuntimeError: If a generated section is invalid
+        """
+        written = 0
+        async for section in self.iter_sections(config, entries, dependency_matrix):
+            if written:
+                written += stream.write(SECTION_SEPARATOR)
+            written += stream.write(section)
+        return written
+    
+    async def iter_sections(
+        self,
+        config: LoliCodeConfig,
+        entries: Sequence[SemanticHarEntry],
+        dependency_matrix: DependencyMatrix
+    ) -> AsyncIterator[str]:
+        """
+        Generate the script one validated section at a time.
+        
+        Yields the header, the settings block (if any), one section per
+        selected request in dependency order, and the footer. Joining them
+        with ``SECTION_SEPARATOR`` gives the output of ``generate``.
+        
+        Args:
+            config: Generation configuration
+            entries: Filtered HAR entries
+            dependency_matrix: Request dependencies
+        
+        Yields:
+            Script sections
+        
+        Raises:
+            ValueError: If configuration is invalid
+            RuntimeError: If a generated section is invalid
+        """
         # Validate configuration
         self._validate_config(config, len(entries))
         
+        # Each script with body options gets its own emitter and report
+        bodies = None
+        self.body_report = None
+        if config.body_options is not None:
+            try:
+                bodies = BodyEmitter(config.body_options)
+            except ValueError as e:
+                raise ValueError(f'INVALID_CONFIG: {e}') from e
+            self.body_report = bodies.report
+        
         # Sort selected indices by dependency order
         sorted_indices = self._sort_by_dependencies(
             config.selected_indices,
             dependency_matrix
         )
         
-        # Generate script sections
-        sections: List[str] = []
+        # Validates each section as it is appended, without rescanning
+        validation = self.validator.streaming(fail_fast=True)
         
         # Add header comment
-        sections.append(self._generate_header())
+        section = self._generate_header()
+        self._check_section(validation, section)
+        yield section
         
         # Add settings block if provided
         if config.settings:
-            sections.append(self._generate_settings(config.settings))
+            section = self._generate_settings(config.settings)
+            self._check_section(validation, section)
+            yield section
         
         # Generate request blocks
         for index in sorted_indices:
-            entry = entries[index]
-            request_section = self._generate_request_section(
-                entry,
+            section = self._cached_request_section(
+                entries[index],
                 index,
-                config
+                config,
+                bodies
             )
-            sections.append(request_section)
+            self._check_section(validation, section)
+            yield section
         
         # Add footer
-        sections.append(self._generate_footer())
+        section = self._generate_footer()
+        self._check_section(validation, section)
+        yield section
+    
+    def _check_section(self, validation: StreamingValidator, section: str) -> None:
+        """
+        Validate the next section of the script.
         
-        # Join sections
-        script = '\n\n'.join(sections)
+        Args:
+            validation: Validation of the sections so far
+            section: Section text
         
-        # Validate generated script
-        validation = self.validator.validate(script)
-        if not validation.is_valid:
-            error_msg = f"Generated invalid LoliCode: {validation.errors[0]}"
+        Raises:
+            RuntimeError: If the section is invalid
+        """
+        errors = validation.add_section(section)
+        if errors:
+            error_msg = f"Generated invalid LoliCode: {errors[0]}"
             raise RuntimeError(error_msg)
-        
-        return script
     
     def _validate_config(self, config: LoliCodeConfig, entry_count: int) -> None:
         """
@@ -104,7 +206,7 @@ class LoliCodeGenerator:
         Args:
             config: Configuration to validate
             entry_count: Number of available entries
-            
+        
         Raises:
             ValueError: If configuration is invalid
         """
@@ -126,11 +228,11 @@ class LoliCodeGenerator:
         Args:
             indices: Indices to sort
             matrix: Dependency matrix
-            
+        
         Returns:
             Sorted indices
         """
-        return [i for i in matrix.topological_order if i in indices]
+        return matrix.order(indices)
     
     def _generate_header(self) -> str:
         """Generate header comment."""
@@ -139,14 +241,14 @@ class LoliCodeGenerator:
 # Date: {datetime.now().astimezone().isoformat()}
 # Description: Automated script from HAR analysis
 # ═══════════════════════════════════════════════════════════════"""
-    
+
     def _generate_settings(self, settings: dict) -> str:
         """
         Generate settings block.
         
         Args:
             settings: Settings dictionary
-            
+        
         Returns:
             Settings block as string
         """
@@ -166,11 +268,43 @@ class LoliCodeGenerator:
         
         return '\n'.join(lines)
     
+    def _cached_request_section(
+        self,
+        entry: SemanticHarEntry,
+        index: int,
+        config: LoliCodeConfig,
+        bodies: Optional[BodyEmitter] = None
+    ) -> str:
+        """
+        Return a request section from the cache, rendering it on a miss.
+        
+        Sections emitted with body options are not cached, so that every
+        body is counted in the report and every side file is written.
+        
+        Args:
+            entry: HAR entry
+            index: Entry index
+            config: Generation configuration
+            bodies: Body emitter for the script's body options
+        
+        Returns:
+            Request section as string
+        """
+        if not self.section_cache.max_bytes or bodies is not None:
+            return self._generate_request_section(entry, index, config, bodies)
+        key = section_key(entry, index, config)
+        section = self.section_cache.get(key)
+        if section is None:
+            section = self._generate_request_section(entry, index, config)
+            self.section_cache.put(key, section)
+        return section
+    
     def _generate_request_section(
         self,
         entry: SemanticHarEntry,
         index: int,
-        config: LoliCodeConfig
+        config: LoliCodeConfig,
+        bodies: Optional[BodyEmitter] = None
     ) -> str:
         """
         Generate request section with all blocks.
@@ -179,44 +313,46 @@ class LoliCodeGenerator:
             entry: HAR entry
             index: Entry index
             config: Generation configuration
-            
+            bodies: Body emitter for the script's body options
+        
         Returns:
             Request section as string
         """
-        sections: List[str] = []
+        # One sink for the whole section; the request block is written
+        # straight into it
+        parts: List[str] = []
+        write = parts.append
         
         # Add section comment
         url_path = urlparse(entry.request.url).path
-        sections.append('# ─────────────────────────────────────────────────────────────')
-        sections.append(f'# Request {index + 1}: {entry.request.method} {url_path}')
-        sections.append('# ─────────────────────────────────────────────────────────────')
+        write(f'{_SECTION_RULE}\n# Request {index + 1}: {entry.request.method} {url_path}\n{_SECTION_RULE}\n')
         
         # Generate request block
         custom_headers = None
         if config.custom_headers and index in config.custom_headers:
             custom_headers = config.custom_headers[index]
-        request_block = self.request_builder.build(entry, custom_headers)
-        sections.append(request_block)
+        self.request_builder.write(write, entry, custom_headers, bodies)
         
         # Generate variable extraction if configured
         if config.variable_extractions and index in config.variable_extractions:
             for extraction in config.variable_extractions[index]:
-                parse_block = self.parse_builder.build(extraction)
-                sections.append(parse_block)
+                write('\n')
+                write(self.parse_builder.build(extraction))
         
         # Generate assertions/keychecks
         if config.custom_assertions and index in config.custom_assertions:
             for assertion in config.custom_assertions[index]:
-                keycheck_block = self.keycheck_builder.build(assertion)
-                sections.append(keycheck_block)
+                write('\n')
+                write(self.keycheck_builder.build(assertion))
         else:
             # Default status check
-            sections.append(self.keycheck_builder.build_status_check(entry.response.status))
+            write('\n')
+            write(self.keycheck_builder.build_status_check(entry.response.status))
         
         # Add delay between requests
-        sections.append('FUNCTION Delay "1000"')
+        write('\nFUNCTION Delay "1000"')
         
-        return '\n'.join(sections)
+        return ''.join(parts)
     
     def _generate_footer(self) -> str:
         """Generate footer."""
@@ -227,7 +363,7 @@ class LoliCodeGenerator:
 
 async def generate_lolicode(
     config: LoliCodeConfig,
-    entries: List[SemanticHarEntry],
+    entries: Sequence[SemanticHarEntry],
     dependency_matrix: DependencyMatrix,
     retries: Optional[int] = None
 ) -> str:
@@ -239,7 +375,7 @@ async def generate_lolicode(
         entries: HAR entries
         dependency_matrix: Dependency matrix
         retries: Optional number of retries
-        
+    
     Returns:
         Generated LoliCode script
     """
@@ -0,0 +1,642 @@
+"""Incremental HAR parser.
+
+Walks ``log.entries`` one element at a time instead of loading the whole
+capture with ``json.load``, so peak memory is bounded by the largest single
+entry rather than by the size of the file.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from sys import intern
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from .body_store import BodyStore, store_entry_bodies
+from .types import (
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    RequestBody,
+    ResponseBody,
+    ResponseContentType,
+)
+
+
+HarSource = Union[str, 'os.PathLike[str]', BinaryIO]
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Most characters (or decoded bytes, for base64) of a response body kept,
+# as in the TypeScript parser
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024
+
+# Response MIME types whose bodies are not kept by the analysis profile; an
+# entry ending in "/" matches every subtype
+ANALYSIS_SKIP_MIME_TYPES = (
+    'image/',
+    'font/',
+    'audio/',
+    'video/',
+    'application/font-woff',
+    'application/octet-stream',
+    'application/pdf',
+    'application/wasm',
+    'application/zip',
+    'application/javascript',
+    'application/x-javascript',
+    'text/javascript',
+    'text/css',
+)
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_RUN = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.S)
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+
+# Header values that name a host or origin and repeat across entries
+_INTERNED_HEADER_VALUES = frozenset({'host', ':authority', 'origin'})
+
+_QUOTE = 0x22
+_OPEN = (0x7B, 0x5B)  # '{', '['
+
+
+class _JsonScanner:
+    """
+    Resumable scanner that locates JSON values in a byte buffer.
+    
+    The scanner never builds Python objects for values it skips; it only
+    tracks nesting depth and string boundaries. The buffer is either refilled
+    from a binary file object in chunks or is a complete bytes-like object
+    (for example an ``mmap``).
+    """
+    
+    def __init__(
+        self,
+        buffer: Any = b'',
+        fp: Optional[BinaryIO] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = bytearray(buffer) if fp is not None else buffer
+        self._eof = fp is None
+        self._base = 0
+        self.pos = 0
+        self.bytes_read = 0
+        if self._buf[:3] == _UTF8_BOM:
+            self.pos = 3
+    
+    @property
+    def offset(self) -> int:
+        """Absolute byte offset of the current position."""
+        return self._base + self.pos
+    
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; return False at end of input."""
+        if self._eof:
+            return False
+        data = self._fp.read(self._chunk_size)
+        if not data:
+            self._eof = True
+            return False
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.bytes_read += len(data)
+        if not self._buf and self._base == 0 and data[:3] == _UTF8_BOM:
+            self.pos = 3
+        self._buf += data
+        return True
+    
+    def _compact(self) -> None:
+        """Drop consumed bytes so the buffer only holds unread data."""
+        if self._fp is not None and self.pos > self._chunk_size:
+            del self._buf[:self.pos]
+            self._base += self.pos
+            self.pos = 0
+    
+    def peek(self) -> int:
+        """Skip whitespace and return the next byte, or -1 at end of input."""
+        self._compact()
+        while True:
+            self.pos = _WHITESPACE.match(self._buf, self.pos).end()
+            if self.pos < len(self._buf):
+                return self._buf[self.pos]
+            if not self._fill():
+                return -1
+    
+    def expect(self, char: str) -> None:
+        """Consume ``char`` or raise ValueError."""
+        if self.peek() != ord(char):
+            raise ValueError(
+                f'Invalid HAR file: expected "{char}" at byte {self.offset}'
+            )
+        self.pos += 1
+    
+    def value_end(self, start: int) -> int:
+        """
+        Find the end of the JSON value starting at ``start``.
+        
+        Args:
+            start: Buffer index of the first byte of the value
+        
+        Returns:
+            Buffer index just past the value
+        
+        Raises:
+            ValueError: If the input ends before the value is complete
+        """
+        first = self._buf[start]
+        if first == _QUOTE:
+            return self._string_end(start + 1)
+        if first not in _OPEN:
+            return self._scalar_end(start)
+        
+        depth = 0
+        p = start
+        while True:
+            # Skip plain bytes and complete strings up to the next bracket
+            p = _RUN.match(self._buf, p).end()
+            if p < len(self._buf) and self._buf[p] != _QUOTE:
+                char = self._buf[p]
+                p += 1
+                if char in _OPEN:
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return p
+                continue
+            # Ran off the end of the buffer, possibly inside a string. Long
+            # strings are finished incrementally so they are not rescanned.
+            if p < len(self._buf) and len(self._buf) - p > self._chunk_size:
+                p = self._string_end(p + 1)
+            elif not self._fill():
+                raise ValueError('Invalid HAR file: unexpected end of input')
+    
+    def _string_end(self, p: int) -> int:
+        """Return the index just past the closing quote of a string body."""
+        while True:
+            p = _STRING_BODY.match(self._buf, p).end()
+            if p < len(self._buf) and self._buf[p] == _QUOTE:
+                return p + 1
+            if not self._fill():
+                raise ValueError('Invalid HAR file: unterminated string')
+    
+    def _scalar_end(self, p: int) -> int:
+        """Return the index just past a number, ``true``, ``false`` or ``null``."""
+        while True:
+            match = _SCALAR_END.search(self._buf, p)
+            if match is not None:
+                return match.start()
+            p = len(self._buf)
+            if not self._fill():
+                return p
+    
+    def read_raw(self) -> Any:
+        """Consume the next value and return its raw bytes."""
+        if self.peek() < 0:
+            raise ValueError('Invalid HAR file: unexpected end of input')
+        start = self.pos
+        end = self.value_end(start)
+        self.pos = end
+        return self._buf[start:end]
+    
+    def skip_value(self) -> None:
+        """Consume the next value without decoding it."""
+        if self.peek() < 0:
+            raise ValueError('Invalid HAR file: unexpected end of input')
+        self.pos = self.value_end(self.pos)
+    
+    def seek_key(self, name: str) -> bool:
+        """
+        Advance inside the current object to the value of key ``name``.
+        
+        Must be called with the scanner positioned on the object's opening
+        brace. Values of other keys are skipped without being decoded.
+        
+        Returns:
+            True if the key was found, False if the object ended first
+        """
+        self.expect('{')
+        if self.peek() == ord('}'):
+            self.pos += 1
+            return False
+        while True:
+            key = json.loads(self.read_raw())
+            self.expect(':')
+            if key == name:
+                return True
+            self.skip_value()
+            char = self.peek()
+            self.pos += 1
+            if char == ord('}'):
+                return False
+            if char != ord(','):
+                raise ValueError(
+                    f'Invalid HAR file: expected "," or "}}" at byte {self.offset - 1}'
+                )
+    
+    def iter_spans(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yield the buffer span of each element of the array at the current position.
+        
+        Spans are ``(start, end)`` buffer indices and are only valid until the
+        generator is resumed, because the buffer may be compacted. When a
+        span is yielded the scanner is positioned just past the element.
+        """
+        self.expect('[')
+        if self.peek() == ord(']'):
+            self.pos += 1
+            return
+        while True:
+            if self.peek() < 0:
+                raise ValueError('Invalid HAR file: unexpected end of input')
+            start = self.pos
+            self.pos = self.value_end(start)
+            yield start, self.pos
+            char = self.peek()
+            self.pos += 1
+            if char == ord(']'):
+                return
+            if char != ord(','):
+                raise ValueError(
+                    f'Invalid HAR file: expected "," or "]" at byte {self.offset - 1}'
+                )
+    
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the raw bytes of each element of the array at the current position."""
+        for start, end in self.iter_spans():
+            yield self._buf[start:end]
+    
+    def seek_entries(self) -> bool:
+        """
+        Position the scanner on the HAR entries array.
+        
+        Accepts both a full HAR document (``{"log": {"entries": [...]}}``) and
+        a bare array of entries.
+        
+        Returns:
+            True if an entries array was found
+        
+        Raises:
+            ValueError: If the input is not a JSON object or array
+        """
+        char = self.peek()
+        if char == ord('['):
+            return True
+        if char != ord('{'):
+            raise ValueError('Invalid HAR file: expected a JSON object or array')
+        return (
+            self.seek_key('log')
+            and self.peek() == ord('{')
+            and self.seek_key('entries')
+            and self.peek() == ord('[')
+        )
+
+
+@dataclass(frozen=True)
+class ParseProfile:
+    """
+    Which response fields ``transform_entry`` materializes.
+    
+    The request is always transformed in full. Like the TypeScript
+    ``ParserConfig``, a profile can leave out response bodies and caps the
+    ones it keeps at ``max_body_size``. Bodies whose MIME type matches
+    ``skip_mime_types`` are never kept.
+    """
+    name: str
+    # Response headers, cookies, status text and redirect URL
+    response_headers: bool = True
+    response_bodies: bool = True
+    max_body_size: int = DEFAULT_MAX_BODY_SIZE
+    skip_mime_types: Tuple[str, ...] = ()
+    
+    def keeps_body(self, mime_type: str) -> bool:
+        """Return whether a response body of this MIME type is kept."""
+        if not self.response_bodies:
+            return False
+        mime_type = mime_type.split(';', 1)[0].strip().lower()
+        return not mime_type.startswith(self.skip_mime_types)
+
+
+PARSE_PROFILES: Dict[str, ParseProfile] = {
+    # Only the response status, for listing and generating scripts
+    'minimal': ParseProfile('minimal', response_headers=False, response_bodies=False),
+    # What token and dependency analysis reads: no images, fonts or bundles
+    'analysis': ParseProfile('analysis', skip_mime_types=ANALYSIS_SKIP_MIME_TYPES),
+    # Every response body, still capped
+    'full': ParseProfile('full'),
+}
+
+DEFAULT_PROFILE = 'analysis'
+
+# A profile or the name of one in PARSE_PROFILES
+ProfileSpec = Union[str, ParseProfile]
+
+
+def get_profile(profile: ProfileSpec) -> ParseProfile:
+    """
+    Resolve a profile name.
+    
+    Args:
+        profile: A ParseProfile, or the name of one in ``PARSE_PROFILES``
+    
+    Returns:
+        The profile
+    
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if isinstance(profile, ParseProfile):
+        return profile
+    try:
+        return PARSE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f'Unknown parse profile: {profile!r} (expected one of {", ".join(PARSE_PROFILES)})'
+        ) from None
+
+
+def _content_type(mime_type: str) -> ResponseContentType:
+    """Classify a response MIME type as in the TypeScript ResponseTransformer."""
+    if 'json' in mime_type:
+        return 'json'
+    if 'html' in mime_type:
+        return 'html'
+    if 'xml' in mime_type:
+        return 'xml'
+    if mime_type.startswith('text'):
+        return 'text'
+    return 'binary'
+
+
+def _response_body(content: Dict[str, Any], profile: ParseProfile) -> Optional[ResponseBody]:
+    """
+    Keep a response body, cut to the profile's size cap but not decoded.
+    
+    A base64 body is cut to the characters that decode to at most
+    ``max_body_size`` bytes; ``ResponseBody.data`` decodes it on access.
+    """
+    mime_type = content.get('mimeType') or ''
+    if not profile.keeps_body(mime_type):
+        return None
+    text = content.get('text') or ''
+    encoding = content.get('encoding') or None
+    limit = profile.max_body_size
+    if encoding == 'base64':
+        limit = (limit + 2) // 3 * 4
+    truncated = len(text) > limit
+    if truncated:
+        text = text[:limit]
+    size = content.get('size')
+    return ResponseBody(
+        text=text,
+        content_type=_content_type(mime_type.lower()),
+        size=size if isinstance(size, int) and size > -1 else 0,
+        truncated=truncated,
+        encoding=encoding,
+        max_size=profile.max_body_size
+    )
+
+
+def _transform_response(response_data: Dict[str, Any], profile: ParseProfile) -> SemanticHarResponse:
+    """Transform a raw HAR response, keeping the fields the profile asks for."""
+    status = response_data.get('status', 0)
+    if not profile.response_headers and not profile.response_bodies:
+        return SemanticHarResponse(status=status)
+    
+    headers = {}
+    cookies = {}
+    status_text = ''
+    redirect_url = None
+    if profile.response_headers:
+        for h in response_data.get('headers', []):
+            headers[intern(h.get('name', '').lower())] = h.get('value', '')
+        for c in response_data.get('cookies', []):
+            cookies[intern(c.get('name', ''))] = c.get('value', '')
+        status_text = response_data.get('statusText', '')
+        redirect_url = response_data.get('redirectURL') or None
+    
+    body = None
+    content = response_data.get('content')
+    if content:
+        body = _response_body(content, profile)
+    
+    return SemanticHarResponse(
+        status=status,
+        status_text=status_text,
+        headers=headers,
+        cookies=cookies,
+        redirect_url=redirect_url,
+        body=body
+    )
+
+
+def transform_entry(
+    raw: Dict[str, Any],
+    profile: ProfileSpec = DEFAULT_PROFILE,
+    body_store: Optional[BodyStore] = None
+) -> SemanticHarEntry:
+    """
+    Transform a raw HAR entry into a SemanticHarEntry.
+    
+    Header names are lowercased, cookies are collapsed into a name/value dict
+    and the request body content type is sniffed from ``postData.mimeType``.
+    Header names, cookie names, methods and host header values are interned.
+    The response keeps the fields of the parse profile.
+    
+    Args:
+        raw: Decoded HAR entry object
+        profile: Parse profile or its name
+        body_store: Store to move large bodies into (see
+            ``store_entry_bodies``)
+    
+    Returns:
+        The semantic entry
+    
+    Raises:
+        ValueError: If the entry has no request object, or the profile is unknown
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get('request'), dict):
+        raise ValueError('Invalid HAR entry: request object is missing')
+    profile = get_profile(profile)
+    
+    request_data = raw['request']
+    response_data = raw.get('response') or {}
+    
+    # Parse headers; names and host-like values repeat across the capture,
+    # so they are interned to share one string object per distinct value
+    headers = {}
+    for h in request_data.get('headers', []):
+        name = intern(h.get('name', '').lower())
+        value = h.get('value', '')
+        if name in _INTERNED_HEADER_VALUES:
+            value = intern(value)
+        headers[name] = value
+    
+    # Parse cookies
+    cookies = {}
+    for c in request_data.get('cookies', []):
+        cookies[intern(c.get('name', ''))] = c.get('value', '')
+    
+    # Parse body
+    body = None
+    post_data = request_data.get('postData', {})
+    if post_data:
+        content_type = 'json' if 'json' in post_data.get('mimeType', '') else 'form'
+        body = RequestBody(
+            data=post_data.get('text', ''),
+            content_type=content_type
+        )
+    
+    entry = SemanticHarEntry(
+        request=SemanticHarRequest(
+            url=request_data.get('url', ''),
+            method=intern(request_data.get('method', 'GET')),
+            headers=headers,
+            cookies=cookies,
+            body=body
+        ),
+        response=_transform_response(response_data, profile),
+        timestamp=raw.get('startedDateTime', ''),
+        duration=raw.get('time') or 0.0
+    )
+    if body_store is not None:
+        store_entry_bodies(entry, body_store)
+    return entry
+
+
+class HarStreamingParser:
+    """
+    Incremental parser that yields HAR entries as they are read.
+    
+    Only the bytes of the entry currently being decoded are held in memory,
+    together with one read chunk. Entries that fail to transform are skipped
+    and counted in ``entries_skipped``.
+    """
+    
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        profile: ProfileSpec = DEFAULT_PROFILE,
+        body_store: Optional[BodyStore] = None
+    ):
+        """
+        Initialize the parser.
+        
+        Args:
+            chunk_size: Number of bytes read from the file per refill
+            profile: Parse profile or its name
+            body_store: Store to move large bodies into
+        
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        self.chunk_size = chunk_size
+        self.profile = get_profile(profile)
+        self.body_store = body_store
+        self.total_bytes: Optional[int] = None
+        self.bytes_processed = 0
+        self.entries_parsed = 0
+        self.entries_skipped = 0
+    
+    def iter_raw_entries(self, source: HarSource) -> Iterator[Dict[str, Any]]:
+        """
+        Yield each element of ``log.entries`` as a decoded dict.
+        
+        Args:
+            source: Path to a HAR file or a binary file object
+        
+        Yields:
+            Raw HAR entry objects
+        
+        Raises:
+            ValueError: If the file is not valid HAR JSON
+        """
+        if isinstance(source, (str, os.PathLike)):
+            self.total_bytes = os.path.getsize(source)
+            with open(source, 'rb') as fp:
+                yield from self._iter_raw(fp)
+        else:
+            self.total_bytes = None
+            yield from self._iter_raw(source)
+    
+    def _iter_raw(self, fp: BinaryIO) -> Iterator[Dict[str, Any]]:
+        """Scan an open file object and decode its entries one at a time."""
+        self.bytes_processed = 0
+        scanner = _JsonScanner(fp=fp, chunk_size=self.chunk_size)
+        if not scanner.seek_entries():
+            return
+        for raw in scanner.iter_array():
+            self.bytes_processed = scanner.bytes_read
+            yield json.loads(raw)
+        self.bytes_processed = scanner.bytes_read
+    
+    def parse(self, source: HarSource) -> Iterator[SemanticHarEntry]:
+        """
+        Parse a HAR file into semantic entries.
+        
+        Args:
+            source: Path to a HAR file or a binary file object
+        
+        Yields:
+            SemanticHarEntry objects in file order
+        
+        Raises:
+            ValueError: If the file is not valid HAR JSON
+        """
+        self.entries_parsed = 0
+        self.entries_skipped = 0
+        for raw in self.iter_raw_entries(source):
+            try:
+                entry = transform_entry(raw, self.profile, self.body_store)
+            except (ValueError, TypeError, AttributeError):
+                self.entries_skipped += 1
+                continue
+            self.entries_parsed += 1
+            yield entry
+
+
+def iter_har_entries(
+    source: HarSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    profile: ProfileSpec = DEFAULT_PROFILE,
+    body_store: Optional[BodyStore] = None
+) -> Iterator[SemanticHarEntry]:
+    """
+    Iterate over the entries of a HAR file without loading it whole.
+    
+    Args:
+        source: Path to a HAR file or a binary file object
+        chunk_size: Number of bytes read per refill
+        profile: Parse profile or its name
+        body_store: Store to move large bodies into
+    
+    Yields:
+        SemanticHarEntry objects in file order
+    """
+    return HarStreamingParser(chunk_size, profile, body_store).parse(source)
+
+
+def load_har_entries(
+    source: HarSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    profile: ProfileSpec = DEFAULT_PROFILE,
+    body_store: Optional[BodyStore] = None
+) -> List[SemanticHarEntry]:
+    """
+    Load all valid entries of a HAR file.
+    
+    Args:
+        source: Path to a HAR file or a binary file object
+        chunk_size: Number of bytes read per refill
+        profile: Parse profile or its name
+        body_store: Store to move large bodies into, so repeated bodies
+            are held once and cold ones can spill to disk
+    
+    Returns:
+        List of SemanticHarEntry objects in file order
+    """
+    return list(iter_har_entries(source, chunk_size, profile, body_store))
@@ -0,0 +1,250 @@
+"""Trigram index for substring search over captured requests."""
+
+import bisect
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from .entry_table import np
+from .types import SemanticHarEntry
+
+
+# Longest prefix of a request body that is indexed, in characters
+MAX_BODY_LENGTH = 64 * 1024
+
+# Ends every field of an entry; trigrams never span it
+_SEPARATOR = b'\x00'
+
+# Bytes of text turned into trigrams per NumPy pass while freezing
+_BUILD_CHUNK = 4 * 1024 * 1024
+
+# Most entries turned into trigrams per NumPy pass while freezing
+_BUILD_ENTRIES = 256
+
+
+def _entry_text(entry: SemanticHarEntry, max_body_length: int) -> bytes:
+    """Return the searchable fields of an entry, lowercased and separated."""
+    request = entry.request
+    fields = [request.url]
+    fields.extend(f'{name}: {value}' for name, value in request.headers.items())
+    if request.body is not None and request.body.data:
+        fields.append(request.body.data[:max_body_length])
+    return ('\x00'.join(fields) + '\x00').lower().encode('utf-8', 'replace')
+
+
+class TrigramIndex:
+    """
+    Case-insensitive substring index over URLs, headers and request bodies.
+    
+    Each entry's URL, ``"name: value"`` header lines and body (up to
+    ``max_body_length`` characters) are lowercased and kept as UTF-8 in one
+    text buffer. The index maps every three-byte sequence to the sorted
+    list of entries containing it. A query intersects the lists of its
+    trigrams, rarest first, and then confirms the few remaining candidates
+    with a bounded ``find`` in their text. Queries shorter than three bytes
+    scan the text instead.
+    
+    Like EntryTable, an index is built by appending entries and then
+    frozen. With NumPy the postings are built in vectorized passes over the
+    text when freezing and kept as two sorted arrays; otherwise they are a
+    dict of ``array('I')`` lists filled while appending.
+    """
+    
+    def __init__(self, max_body_length: int = MAX_BODY_LENGTH, use_numpy: Optional[bool] = None):
+        """
+        Create an empty index.
+        
+        Args:
+            max_body_length: Characters of each request body to index
+            use_numpy: Force NumPy postings on or off (defaults to whether
+                NumPy is installed)
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError('NumPy is not installed')
+        self.use_numpy = use_numpy
+        self.max_body_length = max_body_length
+        self._parts: List[bytes] = []
+        self._offsets = array('Q', [0])
+        self._text = b''
+        self._postings: Dict[bytes, array] = {}
+        self._codes: Any = None
+        self._docs: Any = None
+        self._frozen = False
+    
+    @classmethod
+    def from_entries(
+        cls,
+        entries: Iterable[SemanticHarEntry],
+        max_body_length: int = MAX_BODY_LENGTH,
+        use_numpy: Optional[bool] = None
+    ) -> 'TrigramIndex':
+        """
+        Build an index over entries.
+        
+        Args:
+            entries: Entries to index, in order
+            max_body_length: Characters of each request body to index
+            use_numpy: Force NumPy postings on or off
+        
+        Returns:
+            The frozen index
+        """
+        index = cls(max_body_length, use_numpy)
+        for entry in entries:
+            index.append(entry)
+        index.freeze()
+        return index
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def append(self, entry: SemanticHarEntry) -> None:
+        """
+        Add the next entry.
+        
+        Raises:
+            RuntimeError: If the index has already been frozen
+        """
+        if self._frozen:
+            raise RuntimeError('TrigramIndex is frozen')
+        text = _entry_text(entry, self.max_body_length)
+        doc = len(self)
+        self._parts.append(text)
+        self._offsets.append(self._offsets[-1] + len(text))
+        if self.use_numpy:
+            return
+        
+        grams = set()
+        for field in text.split(_SEPARATOR):
+            grams.update(field[i:i + 3] for i in range(len(field) - 2))
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array('I')
+            posting.append(doc)
+    
+    def freeze(self) -> None:
+        """Finish building: join the text and, with NumPy, build the postings."""
+        if self._frozen:
+            return
+        self._text = b''.join(self._parts)
+        self._parts = []
+        if self.use_numpy:
+            self._build_postings()
+        self._frozen = True
+    
+    def _build_postings(self) -> None:
+        """Build sorted (trigram, entry) pairs over the text, a chunk of entries at a time."""
+        offsets = np.frombuffer(self._offsets, dtype=np.uint64)
+        count = len(self)
+        chunks = []
+        doc = 0
+        while doc < count:
+            # Up to 256 entries, so a trigram and an entry fit one uint32 key
+            end = int(np.searchsorted(offsets, offsets[doc] + _BUILD_CHUNK, side='right')) - 1
+            end = min(max(end, doc + 1), doc + _BUILD_ENTRIES, count)
+            start, stop = int(offsets[doc]), int(offsets[end])
+            data = np.frombuffer(self._text, dtype=np.uint8, count=stop - start, offset=start)
+            first, second, third = data[:-2], data[1:-1], data[2:]
+            # A trigram touching a separator spans two fields or entries
+            valid = (first != 0) & (second != 0) & (third != 0)
+            local = np.repeat(
+                np.arange(end - doc, dtype=np.uint32),
+                np.diff(offsets[doc:end + 1]).astype(np.int64)
+            )[:-2]
+            keys = (
+                (first.astype(np.uint32) << 24) | (second.astype(np.uint32) << 16)
+                | (third.astype(np.uint32) << 8) | local
+            )[valid]
+            keys.sort()
+            # Drop repeats of a trigram within an entry
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+            chunks.append(((keys >> 8).astype(np.uint64) << 32) | ((keys & 0xFF) + np.uint32(doc)))
+            doc = end
+        
+        # The chunks are sorted runs, which a stable sort merges
+        keys = np.sort(np.concatenate(chunks), kind='stable') if chunks else np.zeros(0, dtype=np.uint64)
+        self._codes = (keys >> 32).astype(np.uint32)
+        self._docs = (keys & 0xFFFFFFFF).astype(np.uint32)
+    
+    def _posting(self, gram: bytes) -> Any:
+        """Return the sorted entries containing a trigram."""
+        if not self.use_numpy:
+            return self._postings.get(gram, array('I'))
+        code = np.uint32((gram[0] << 16) | (gram[1] << 8) | gram[2])
+        low = np.searchsorted(self._codes, code, side='left')
+        high = np.searchsorted(self._codes, code, side='right')
+        return self._docs[low:high]
+    
+    def search(self, query: str) -> List[int]:
+        """
+        Find the entries containing a substring, ignoring case.
+        
+        Args:
+            query: Text to look for in URLs, headers and bodies
+        
+        Returns:
+            Matching entry indices in ascending order; every entry for an
+            empty query
+        
+        Raises:
+            RuntimeError: If the index has not been frozen
+        """
+        if not self._frozen:
+            raise RuntimeError('TrigramIndex must be frozen before searching')
+        needle = query.lower().encode('utf-8', 'replace')
+        if not needle:
+            return list(range(len(self)))
+        if _SEPARATOR in needle:
+            return []
+        if len(needle) < 3:
+            return self._scan(needle)
+        
+        grams = {needle[i:i + 3] for i in range(len(needle) - 2)}
+        postings = sorted((self._posting(gram) for gram in grams), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = self._intersect(candidates, posting)
+        if self.use_numpy:
+            candidates = candidates.tolist()
+        if len(needle) == 3:
+            return list(candidates)
+        
+        text = self._text
+        offsets = self._offsets
+        return [doc for doc in candidates if text.find(needle, offsets[doc], offsets[doc + 1]) != -1]
+    
+    def _intersect(self, candidates: Any, posting: Any) -> Any:
+        """Keep the candidates that are also in a (longer) sorted posting list."""
+        if not self.use_numpy:
+            members = set(posting)
+            return array('I', [doc for doc in candidates if doc in members])
+        if not len(posting):
+            return posting
+        positions = np.minimum(np.searchsorted(posting, candidates), len(posting) - 1)
+        return candidates[posting[positions] == candidates]
+    
+    def _scan(self, needle: bytes) -> List[int]:
+        """Find a short substring by scanning the text."""
+        text = self._text
+        offsets = self._offsets
+        if self.use_numpy and len(text) > len(needle):
+            data = np.frombuffer(text, dtype=np.uint8)
+            hits = data == needle[0]
+            if len(needle) == 2:
+                hits[:-1] &= data[1:] == needle[1]
+                hits[-1] = False
+            # Every entry has at least its final separator, so no segment is empty
+            starts = np.frombuffer(offsets, dtype=np.uint64)[:-1].astype(np.intp)
+            return np.flatnonzero(np.logical_or.reduceat(hits, starts)).tolist()
+        found = []
+        position = text.find(needle)
+        while position != -1:
+            doc = bisect.bisect_right(offsets, position) - 1
+            found.append(doc)
+            position = text.find(needle, offsets[doc + 1])
+        return found
@@ -0,0 +1,170 @@
+"""Memory-bounded LRU cache of rendered request sections."""
+
+import sys
+from collections import OrderedDict
+from dataclasses import astuple
+from typing import Dict, Hashable, Optional, Tuple
+
+from .types import LoliCodeConfig, SemanticHarEntry
+
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def entry_fingerprint(entry: SemanticHarEntry) -> Tuple[Hashable, ...]:
+    """
+    Collect the entry fields a request section is built from.
+    
+    The fingerprint is a tuple of the entry's own strings rather than a
+    digest: strings cache their hash, so building and looking up the key is
+    much cheaper than hashing the contents, and equal keys compare exactly.
+    
+    Args:
+        entry: HAR entry
+    
+    Returns:
+        Hashable fingerprint
+    """
+    request = entry.request
+    body = request.body
+    return (
+        request.url,
+        request.method,
+        entry.response.status,
+        tuple(request.headers.items()),
+        tuple(request.cookies.items()),
+        (body.data, body.content_type) if body is not None else None,
+    )
+
+
+def section_key(entry: SemanticHarEntry, index: int, config: LoliCodeConfig) -> Tuple[Hashable, ...]:
+    """
+    Build the cache key of a request section.
+    
+    The key covers the entry contents, its index (shown in the section
+    comment) and the per-index custom headers, variable extractions and
+    custom assertions.
+    
+    Args:
+        entry: HAR entry
+        index: Entry index
+        config: Generation configuration
+    
+    Returns:
+        Hashable cache key
+    """
+    def options(per_index: Optional[Dict[int, list]]) -> Optional[Tuple[tuple, ...]]:
+        if not per_index or index not in per_index:
+            return None
+        return tuple(astuple(item) for item in per_index[index])
+    
+    return (
+        index,
+        entry_fingerprint(entry),
+        options(config.custom_headers),
+        options(config.variable_extractions),
+        options(config.custom_assertions),
+    )
+
+
+class SectionCache:
+    """
+    Least-recently-used cache of rendered sections, bounded by total size.
+    
+    Each section is counted as twice its ``sys.getsizeof``: its key holds on
+    to the entry strings the section was rendered from, which take about as
+    much memory again. A section larger than the whole cache is not stored.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes: Size limit of the cached sections; 0 disables caching
+        
+        Raises:
+            ValueError: If ``max_bytes`` is negative
+        """
+        if max_bytes < 0:
+            raise ValueError('max_bytes must not be negative')
+        self._max_bytes = max_bytes
+        # key -> (section, size in bytes)
+        self._sections: 'OrderedDict[Hashable, Tuple[str, int]]' = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._sections)
+    
+    @property
+    def max_bytes(self) -> int:
+        """Size limit of the cached sections."""
+        return self._max_bytes
+    
+    @max_bytes.setter
+    def max_bytes(self, value: int) -> None:
+        if value < 0:
+            raise ValueError('max_bytes must not be negative')
+        self._max_bytes = value
+        self._evict()
+    
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        Look up a section, counting the hit or miss.
+        
+        Args:
+            key: Key from ``section_key``
+        
+        Returns:
+            The cached section, or None
+        """
+        cached = self._sections.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self._sections.move_to_end(key)
+        self.hits += 1
+        return cached[0]
+    
+    def put(self, key: Hashable, section: str) -> None:
+        """
+        Store a section, evicting least recently used ones to stay in budget.
+        
+        Args:
+            key: Key from ``section_key``
+            section: Rendered section
+        """
+        size = 2 * sys.getsizeof(section)
+        if size > self._max_bytes:
+            return
+        previous = self._sections.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= previous[1]
+        self._sections[key] = (section, size)
+        self.size_bytes += size
+        self._evict()
+    
+    def _evict(self) -> None:
+        """Drop least recently used sections until within ``max_bytes``."""
+        while self.size_bytes > self._max_bytes:
+            _, (_, size) = self._sections.popitem(last=False)
+            self.size_bytes -= size
+    
+    def clear(self) -> None:
+        """Remove all sections and reset the counters."""
+        self._sections.clear()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current usage."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'sections': len(self._sections),
+            'size_bytes': self.size_bytes,
+            'max_bytes': self._max_bytes,
+        }
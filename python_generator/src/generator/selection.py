@@ -0,0 +1,172 @@
+"""Bitset-backed selection of entry indices."""
+
+from itertools import compress
+from typing import Any, Iterable, Iterator, List
+
+from .entry_table import np
+
+# Byte tables between 0/1 flag bytes and the ASCII digits '0'/'1'
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def _mask_flags(mask: Any) -> bytes:
+    """Convert a row mask to one 0/1 byte per row; any true value selects its row."""
+    if np is not None and isinstance(mask, np.ndarray):
+        # bytes() of an int or float array would give several bytes per row
+        return np.asarray(mask, dtype=bool).tobytes()
+    if isinstance(mask, (bytes, bytearray, list, tuple)):
+        try:
+            # A bool list or 0/1 bytearray converts directly
+            flags = bytes(mask)
+        except (TypeError, ValueError):
+            pass
+        else:
+            if not flags.translate(None, b'\x00\x01'):
+                return flags
+    return bytes(map(bool, mask))
+
+
+def _flags_to_bits(flags: bytes) -> int:
+    """Pack one 0/1 byte per index into an integer, index 0 in the lowest bit."""
+    if not flags:
+        return 0
+    return int(flags[::-1].translate(_TO_DIGITS), 2)
+
+
+class Selection:
+    """
+    Set of selected entry indices stored as the bits of a single integer.
+    
+    Bulk operations (select all, clear, invert, and selecting or
+    deselecting the rows of a filter mask) are one big-integer operation
+    each, processed a machine word at a time rather than row by row.
+    ``indices`` returns the sorted indices for
+    ``LoliCodeConfig.selected_indices``.
+    """
+    
+    def __init__(self, size: int, indices: Iterable[int] = ()):
+        """
+        Create a selection.
+        
+        Args:
+            size: Number of selectable entries
+            indices: Initially selected indices
+        
+        Raises:
+            ValueError: If ``size`` is negative
+            IndexError: If an index is out of range
+        """
+        if size < 0:
+            raise ValueError('Selection size must not be negative')
+        self.size = size
+        self._all = (1 << size) - 1
+        self._bits = 0
+        self.update(indices)
+    
+    @classmethod
+    def from_mask(cls, mask: Any) -> 'Selection':
+        """
+        Create a selection from a boolean row mask.
+        
+        Args:
+            mask: NumPy bool array or sequence of bools, e.g. from
+                ``EntryTable.mask``
+        
+        Returns:
+            Selection of the rows where the mask is true
+        """
+        selection = cls(len(mask))
+        selection.select_where(mask)
+        return selection
+    
+    def _mask_bits(self, mask: Any) -> int:
+        """Convert a boolean mask of ``size`` rows to bits."""
+        if len(mask) != self.size:
+            raise ValueError(f'Mask has {len(mask)} rows, expected {self.size}')
+        return _flags_to_bits(_mask_flags(mask))
+    
+    def _check(self, index: int) -> None:
+        """Reject indices outside the selection."""
+        if not 0 <= index < self.size:
+            raise IndexError('Selection index out of range')
+    
+    def __len__(self) -> int:
+        """Number of selected indices."""
+        return bin(self._bits).count('1')
+    
+    def __bool__(self) -> bool:
+        return self._bits != 0
+    
+    def __contains__(self, index: int) -> bool:
+        return 0 <= index < self.size and (self._bits >> index) & 1 == 1
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.indices())
+    
+    def indices(self) -> List[int]:
+        """Return the selected indices in ascending order."""
+        flags = bin(self._bits)[:1:-1].encode().translate(_FROM_DIGITS)
+        return list(compress(range(len(flags)), flags))
+    
+    def add(self, index: int) -> None:
+        """Select one index."""
+        self._check(index)
+        self._bits |= 1 << index
+    
+    def discard(self, index: int) -> None:
+        """Deselect one index."""
+        self._check(index)
+        self._bits &= ~(1 << index)
+    
+    def toggle(self, index: int) -> None:
+        """Flip the selection of one index."""
+        self._check(index)
+        self._bits ^= 1 << index
+    
+    def update(self, indices: Iterable[int]) -> None:
+        """Select many indices at once."""
+        flags = bytearray(self.size)
+        for index in indices:
+            self._check(index)
+            flags[index] = 1
+        self._bits |= _flags_to_bits(flags)
+    
+    def select_all(self) -> None:
+        """Select every index."""
+        self._bits = self._all
+    
+    def clear(self) -> None:
+        """Deselect every index."""
+        self._bits = 0
+    
+    def invert(self) -> None:
+        """Flip the selection of every index."""
+        self._bits ^= self._all
+    
+    def select_where(self, mask: Any) -> None:
+        """
+        Add the rows of a boolean mask to the selection.
+        
+        Raises:
+            ValueError: If the mask length differs from ``size``
+        """
+        self._bits |= self._mask_bits(mask)
+    
+    def deselect_where(self, mask: Any) -> None:
+        """
+        Remove the rows of a boolean mask from the selection.
+        
+        Raises:
+            ValueError: If the mask length differs from ``size``
+        """
+        self._bits &= ~self._mask_bits(mask)
+    
+    def invert_where(self, mask: Any) -> None:
+        """
+        Flip the selection of the rows of a boolean mask.
+        
+        Raises:
+            ValueError: If the mask length differs from ``size``
+        """
+        self._bits ^= self._mask_bits(mask)
@@ -1,7 +1,28 @@
 """Type definitions for the LoliCode generator."""
 
-from typing import TypedDict, Optional, Literal, Dict, List
-from dataclasses import dataclass
+import base64
+import binascii
+from typing import TypedDict, Optional, Literal, Dict, List, Set, Iterable, Iterator, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, field, fields
+
+from . import graph
+
+if TYPE_CHECKING:
+    from .body_store import StoredText
+
+
+def _slotted(cls):
+    """
+    Rebuild a dataclass with ``__slots__`` instead of a per-instance ``__dict__``.
+    
+    Equivalent to ``dataclass(slots=True)``, which needs Python 3.10.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names + ('__dict__', '__weakref__'):
+        namespace.pop(name, None)
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
 
 
 @dataclass
@@ -30,6 +51,20 @@ class VariableExtraction:
     is_global: bool
 
 
+@dataclass
+class BodyOptions:
+    """
+    How request bodies are written into a script.
+    
+    Bodies of at least ``side_file_threshold`` UTF-8 bytes (after
+    minification) are written to files in ``side_file_dir`` that the script
+    reads, instead of being inlined in its CONTENT lines.
+    """
+    minify_json: bool = False
+    side_file_threshold: Optional[int] = None
+    side_file_dir: Optional[str] = None
+
+
 class SettingsDict(TypedDict, total=False):
     """Script settings."""
     use_proxy: bool
@@ -47,8 +82,10 @@ class LoliCodeConfig:
     custom_assertions: Optional[Dict[int, List[CustomAssertion]]] = None
     variable_extractions: Optional[Dict[int, List[VariableExtraction]]] = None
     settings: Optional[SettingsDict] = None
+    body_options: Optional[BodyOptions] = None
 
 
+@_slotted
 @dataclass
 class SemanticHarRequest:
     """HAR request data."""
@@ -59,6 +96,7 @@ class SemanticHarRequest:
     body: Optional['RequestBody'] = None
 
 
+@_slotted
 @dataclass
 class RequestBody:
     """Request body data."""
@@ -66,20 +104,203 @@ class RequestBody:
     content_type: Literal['json', 'form']
 
 
+ResponseContentType = Literal['html', 'json', 'text', 'xml', 'binary']
+
+
+@_slotted
+@dataclass
+class ResponseBody:
+    """
+    Response body data, decoded on first access.
+    
+    ``text`` is the HAR ``content.text`` as captured, already cut to the
+    parse profile's size cap; with ``encoding='base64'`` it is still
+    base64. It may also be a ``BodyRef`` into a ``BodyStore``. ``data``
+    decodes the body, as UTF-8 with invalid bytes replaced, and keeps the
+    result unless the body lives in a store. ``size`` is the full body
+    size reported by the capture and ``truncated`` whether ``text`` was cut.
+    """
+    text: 'StoredText'
+    content_type: ResponseContentType = 'text'
+    size: int = 0
+    truncated: bool = False
+    encoding: Optional[str] = None
+    # Most decoded bytes kept from a base64 body
+    max_size: Optional[int] = None
+    _data: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Slotted classes have no class-level default to fall back on
+        self._data = None
+    
+    @property
+    def data(self) -> str:
+        """The body text, read from its store and decoded from base64 if needed."""
+        if self._data is not None:
+            return self._data
+        stored = not isinstance(self.text, str)
+        text = self.text.read() if stored else self.text
+        if self.encoding != 'base64':
+            return text
+        try:
+            raw = base64.b64decode(text)
+        except (binascii.Error, ValueError):
+            raw = b''
+        data = raw[:self.max_size].decode('utf-8', 'replace')
+        if not stored:
+            self._data = data
+        return data
+
+
+@_slotted
 @dataclass
 class SemanticHarResponse:
-    """HAR response data."""
+    """
+    HAR response data.
+    
+    Header names are lowercase. Which fields are filled depends on the
+    parse profile: ``minimal`` keeps only the status.
+    """
     status: int
+    status_text: str = ''
+    headers: Dict[str, str] = field(default_factory=dict)
+    cookies: Dict[str, str] = field(default_factory=dict)
+    redirect_url: Optional[str] = None
+    body: Optional[ResponseBody] = None
 
 
+@_slotted
 @dataclass
 class SemanticHarEntry:
     """Semantic HAR entry."""
     request: SemanticHarRequest
     response: SemanticHarResponse
+    timestamp: str = ''
+    duration: float = 0.0
+
+
+@dataclass
+class TokenInfo:
+    """Detected token and the entry that first defines it."""
+    type: str
+    value: str
+    source_entry: int
+    source_location: Literal['header', 'body', 'cookie', 'url']
 
 
 @dataclass
 class DependencyMatrix:
-    """Dependency matrix for request ordering."""
+    """
+    Dependency graph for request ordering.
+    
+    ``dependencies[i]`` holds the indices of the entries that request ``i``
+    depends on, a sparse form of the TypeScript ``adjacencyMatrix`` where
+    ``adjacencyMatrix[i][j] == 1``. ``topological_order`` may be given
+    directly or computed from the dependencies with ``from_dependencies``.
+    
+    Positions in ``topological_order`` are indexed on first use; assign a
+    new list rather than modifying it in place afterwards.
+    """
     topological_order: List[int]
+    dependencies: List[Set[int]] = field(default_factory=list)
+    detected_tokens: List[TokenInfo] = field(default_factory=list)
+    _positions: Optional[Dict[int, int]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        if name == 'topological_order':
+            object.__setattr__(self, '_positions', None)
+        object.__setattr__(self, name, value)
+    
+    @classmethod
+    def from_dependencies(
+        cls,
+        dependencies: List[Set[int]],
+        detected_tokens: Optional[List[TokenInfo]] = None
+    ) -> 'DependencyMatrix':
+        """
+        Build a matrix whose order is the topological sort of ``dependencies``.
+        
+        Args:
+            dependencies: Dependency sets per entry
+            detected_tokens: Tokens found while building the dependencies
+        
+        Returns:
+            Dependency matrix
+        """
+        return cls(
+            topological_order=graph.topological_sort(dependencies),
+            dependencies=dependencies,
+            detected_tokens=detected_tokens or []
+        )
+    
+    def depends_on(self, i: int, j: int) -> bool:
+        """Return whether request ``i`` depends on entry ``j``."""
+        return i < len(self.dependencies) and j in self.dependencies[i]
+    
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """Yield ``(i, j)`` for every dependency of request ``i`` on entry ``j``."""
+        for i, targets in enumerate(self.dependencies):
+            for j in sorted(targets):
+                yield i, j
+    
+    @property
+    def edge_count(self) -> int:
+        """Number of dependency edges."""
+        return sum(len(targets) for targets in self.dependencies)
+    
+    def to_dense(self) -> List[List[int]]:
+        """Expand to an N×N 0/1 adjacency matrix (for small captures only)."""
+        n = len(self.dependencies)
+        matrix = [[0] * n for _ in range(n)]
+        for i, j in self.edges():
+            matrix[i][j] = 1
+        return matrix
+    
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Return the strongly connected components, dependencies first."""
+        return graph.strongly_connected_components(self.dependencies)
+    
+    def cycles(self) -> List[List[int]]:
+        """Return the groups of entries that depend on each other in a cycle."""
+        return [
+            component for component in self.strongly_connected_components()
+            if len(component) > 1 or component[0] in self.dependencies[component[0]]
+        ]
+    
+    def depths(self) -> List[int]:
+        """Return the longest dependency chain length below each entry."""
+        return graph.dependency_depths(self.dependencies)
+    
+    def critical_path(self) -> List[int]:
+        """Return a longest chain of dependent entries, first dependency first."""
+        return graph.critical_path(self.dependencies, self.depths())
+    
+    def _position_index(self) -> Dict[int, int]:
+        """Return the cached map of entry index to position in ``topological_order``."""
+        if self._positions is None:
+            positions: Dict[int, int] = {}
+            for position, i in enumerate(self.topological_order):
+                positions.setdefault(i, position)
+            self._positions = positions
+        return self._positions
+    
+    def position(self, index: int) -> Optional[int]:
+        """Return the position of an entry in ``topological_order``, if present."""
+        return self._position_index().get(index)
+    
+    def order(self, indices: Iterable[int]) -> List[int]:
+        """
+        Sort entry indices into dependency order in O(M log M).
+        
+        Duplicates are dropped. Indices missing from ``topological_order``
+        are kept and placed after the others, in ascending order.
+        
+        Args:
+            indices: Entry indices to sort
+        
+        Returns:
+            Sorted indices
+        """
+        positions = self._position_index()
+        missing = len(positions)
+        return sorted(set(indices), key=lambda i: (positions.get(i, missing), i))
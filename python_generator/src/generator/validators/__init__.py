@@ -1,8 +1,9 @@
 """Validators package initialization."""
 
-from .lolicode_validator import LoliCodeValidator, ValidationResult
+from .lolicode_validator import LoliCodeValidator, StreamingValidator, ValidationResult
 
 __all__ = [
     'LoliCodeValidator',
+    'StreamingValidator',
     'ValidationResult',
 ]
@@ -1,6 +1,26 @@
 """LoliCode validator."""
 
-from typing import Dict, List
+import re
+from typing import Dict, Iterable, List, Tuple
+
+
+# Validation works on blocks of whole lines of about this many characters
+BLOCK_SIZE = 256 * 1024
+
+# Every byte except '"' and '\n'; deleting them leaves a line-aligned quote map
+_NOT_QUOTE_OR_NEWLINE = bytes(b for b in range(256) if b not in b'"\n')
+
+# A REQUEST keyword followed by at most two more non-blank characters on its line
+_SHORT_REQUEST = re.compile(r'REQUEST[^\n]{0,2}[^\S\n]*(?:\n|\Z)')
+
+# The last line of a block that starts or ends a PARSE block
+_LAST_KEYWORD = re.compile(r'(?s:.*)^[^\S\n]*(PARSE|KEYCHECK|REQUEST|FUNCTION)', re.MULTILINE)
+
+_RESET_KEYWORDS = ('KEYCHECK', 'REQUEST', 'FUNCTION')
+
+_EMPTY = 'Script is empty.'
+_UNDEFINED = 'Script contains "undefined" values.'
+_NONE = 'Script contains "None" values.'
 
 
 class ValidationResult:
@@ -18,56 +38,289 @@ class ValidationResult:
         }
 
 
+def _parse_state(line: str, state: bool) -> bool:
+    """Return whether a PARSE block is open at ``line``, given the state before it."""
+    stripped = line.lstrip()
+    if stripped.startswith('PARSE'):
+        return True
+    if state and stripped.startswith(_RESET_KEYWORDS):
+        return False
+    return state
+
+
+class StreamingValidator:
+    """
+    Validate a LoliCode script incrementally, in a single pass.
+    
+    The script is either fed in arbitrary chunks with ``feed`` (a trailing
+    partial line is held back until its end arrives) or appended one
+    section at a time with ``add_section``; use one or the other, and
+    call ``close`` at the end. Earlier
+    text is never rescanned. ``close`` returns the same result as
+    ``LoliCodeValidator.validate`` on the whole script.
+    
+    Blocks of lines are checked with a few C-level passes: quote parity
+    comes from deleting everything but quotes and newlines and then
+    dropping quote pairs, so only lines left with a quote are examined
+    one by one.
+    """
+    
+    def __init__(self, fail_fast: bool = False, first_line: int = 1):
+        """
+        Initialize the validator.
+        
+        Args:
+            fail_fast: Stop validating at the first error
+            first_line: Line number of the first line
+        """
+        self.fail_fast = fail_fast
+        # Number of the next line to validate
+        self._line = first_line
+        # Chunks fed since the last scan, starting with the held-back line
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._in_parse_block = False
+        self._blank = True
+        self._undefined = False
+        self._none = False
+        self._line_errors: List[str] = []
+        self._sections = 0
+        self._closed = False
+    
+    @property
+    def errors(self) -> List[str]:
+        """Errors found so far, in the order of ``LoliCodeValidator.validate``."""
+        errors = []
+        if self._closed and self._blank:
+            errors.append(_EMPTY)
+        if self._undefined:
+            errors.append(_UNDEFINED)
+        if self._none:
+            errors.append(_NONE)
+        errors.extend(self._line_errors)
+        return errors
+    
+    @property
+    def failed(self) -> bool:
+        """Whether validation stopped at an error in fail-fast mode."""
+        return self.fail_fast and bool(self._undefined or self._none or self._line_errors)
+    
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Validate the next chunk of the script.
+        
+        Small chunks are buffered until about a block of text has arrived,
+        so feeding single lines costs no more than feeding large chunks.
+        Call ``flush`` to validate the buffered lines right away.
+        
+        Args:
+            chunk: Script text, e.g. a line read from a file
+        
+        Returns:
+            Errors found in the lines validated by this call
+        """
+        if self.failed or self._closed:
+            return []
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered < BLOCK_SIZE:
+            return []
+        return self.flush()
+    
+    def flush(self) -> List[str]:
+        """
+        Validate all complete lines fed so far.
+        
+        Returns:
+            Errors found in those lines
+        """
+        text = ''.join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        if self.failed or self._closed:
+            return []
+        end = text.rfind('\n')
+        # Hold back the trailing partial line until its end arrives
+        partial = text[end + 1:]
+        if partial:
+            self._buffer.append(partial)
+            self._buffered = len(partial)
+        if end == -1:
+            return []
+        return self._scan(text, end)
+    
+    def add_section(self, section: str) -> List[str]:
+        """
+        Validate a section appended to the script.
+        
+        Sections are joined with a blank line, as ``LoliCodeGenerator``
+        does, and line numbers count from the start of the whole script.
+        
+        Args:
+            section: Section text without the separating blank line
+        
+        Returns:
+            Errors found in the section
+        """
+        if self.failed or self._closed:
+            return []
+        if self._sections:
+            # The blank line between this section and the previous one
+            self._line += 1
+        self._sections += 1
+        return self._scan(section, len(section))
+    
+    def close(self) -> ValidationResult:
+        """
+        Validate the held-back last line and finish.
+        
+        Returns:
+            Result for the whole script
+        """
+        if not self._closed:
+            self.flush()
+            text = ''.join(self._buffer)
+            if text and not self.failed:
+                self._scan(text, len(text))
+            self._buffer = []
+            self._buffered = 0
+            self._closed = True
+        errors = self.errors
+        return ValidationResult(is_valid=len(errors) == 0, errors=errors)
+    
+    def _scan(self, text: str, end: int) -> List[str]:
+        """Validate the complete lines of ``text[:end]`` in blocks."""
+        found: List[str] = []
+        start = 0
+        while True:
+            stop = end
+            if end - start > BLOCK_SIZE:
+                stop = text.rfind('\n', start, start + BLOCK_SIZE)
+                if stop == -1:
+                    stop = text.find('\n', start + BLOCK_SIZE, end)
+                    if stop == -1:
+                        stop = end
+            found.extend(self._scan_block(text[start:stop]))
+            if stop >= end or self.failed:
+                return found
+            start = stop + 1
+    
+    def _scan_block(self, block: str) -> List[str]:
+        """Validate a block of complete lines and advance the line counter."""
+        base = self._line
+        # (line number, rank within the line, error)
+        events: List[Tuple[int, int, str]] = []
+        
+        if self._blank and block.strip():
+            self._blank = False
+        if not self._undefined:
+            position = block.find('undefined')
+            if position != -1:
+                events.append((base + block.count('\n', 0, position), 0, _UNDEFINED))
+        if not self._none:
+            position = block.find('None')
+            if position != -1:
+                events.append((base + block.count('\n', 0, position), 1, _NONE))
+        
+        for match in _SHORT_REQUEST.finditer(block):
+            position = match.start()
+            line_start = block.rfind('\n', 0, position) + 1
+            if not block[line_start:position].strip():
+                line = base + block.count('\n', 0, position)
+                events.append((line, 3, f'Line {line}: Empty or invalid REQUEST block'))
+        
+        quotes = block.encode('utf-8', 'surrogatepass').translate(None, _NOT_QUOTE_OR_NEWLINE).replace(b'""', b'')
+        if b'"' in quotes:
+            events.extend(self._unmatched_quotes(block, quotes, base))
+        
+        keyword = _LAST_KEYWORD.match(block)
+        if keyword is not None:
+            self._in_parse_block = _parse_state(keyword.group(1), self._in_parse_block)
+        self._line = base + block.count('\n') + 1
+        
+        found: List[str] = []
+        for _, _, error in sorted(events):
+            if error == _UNDEFINED:
+                self._undefined = True
+            elif error == _NONE:
+                self._none = True
+            else:
+                self._line_errors.append(error)
+            found.append(error)
+            if self.fail_fast:
+                break
+        return found
+    
+    def _unmatched_quotes(self, block: str, quotes: bytes, base: int) -> List[Tuple[int, int, str]]:
+        """Report lines with an odd number of quotes outside PARSE blocks."""
+        lines = block.split('\n')
+        events = []
+        # PARSE state is carried forward from the last line examined
+        state = self._in_parse_block
+        checked = -1
+        index = 0
+        previous = 0
+        position = quotes.find(b'"')
+        while position != -1:
+            index += quotes.count(b'\n', previous, position)
+            previous = position
+            for line in lines[checked + 1:index + 1]:
+                state = _parse_state(line, state)
+            checked = index
+            line = lines[index]
+            if not state and 'CONTENT' not in line:
+                events.append((base + index, 2, f'Line {base + index}: Unmatched quotes'))
+            position = quotes.find(b'"', position + 1)
+        return events
+
+
 class LoliCodeValidator:
     """Validator for LoliCode scripts."""
     
-    def validate(self, script: str) -> ValidationResult:
+    def validate(self, script: str, first_line: int = 1, fail_fast: bool = False) -> ValidationResult:
         """
         Validate a LoliCode script.
         
         Args:
             script: The LoliCode script to validate
-            
+            first_line: Line number of the first line, for validating one
+                section of a larger script
+            fail_fast: Stop at the first error
+        
         Returns:
             ValidationResult object with validation status and errors
         """
-        errors: List[str] = []
-        
-        # Check if script is empty
-        if not script.strip():
-            errors.append('Script is empty.')
-        
-        # Check for undefined values
-        if 'undefined' in script:
-            errors.append('Script contains "undefined" values.')
-        
-        # Check for None values
-        if 'None' in script:
-            errors.append('Script contains "None" values.')
-        
-        # Additional validation: Check for common syntax errors
-        lines = script.split('\n')
-        in_parse_block = False
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            
-            # Track if we're in a PARSE block (these can have complex patterns)
-            if stripped.startswith('PARSE'):
-                in_parse_block = True
-                continue
-            elif in_parse_block and (stripped.startswith('KEYCHECK') or stripped.startswith('REQUEST') or stripped.startswith('FUNCTION')):
-                in_parse_block = False
-            
-            # Skip validation for PARSE blocks
-            if in_parse_block:
-                continue
-            
-            # Check for unmatched quotes (but skip CONTENT lines which may have escaped quotes)
-            if 'CONTENT' not in line and stripped.count('"') % 2 != 0:
-                errors.append(f'Line {i}: Unmatched quotes')
-            
-            # Check for empty REQUEST blocks
-            if stripped.startswith('REQUEST') and len(stripped) < 10:
-                errors.append(f'Line {i}: Empty or invalid REQUEST block')
+        validator = StreamingValidator(fail_fast=fail_fast, first_line=first_line)
+        validator.feed(script)
+        return validator.close()
+    
+    def validate_stream(self, chunks: Iterable[str], fail_fast: bool = False) -> ValidationResult:
+        """
+        Validate a script read in chunks, such as the lines of an open file.
         
-        return ValidationResult(is_valid=len(errors) == 0, errors=errors)
+        Args:
+            chunks: Consecutive pieces of the script text
+            fail_fast: Stop reading at the first error
+        
+        Returns:
+            ValidationResult object with validation status and errors
+        """
+        validator = StreamingValidator(fail_fast=fail_fast)
+        for chunk in chunks:
+            validator.feed(chunk)
+            if validator.failed:
+                break
+        return validator.close()
+    
+    def streaming(self, fail_fast: bool = False, first_line: int = 1) -> StreamingValidator:
+        """
+        Start an incremental validation.
+        
+        Args:
+            fail_fast: Stop at the first error
+            first_line: Line number of the first line
+        
+        Returns:
+            A StreamingValidator to feed chunks or sections to
+        """
+        return StreamingValidator(fail_fast=fail_fast, first_line=first_line)
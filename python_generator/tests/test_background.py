@@ -0,0 +1,235 @@
+"""Tests for BackgroundGenerator and BackgroundLoader."""
+
+import asyncio
+import json
+import threading
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.background import BackgroundGenerator, BackgroundLoader, LoadBatch, LoadResult
+from generator.lolicode_generator import LoliCodeGenerator
+from generator.types import (
+    LoliCodeConfig,
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    DependencyMatrix,
+)
+
+
+def make_entries(count):
+    """Build ``count`` GET entries."""
+    return [
+        SemanticHarEntry(
+            request=SemanticHarRequest(
+                url=f'https://example.com/page/{i}',
+                method='GET',
+                headers={'accept': 'text/html'},
+                cookies={}
+            ),
+            response=SemanticHarResponse(status=200)
+        )
+        for i in range(count)
+    ]
+
+
+def without_date(script):
+    """Drop the generation timestamp from a script."""
+    return '\n'.join(line for line in script.split('\n') if not line.startswith('# Date:'))
+
+
+class TestBackgroundGenerator:
+    """Tests for BackgroundGenerator."""
+    
+    def setup_method(self):
+        """Start a worker whose results are collected through ``post``."""
+        self.posted = []
+        self.received = threading.Event()
+        
+        def post(callback, *args):
+            self.posted.append(callback)
+            callback(*args)
+            self.received.set()
+        
+        self.worker = BackgroundGenerator(post=post)
+        self.entries = make_entries(100)
+        self.matrix = DependencyMatrix(topological_order=list(range(100)))
+        self.config = LoliCodeConfig(selected_indices=list(range(100)))
+    
+    def teardown_method(self):
+        """Stop the worker."""
+        self.worker.close()
+    
+    def test_result_matches_generate(self):
+        """Test that the posted script equals a direct generate()."""
+        results = []
+        
+        future = self.worker.submit(self.config, self.entries, self.matrix, on_done=results.append)
+        future.result(timeout=10)
+        
+        expected = asyncio.run(LoliCodeGenerator().generate(self.config, self.entries, self.matrix))
+        assert self.received.wait(10)
+        assert [without_date(s) for s in results] == [without_date(expected)]
+        assert not self.worker.busy
+    
+    def test_dependencies_detected_without_matrix(self):
+        """Test that without a matrix the selected entries are ordered by their dependencies."""
+        self.entries[2].response.cookies = {'sid': 'abc'}
+        self.entries[9].request.cookies = {'sid': 'abc'}
+        config = LoliCodeConfig(selected_indices=[9, 5, 2])
+        
+        script = self.worker.submit(config, self.entries, None, on_done=self.posted.append).result(timeout=10)
+        
+        urls = [line.split('"')[1] for line in script.split('\n') if line.startswith('REQUEST')]
+        assert urls == [f'https://example.com/page/{i}' for i in (2, 5, 9)]
+        with pytest.raises(ValueError, match='INVALID_CONFIG'):
+            self.worker.submit(LoliCodeConfig(selected_indices=[500]), self.entries, None,
+                               on_done=self.posted.append).result(timeout=10)
+    
+    def test_superseded_jobs_are_cancelled(self):
+        """Test that only the last of several quick submissions is posted."""
+        results = []
+        first = self.worker.submit(self.config, self.entries, self.matrix, on_done=results.append, delay=5)
+        second = self.worker.submit(
+            LoliCodeConfig(selected_indices=[1]), self.entries, self.matrix, on_done=results.append, delay=0.01
+        )
+        
+        second.result(timeout=10)
+        
+        assert first.cancelled()
+        assert self.received.wait(10)
+        assert len(results) == 1 and 'page/1' in results[0] and 'page/2' not in results[0]
+    
+    def test_cancel_posts_nothing(self):
+        """Test that a cancelled job never reaches its callback."""
+        future = self.worker.submit(self.config, self.entries, self.matrix, on_done=self.posted.append, delay=5)
+        
+        self.worker.cancel()
+        
+        assert future.cancelled()
+        assert not self.worker.busy
+        assert self.posted == []
+    
+    def test_errors_are_posted(self):
+        """Test that a failed job posts its exception."""
+        errors = []
+        
+        future = self.worker.submit(
+            LoliCodeConfig(selected_indices=[500]), self.entries, self.matrix,
+            on_done=self.posted.append, on_error=errors.append
+        )
+        
+        with pytest.raises(ValueError):
+            future.result(timeout=10)
+        assert self.received.wait(10)
+        assert isinstance(errors[0], ValueError)
+    
+    def test_unexpected_errors_are_posted(self, monkeypatch):
+        """Test that errors other than ValueError and RuntimeError are posted too."""
+        async def failing_sections(*args):
+            yield 'REQUEST "https://example.com/page/0" GET'
+            raise OSError('side file directory is read-only')
+        
+        monkeypatch.setattr(self.worker.generator, 'iter_sections', failing_sections)
+        errors = []
+        
+        future = self.worker.submit(
+            self.config, self.entries, self.matrix,
+            on_done=self.posted.append, on_error=errors.append
+        )
+        
+        with pytest.raises(OSError):
+            future.result(timeout=10)
+        assert self.received.wait(10)
+        assert isinstance(errors[0], OSError)
+    
+    def test_closed_worker_rejects_jobs(self):
+        """Test that close stops the thread."""
+        self.worker.close()
+        
+        with pytest.raises(RuntimeError):
+            self.worker.submit(self.config, self.entries, self.matrix, on_done=self.posted.append)
+
+
+def write_har(path, count):
+    """Write a HAR file with ``count`` GET requests."""
+    entries = [
+        {
+            'request': {'method': 'GET', 'url': f'https://example.com/page/{i}', 'headers': [], 'cookies': []},
+            'response': {'status': 200 + i % 2},
+        }
+        for i in range(count)
+    ]
+    path.write_text(json.dumps({'log': {'entries': entries}}))
+
+
+def drain(loader):
+    """Collect a loader's messages up to and including the last one."""
+    messages = []
+    while not messages or isinstance(messages[-1], LoadBatch):
+        messages.append(loader.queue.get(timeout=10))
+    return messages
+
+
+class TestBackgroundLoader:
+    """Tests for BackgroundLoader."""
+    
+    def test_batches_then_result(self, tmp_path):
+        """Test that rows arrive in batches before the finished table."""
+        path = tmp_path / 'capture.har'
+        write_har(path, 25)
+        
+        messages = drain(BackgroundLoader(path, batch_size=10))
+        
+        batches, result = messages[:-1], messages[-1]
+        assert [(batch.start, len(batch.rows)) for batch in batches] == [(0, 10), (10, 10), (20, 5)]
+        assert batches[1].rows[0] == ('GET', 'https://example.com/page/10', 200)
+        assert batches[-1].bytes_read == batches[-1].total_bytes == os.path.getsize(path)
+        assert isinstance(result, LoadResult)
+        assert len(result.store) == len(result.table) == 25
+        assert result.table.select(status=(201, 202)) == list(range(1, 25, 2))
+        assert result.search_index.search('page/1') == [1] + list(range(10, 20))
+        result.store.close()
+    
+    def test_malformed_entries_are_skipped(self, tmp_path):
+        """Test that entries which fail to decode are left out of the load."""
+        path = tmp_path / 'capture.har'
+        write_har(path, 5)
+        har = json.loads(path.read_text())
+        har['log']['entries'][1]['request']['headers'] = ['oops']
+        har['log']['entries'][3]['request']['cookies'] = [1]
+        path.write_text(json.dumps(har))
+        
+        messages = drain(BackgroundLoader(path, batch_size=2))
+        
+        result = messages[-1]
+        assert isinstance(result, LoadResult)
+        assert sum(len(batch.rows) for batch in messages[:-1]) == 3
+        assert [result.table.url(i) for i in range(3)] == [f'https://example.com/page/{i}' for i in (0, 2, 4)]
+        assert [entry.request.url for entry in result.store] == [result.table.url(i) for i in range(3)]
+        assert result.store.entries_skipped == 2
+        result.store.close()
+    
+    def test_errors_end_the_load(self, tmp_path):
+        """Test that a failure is put on the queue."""
+        path = tmp_path / 'bad.har'
+        path.write_text('not json')
+        
+        messages = drain(BackgroundLoader(path))
+        
+        assert isinstance(messages[-1], ValueError)
+    
+    def test_cancel_discards_result(self, tmp_path):
+        """Test that a cancelled load leaves nothing on the queue."""
+        path = tmp_path / 'capture.har'
+        write_har(path, 25)
+        
+        loader = BackgroundLoader(path, batch_size=10)
+        loader.cancel()
+        loader.join(10)
+        loader.cancel()
+        
+        assert loader.cancelled
+        assert loader.queue.empty()
@@ -0,0 +1,94 @@
+"""Tests for parallel generation of many scripts."""
+
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.batch import _share, generate_as_completed, generate_many
+from generator.lolicode_generator import LoliCodeGenerator
+from generator.types import (
+    LoliCodeConfig,
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    DependencyMatrix,
+)
+
+
+def make_entries(count):
+    """Build ``count`` GET entries."""
+    return [
+        SemanticHarEntry(
+            request=SemanticHarRequest(
+                url=f'https://example.com/page/{i}',
+                method='GET',
+                headers={'accept': 'text/html'},
+                cookies={}
+            ),
+            response=SemanticHarResponse(status=200)
+        )
+        for i in range(count)
+    ]
+
+
+def without_date(script):
+    """Drop the generation timestamp from a script."""
+    return '\n'.join(line for line in script.split('\n') if not line.startswith('# Date:'))
+
+
+class TestGenerateMany:
+    """Tests for generate_many and generate_as_completed."""
+    
+    def setup_method(self):
+        """Set up one capture with several config variants."""
+        self.entries = make_entries(6)
+        self.matrix = DependencyMatrix(topological_order=list(range(6)))
+        self.jobs = [
+            (LoliCodeConfig(selected_indices=list(range(start, 6))), self.entries, self.matrix)
+            for start in range(4)
+        ]
+    
+    def test_results_in_job_order(self):
+        """Test that pooled scripts match in-process generation."""
+        scripts = generate_many(self.jobs, max_workers=2)
+        
+        generator = LoliCodeGenerator()
+        expected = [
+            asyncio.run(generator.generate(config, entries, matrix))
+            for config, entries, matrix in self.jobs
+        ]
+        assert [without_date(s) for s in scripts] == [without_date(s) for s in expected]
+    
+    def test_as_completed_yields_every_job(self):
+        """Test completion-order results carry their job index."""
+        results = dict(generate_as_completed(self.jobs, max_workers=2))
+        
+        assert sorted(results) == [0, 1, 2, 3]
+        assert 'page/0' in results[0] and 'page/0' not in results[1]
+    
+    def test_inputs_are_shared_by_identity(self):
+        """Test that repeated entry lists are sent once."""
+        other = make_entries(6)
+        
+        distinct, keys = _share([self.entries, other, self.entries])
+        
+        assert len(distinct) == 2
+        assert keys == [0, 1, 0]
+    
+    def test_errors_propagate(self):
+        """Test that an invalid job raises from the pool."""
+        jobs = self.jobs + [(LoliCodeConfig(selected_indices=[99]), self.entries, self.matrix)]
+        
+        with pytest.raises(ValueError):
+            generate_many(jobs, max_workers=2)
+    
+    @pytest.mark.asyncio
+    async def test_in_process_under_running_loop(self):
+        """Test in-process generation called from a coroutine."""
+        scripts = generate_many(self.jobs[:2], max_workers=1)
+        
+        assert 'page/0' in scripts[0] and 'page/0' not in scripts[1]
+        with pytest.raises(ValueError):
+            generate_many([(LoliCodeConfig(selected_indices=[99]), self.entries, self.matrix)], max_workers=1)
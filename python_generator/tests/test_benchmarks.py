@@ -0,0 +1,85 @@
+"""Tests for the synthetic capture generator and the benchmark suite."""
+
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../benchmarks')))
+
+from bench_suite import STAGES, compare, load_baseline, main, run_suite, save_baseline
+from generator.parser import load_har_entries, transform_entry
+from synthetic_har import generate_entries, write_har
+
+
+class TestSyntheticHar:
+    """Tests for the synthetic HAR generator."""
+    
+    def test_deterministic(self):
+        """Test that a seed always gives the same capture."""
+        first = json.dumps(generate_entries(300, seed=7))
+        
+        assert json.dumps(generate_entries(300, seed=7)) == first
+        assert json.dumps(generate_entries(300, seed=8)) != first
+        assert len(generate_entries(123)) == 123
+    
+    def test_realistic_flows(self):
+        """Test cookies, tokens, redirects and large bodies in the capture."""
+        entries = [transform_entry(raw) for raw in generate_entries(400, large_body_every=10, large_body_size=4096)]
+        
+        login = next(entry for entry in entries if entry.request.url.endswith('/api/auth/login'))
+        token = json.loads(login.response.body.data)['access_token']
+        assert 'auth' in login.response.cookies
+        assert any(entry.request.headers.get('authorization') == f'Bearer {token}' for entry in entries)
+        assert any('auth=' in entry.request.headers.get('cookie', '') for entry in entries)
+        redirects = [entry for entry in entries if entry.response.status == 302]
+        assert redirects and all(entry.response.redirect_url for entry in redirects)
+        uploads = [entry for entry in entries if entry.request.url.endswith('/uploads')]
+        assert uploads and all(len(entry.request.body.data) > 4096 for entry in uploads)
+    
+    def test_write_har(self, tmp_path):
+        """Test that a written capture loads with the streaming parser."""
+        path = str(tmp_path / 'capture.har')
+        
+        size = write_har(path, 50, seed=1)
+        
+        assert size == os.path.getsize(path)
+        assert len(load_har_entries(path)) == 50
+
+
+class TestBenchSuite:
+    """Tests for the benchmark suite."""
+    
+    def test_compare(self):
+        """Test that only slowdowns past the limit and the noise floor are reported."""
+        baseline = {'1000': {'ingest': {'seconds': 1.0}, 'generate': {'seconds': 0.001}}}
+        results = {
+            '1000': {
+                'ingest': {'seconds': 1.3},
+                'generate': {'seconds': 0.004},
+                'validate': {'seconds': 9.0},
+            },
+            '10000': {'ingest': {'seconds': 9.0}},
+        }
+        
+        regressions = compare(results, baseline, max_slowdown=25)
+        
+        assert len(regressions) == 1
+        assert regressions[0].startswith('ingest at 1000 entries')
+        assert compare(results, baseline, max_slowdown=50) == []
+    
+    def test_run_and_baseline(self, tmp_path, capsys):
+        """Test a small run, its stored baseline and the exit status."""
+        results = run_suite([30], repeat=1)
+        path = str(tmp_path / 'baseline.json')
+        save_baseline(path, results, seed=0)
+        
+        assert set(results['30']) == set(STAGES)
+        assert all(measured['seconds'] >= 0 and measured['peak_mb'] >= 0 for measured in results['30'].values())
+        assert load_baseline(path) == results
+        
+        args = ['--sizes', '30', '--repeat', '1', '--baseline', path, '--min-seconds', '0']
+        save_baseline(path, {'30': {stage: {'seconds': 60.0, 'peak_mb': 0.0} for stage in STAGES}}, seed=0)
+        assert main(args) == 0
+        save_baseline(path, {'30': {stage: {'seconds': 1e-9, 'peak_mb': 0.0} for stage in STAGES}}, seed=0)
+        assert main(args) == 1
+        assert 'REGRESSION: ingest at 30 entries' in capsys.readouterr().err
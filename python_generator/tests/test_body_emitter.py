@@ -0,0 +1,126 @@
+"""Tests for BodyEmitter."""
+
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.builders import BodyEmitter, RequestBlockBuilder
+from generator.builders.body_emitter import escape_chunks, escaped_length, minify_json
+from generator.types import (
+    BodyOptions,
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    RequestBody,
+)
+
+
+def make_entry(data, content_type='json'):
+    """Build a POST entry with a body."""
+    return SemanticHarEntry(
+        request=SemanticHarRequest(
+            url='https://example.com/upload',
+            method='POST',
+            headers={},
+            cookies={},
+            body=RequestBody(data=data, content_type=content_type)
+        ),
+        response=SemanticHarResponse(status=200)
+    )
+
+
+class TestEscaping:
+    """Tests for chunked escaping and JSON minification."""
+    
+    @pytest.mark.parametrize('chunk_size', [1, 3, 7, 1024])
+    def test_escape_chunks(self, chunk_size):
+        """Test that chunked escaping matches escaping the whole text."""
+        text = 'a"b\\c' * 5 + 'plain' * 3 + '"\\ é'
+        parts = []
+        
+        escape_chunks(text, parts.append, chunk_size)
+        
+        expected = text.replace('\\', '\\\\').replace('"', '\\"')
+        assert ''.join(parts) == expected
+        assert escaped_length(text) == len(expected.encode('utf-8'))
+    
+    def test_minify_json(self):
+        """Test that only whitespace outside strings is removed."""
+        text = '{\n  "a b": "x \\" y",\n  "n": [1.50, 2e3 ],\n  "a b": "dup"\n}'
+        
+        minified = minify_json(text)
+        
+        assert minified == '{"a b":"x \\" y","n":[1.50,2e3],"a b":"dup"}'
+        assert json.loads(minified) == json.loads(text)
+        assert minify_json('{"a": tru e}') == '{"a": tru e}'
+        assert minify_json('a=1 & b=2') == 'a=1 & b=2'
+
+
+class TestBodyEmitter:
+    """Tests for bodies written by RequestBlockBuilder through an emitter."""
+    
+    def test_default_matches_inline_escaping(self):
+        """Test that the default emitter writes the escaped body inline."""
+        body = '{"q": "a\\\\b"}' * 10000
+        emitter = BodyEmitter(chunk_size=100)
+        
+        block = RequestBlockBuilder(bodies=emitter).build(make_entry(body))
+        
+        escaped = body.replace('\\', '\\\\').replace('"', '\\"')
+        assert f'  CONTENT "{escaped}"\n' in block
+        assert emitter.report.bodies == 1
+        assert emitter.report.bytes_saved == 0
+    
+    def test_minify_report(self):
+        """Test that minification is reported in bytes saved."""
+        body = json.dumps({'items': list(range(100))}, indent=4)
+        emitter = BodyEmitter(BodyOptions(minify_json=True))
+        builder = RequestBlockBuilder()
+        
+        block = builder.build(make_entry(body))
+        builder.write([].append, make_entry(body), bodies=emitter)
+        builder.write([].append, make_entry('a = 1', 'form'), bodies=emitter)
+        
+        minified = json.dumps({'items': list(range(100))}, separators=(',', ':'))
+        assert body in block.replace('\\"', '"')
+        assert emitter.report.bodies == 2
+        assert emitter.report.minified_bytes == len(body) - len(minified)
+        assert emitter.report.bytes_saved == emitter.report.minified_bytes
+    
+    def test_side_files(self, tmp_path):
+        """Test that large bodies move to shared side files read by the script."""
+        directory = tmp_path / 'bodies'
+        emitter = BodyEmitter(BodyOptions(side_file_threshold=100, side_file_dir=str(directory)))
+        builder = RequestBlockBuilder(bodies=emitter)
+        large = '{"data": "' + 'é' * 200 + '"}'
+        
+        first = builder.build(make_entry(large))
+        second = builder.build(make_entry(large))
+        small = builder.build(make_entry('{"a": 1}'))
+        
+        files = list(directory.iterdir())
+        assert len(files) == 1 and files[0].suffix == '.json'
+        assert files[0].read_text(encoding='utf-8') == large
+        assert first == second
+        utility, request = first.split('\n')[:2]
+        variable = utility.rsplit('"', 2)[1]
+        assert utility.startswith(f'UTILITY File "{files[0]}" Read -> VAR "BODY_')
+        assert request.startswith('REQUEST "https://example.com/upload" POST')
+        assert f'  CONTENT "<{variable}>"' in first
+        assert 'CONTENT "{\\"a\\": 1}"' in small
+        report = emitter.report
+        assert report.side_files == 1
+        assert report.side_file_bytes == len(large.encode('utf-8'))
+        assert report.bytes_saved == 2 * (escaped_length(large) - len(variable) - 2)
+        assert report.to_dict()['bytes_saved'] == report.bytes_saved
+    
+    def test_invalid_options(self):
+        """Test that inconsistent side file options are rejected."""
+        with pytest.raises(ValueError):
+            BodyEmitter(BodyOptions(side_file_threshold=10))
+        with pytest.raises(ValueError):
+            BodyEmitter(BodyOptions(side_file_threshold=-1, side_file_dir='bodies'))
+        with pytest.raises(ValueError):
+            BodyEmitter(BodyOptions(side_file_threshold=10, side_file_dir='a"b'))
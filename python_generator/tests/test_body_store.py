@@ -0,0 +1,148 @@
+"""Tests for the content-addressed body store."""
+
+import io
+import json
+import pickle
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.body_store import BodyRef, BodyStore, store_entry_bodies
+from generator.ingest import transform_entries
+from generator.parser import load_har_entries, transform_entry
+from generator.types import ResponseBody
+
+
+def make_raw_entry(response_text, request_text=None, mime_type='application/json'):
+    """Build a raw HAR entry with a response body and optionally a request body."""
+    request = {'method': 'POST', 'url': 'https://example.com/poll', 'headers': [], 'cookies': []}
+    if request_text is not None:
+        request['postData'] = {'mimeType': 'application/json', 'text': request_text}
+    return {
+        'request': request,
+        'response': {'status': 200, 'content': {'mimeType': mime_type, 'text': response_text}},
+    }
+
+
+class TestBodyStore:
+    """Test cases for BodyStore."""
+    
+    def test_duplicates_stored_once(self):
+        """Test that equal bodies share one reference and one copy."""
+        store = BodyStore()
+        body = '{"status": "pending"}' * 50
+        
+        first = store.put(body)
+        second = store.put(''.join([body]))
+        
+        assert first is second
+        assert len(store) == 1
+        assert store.stored_bytes == len(body)
+        assert store.logical_bytes == 2 * len(body)
+        assert first.read() == body and len(first) == len(body)
+        assert store.put('other') is not first
+    
+    def test_spill_to_disk(self, tmp_path):
+        """Test that cold bodies move to disk past the budget and read back."""
+        store = BodyStore(memory_budget=250, directory=str(tmp_path))
+        bodies = [str(i) * 100 for i in range(5)]
+        refs = [store.put(body) for body in bodies]
+        
+        assert store.memory_bytes <= 250
+        assert store.disk_bytes == 300
+        assert [ref.read() for ref in refs] == bodies
+        assert store.memory_bytes <= 250
+        # Every body is written to disk at most once
+        assert store.disk_bytes == 500
+        assert [ref.read() for ref in refs] == bodies
+        assert store.disk_bytes == 500
+    
+    def test_body_larger_than_budget(self):
+        """Test that a body over the whole budget still round-trips."""
+        store = BodyStore(memory_budget=10)
+        ref = store.put('x' * 100)
+        
+        assert store.memory_bytes == 0
+        assert ref.read() == 'x' * 100
+    
+    def test_unicode(self):
+        """Test non-ASCII text and lone surrogates survive storage."""
+        store = BodyStore(memory_budget=0)
+        text = 'héllo 世界 \ud800 🎉'
+        
+        assert store.put(text).read() == text
+    
+    def test_intern(self):
+        """Test that interned texts return one shared string."""
+        store = BodyStore()
+        first = store.intern('{"user": "a"}' * 3)
+        
+        assert store.intern(''.join(['{"user": "a"}'] * 3)) is first
+    
+    def test_closed(self):
+        """Test that a closed store can no longer be used."""
+        with BodyStore(memory_budget=0) as store:
+            ref = store.put('body')
+        
+        with pytest.raises(RuntimeError):
+            ref.read()
+        with pytest.raises(RuntimeError):
+            store.put('body')
+        with pytest.raises(ValueError):
+            BodyStore(memory_budget=-1)
+
+
+class TestStoredBodies:
+    """Test cases for entries whose bodies live in a BodyStore."""
+    
+    def test_transform_with_store(self):
+        """Test that parsed response bodies become shared references."""
+        store = BodyStore(min_size=10)
+        body = json.dumps({'items': list(range(20))})
+        entries = [transform_entry(make_raw_entry(body, '{"page": 1, "size": 50}'), body_store=store)
+                   for _ in range(3)]
+        small = transform_entry(make_raw_entry('{}'), body_store=store)
+        
+        refs = [entry.response.body.text for entry in entries]
+        assert isinstance(refs[0], BodyRef) and refs[0] is refs[1] is refs[2]
+        assert entries[0].response.body.data == body
+        assert entries[0].request.body.data is entries[2].request.body.data
+        assert small.response.body.text == '{}'
+        assert len(store) == 1
+    
+    def test_base64_body(self):
+        """Test that a stored base64 body is decoded on each access."""
+        store = BodyStore(memory_budget=0, min_size=0)
+        body = ResponseBody(text='aGVsbG8gd29ybGQ=', encoding='base64', max_size=100)
+        body.text = store.put(body.text)
+        
+        assert body.data == 'hello world'
+        assert body.data == 'hello world'
+    
+    def test_pickle_resolves_references(self):
+        """Test that pickled entries carry the body text, not the store."""
+        store = BodyStore(min_size=0)
+        entry = store_entry_bodies(transform_entry(make_raw_entry('{"a": 1}')), store)
+        
+        restored = pickle.loads(pickle.dumps(entry))
+        
+        assert restored.response.body.text == '{"a": 1}'
+        assert isinstance(restored.response.body.text, str)
+        assert restored == entry
+    
+    def test_loaders_accept_store(self):
+        """Test the body_store argument of the streaming loader and ingest."""
+        body = 'x' * 500
+        raw = [make_raw_entry(body) for _ in range(4)]
+        data = json.dumps({'log': {'entries': raw}}).encode('utf-8')
+        
+        with BodyStore() as store:
+            entries = load_har_entries(io.BytesIO(data), body_store=store)
+            assert len(store) == 1 and store.logical_bytes == 2000
+            assert all(entry.response.body.data == body for entry in entries)
+        
+        with BodyStore() as store:
+            result = transform_entries(raw, max_workers=2, chunk_size=2, serial_threshold=0, body_store=store)
+            assert len({id(entry.response.body.text) for entry in result.entries}) == 1
+            assert result.entries[3].response.body.data == body
@@ -0,0 +1,157 @@
+"""Tests for the lolicode-gen command-line tool."""
+
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.cli import build_config, expand_inputs, load_config, main
+
+
+def write_har(path, count=3):
+    """Write a HAR file with ``count`` GET requests."""
+    entries = [
+        {
+            'request': {
+                'method': 'GET',
+                'url': f'https://example.com/page/{i}',
+                'headers': [{'name': 'Accept', 'value': 'text/html'}],
+                'cookies': [],
+            },
+            'response': {'status': 200},
+        }
+        for i in range(count)
+    ]
+    path.write_text(json.dumps({'log': {'entries': entries}}))
+
+
+class TestInputs:
+    """Tests for input and config handling."""
+    
+    def test_expand_inputs(self, tmp_path):
+        """Test files, directories and globs, without duplicates."""
+        (tmp_path / 'sub').mkdir()
+        for name in ('a.har', 'b.har', 'sub/c.har'):
+            write_har(tmp_path / name)
+        (tmp_path / 'notes.txt').write_text('')
+        
+        found = expand_inputs([str(tmp_path), str(tmp_path / '*.har')])
+        recursive = expand_inputs([str(tmp_path)], recursive=True)
+        
+        assert [os.path.basename(path) for path in found] == ['a.har', 'b.har']
+        assert [os.path.basename(path) for path in recursive] == ['a.har', 'b.har', 'c.har']
+        with pytest.raises(ValueError):
+            expand_inputs([str(tmp_path / 'missing*.har')])
+    
+    def test_config_file(self, tmp_path):
+        """Test building a config from a JSON file."""
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps({
+            'settings': {'use_proxy': True},
+            'custom_headers': {'1': [{'key': 'X-Test', 'value': '1', 'enabled': True}]},
+        }))
+        
+        config = build_config(load_config(str(path)), 3)
+        
+        assert config.selected_indices == [0, 1, 2]
+        assert config.custom_headers[1][0].key == 'X-Test'
+        path.write_text(json.dumps({'unknown': 1}))
+        with pytest.raises(ValueError):
+            load_config(str(path))
+
+
+class TestMain:
+    """Tests for the batch conversion."""
+    
+    def test_converts_and_resumes(self, tmp_path, capsys):
+        """Test writing scripts and skipping those that are up to date."""
+        for name in ('a.har', 'b.har'):
+            write_har(tmp_path / name)
+        config = tmp_path / 'config.json'
+        config.write_text(json.dumps({'settings': {'use_proxy': True}}))
+        out = tmp_path / 'out'
+        
+        assert main([str(tmp_path), '-c', str(config), '-o', str(out), '-j', '2']) == 0
+        script = (out / 'a.loli').read_text()
+        assert 'UseProxy: true' in script
+        assert 'https://example.com/page/2' in script
+        assert 'entries/s' in capsys.readouterr().out
+        
+        assert main([str(tmp_path), '-c', str(config), '-o', str(out)]) == 0
+        assert '2 up to date' in capsys.readouterr().out
+        assert (out / 'a.loli').read_text() == script
+        assert not list(out.glob('*.part'))
+    
+    def test_failed_file_does_not_stop_batch(self, tmp_path, capsys):
+        """Test that a bad capture is reported and the rest converted."""
+        write_har(tmp_path / 'good.har')
+        (tmp_path / 'bad.har').write_text('not json')
+        
+        assert main([str(tmp_path), '-j', '1']) == 1
+        
+        assert (tmp_path / 'good.loli').exists()
+        assert not (tmp_path / 'bad.loli').exists()
+        assert 'FAILED' in capsys.readouterr().err
+    
+    @pytest.mark.parametrize('options', [
+        {'custom_headers': [1]},
+        {'custom_assertions': {'0': [{'kind': 'contains'}]}},
+        {'variable_extractions': {'first': []}},
+        {'selected_indices': 3},
+        {'body_options': {'minify': True}},
+    ])
+    def test_malformed_config(self, tmp_path, capsys, options):
+        """Test that a malformed config stops the run before any conversion."""
+        write_har(tmp_path / 'a.har')
+        config = tmp_path / 'config.json'
+        config.write_text(json.dumps(options))
+        
+        assert main([str(tmp_path / 'a.har'), '-c', str(config)]) == 2
+        
+        assert 'malformed config' in capsys.readouterr().err
+        assert not (tmp_path / 'a.loli').exists()
+    
+    @pytest.mark.parametrize('jobs', ['1', '2'])
+    def test_malformed_entries_fail_only_their_file(self, tmp_path, capsys, jobs):
+        """Test that badly typed entry fields are named and the batch goes on."""
+        write_har(tmp_path / 'good.har')
+        for name, url, status in (('url.har', 123, 200), ('status.har', 'https://example.com/', '200')):
+            entry = {
+                'request': {'method': 'GET', 'url': url, 'headers': [], 'cookies': []},
+                'response': {'status': status},
+            }
+            (tmp_path / name).write_text(json.dumps({'log': {'entries': [entry]}}))
+        
+        assert main([str(tmp_path), '-j', jobs]) == 1
+        
+        err = capsys.readouterr().err
+        assert 'entry 0: request url must be a string, got 123' in err
+        assert "entry 0: response status must be a number, got '200'" in err
+        assert (tmp_path / 'good.loli').exists()
+    
+    def test_body_options(self, tmp_path, capsys):
+        """Test side files next to the script and the bytes saved report."""
+        entries = [{
+            'request': {
+                'method': 'POST',
+                'url': 'https://example.com/upload',
+                'headers': [],
+                'cookies': [],
+                'postData': {'mimeType': 'application/json', 'text': json.dumps({'data': 'x' * 500}, indent=2)},
+            },
+            'response': {'status': 200},
+        }]
+        (tmp_path / 'up.har').write_text(json.dumps({'log': {'entries': entries}}))
+        config = tmp_path / 'config.json'
+        config.write_text(json.dumps({
+            'dependency_order': False,
+            'body_options': {'minify_json': True, 'side_file_threshold': 100},
+        }))
+        
+        assert main([str(tmp_path / 'up.har'), '-c', str(config)]) == 0
+        
+        side_files = list((tmp_path / 'up_bodies').iterdir())
+        assert [path.read_text() for path in side_files] == [json.dumps({'data': 'x' * 500}, separators=(',', ':'))]
+        assert str(side_files[0]) in (tmp_path / 'up.loli').read_text()
+        assert 'body bytes saved' in capsys.readouterr().out
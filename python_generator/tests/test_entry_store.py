@@ -0,0 +1,125 @@
+"""Tests for EntryStore."""
+
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.entry_store import EntryStore
+from generator.lolicode_generator import LoliCodeGenerator
+from generator.parser import load_har_entries
+from generator.types import LoliCodeConfig, DependencyMatrix
+
+
+def make_raw_entry(i):
+    """Build a raw HAR entry dict."""
+    return {
+        'startedDateTime': '2025-08-18T04:08:00.000Z',
+        'request': {
+            'method': 'POST' if i % 2 else 'GET',
+            'url': f'https://example.com/api/{i}',
+            'headers': [{'name': 'X-Index', 'value': str(i)}],
+            'cookies': [],
+            'postData': {'mimeType': 'application/json', 'text': '{"i": %d}' % i},
+        },
+        'response': {'status': 200, 'content': {'text': '{"nested": [1, {"x": "]"}]}'}},
+    }
+
+
+@pytest.fixture
+def har_path(tmp_path):
+    """Write a HAR file with valid entries and one malformed entry."""
+    entries = [make_raw_entry(i) for i in range(10)]
+    entries.insert(3, {'invalid_entry': 'this should cause an error'})
+    path = tmp_path / 'capture.har'
+    path.write_text(json.dumps({'log': {'version': '1.2', 'entries': entries}}, indent=2))
+    return path
+
+
+class TestEntryStore:
+    """Tests for EntryStore."""
+    
+    def test_matches_streaming_parser(self, har_path):
+        """Test that the store decodes the same entries as the parser."""
+        with EntryStore(har_path) as store:
+            assert list(store) == load_har_entries(str(har_path))
+            assert len(store) == 10
+            assert store.entries_skipped == 1
+    
+    def test_random_access(self, har_path):
+        """Test indexing, negative indexing and slicing."""
+        with EntryStore(har_path) as store:
+            assert store[7].request.url == 'https://example.com/api/7'
+            assert store[-1].request.url == 'https://example.com/api/9'
+            assert [e.request.url for e in store[1:3]] == [
+                'https://example.com/api/1',
+                'https://example.com/api/2',
+            ]
+            with pytest.raises(IndexError):
+                store[10]
+    
+    def test_discard(self, har_path):
+        """Test dropping an entry from the index."""
+        with EntryStore(har_path) as store:
+            assert store[5].request.url == 'https://example.com/api/5'
+            
+            store.discard(2)
+            
+            assert len(store) == 9
+            assert store.entries_skipped == 2
+            assert store[5].request.url == 'https://example.com/api/6'
+    
+    def test_span_points_at_entry(self, har_path):
+        """Test that spans are byte offsets of the raw entry in the file."""
+        data = har_path.read_bytes()
+        with EntryStore(har_path) as store:
+            start, end = store.span(4)
+            assert json.loads(data[start:end]) == store.raw_entry(4)
+            assert store.index_size == 16 * len(store)
+    
+    def test_cache_is_bounded(self, har_path):
+        """Test that decoded entries are cached up to cache_size."""
+        with EntryStore(har_path, cache_size=2) as store:
+            first = store[0]
+            assert store[0] is first
+            store[1]
+            store[2]
+            assert store[0] is not first
+            assert store[0] == first
+    
+    def test_index_in_batches(self, har_path):
+        """Test indexing a store opened without an index."""
+        with EntryStore(har_path, index=False) as store:
+            assert len(store) == 0
+            progress = []
+            for count, offset in store.index_batches(batch_size=4):
+                progress.append((count, offset))
+                assert store[count - 1].request.url == f'https://example.com/api/{count - 1}'
+            
+            assert [count for count, _ in progress] == [4, 8, 10]
+            assert progress[-1][1] == store.file_size == os.path.getsize(har_path)
+            assert progress[0][1] < progress[1][1] < store.file_size
+            assert store.entries_skipped == 1
+            with pytest.raises(RuntimeError):
+                next(store.index_batches())
+    
+    def test_empty_file_raises(self, tmp_path):
+        """Test that an empty file is rejected."""
+        path = tmp_path / 'empty.har'
+        path.write_bytes(b'')
+        
+        with pytest.raises(ValueError):
+            EntryStore(path)
+    
+    @pytest.mark.asyncio
+    async def test_generate_from_store(self, har_path):
+        """Test that the generator accepts a store as its entry sequence."""
+        with EntryStore(har_path) as store:
+            config = LoliCodeConfig(selected_indices=[2, 5])
+            script = await LoliCodeGenerator().generate(
+                config, store, DependencyMatrix(topological_order=list(range(len(store))))
+            )
+        
+        assert 'REQUEST "https://example.com/api/2"' in script
+        assert 'REQUEST "https://example.com/api/5" POST' in script
@@ -0,0 +1,150 @@
+"""Tests for EntryTable."""
+
+import math
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator import entry_table
+from generator.entry_table import EntryTable
+from generator.types import (
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    RequestBody,
+)
+
+
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(entry_table.np is None, reason='NumPy not installed')),
+]
+
+
+def make_entry(url, method='GET', status=200, body=None, timestamp='', duration=0.0):
+    """Build a SemanticHarEntry."""
+    return SemanticHarEntry(
+        request=SemanticHarRequest(
+            url=url,
+            method=method,
+            headers={},
+            cookies={},
+            body=RequestBody(data=body, content_type='json') if body is not None else None
+        ),
+        response=SemanticHarResponse(status=status),
+        timestamp=timestamp,
+        duration=duration
+    )
+
+
+@pytest.fixture
+def entries():
+    """Sample entries across two hosts."""
+    return [
+        make_entry('https://a.example.com/login', 'GET', 200, timestamp='2025-08-18T04:08:00.000Z', duration=30.0),
+        make_entry('https://a.example.com/login', 'POST', 302, body='{"u":1}', duration=120.0),
+        make_entry('https://b.example.com/api', 'post', 201, body='{}', duration=80.0),
+        make_entry('https://a.example.com/api', 'POST', 204, body='{"x":"yz"}', duration=45.0),
+        make_entry('https://a.example.com/missing', 'GET', 404, duration=10.0),
+    ]
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+class TestEntryTable:
+    """Tests for EntryTable with and without NumPy."""
+    
+    def test_columns(self, entries, use_numpy):
+        """Test that scalar fields are stored column-wise."""
+        table = EntryTable.from_entries(entries, use_numpy=use_numpy)
+        
+        assert len(table) == 5
+        assert list(table.status) == [200, 302, 201, 204, 404]
+        assert list(table.body_size) == [0, 7, 2, 10, 0]
+        assert table.methods == ['GET', 'POST']
+        assert table.hosts == ['a.example.com', 'b.example.com']
+        assert table.url(2) == 'https://b.example.com/api'
+        assert table.method_name(2) == 'POST'
+        assert table.host_name(2) == 'b.example.com'
+        assert table.timestamp[0] == 1755490080.0
+        assert math.isnan(table.timestamp[1])
+    
+    def test_select(self, entries, use_numpy):
+        """Test a combined method, host and status range query."""
+        table = EntryTable.from_entries(entries, use_numpy=use_numpy)
+        
+        assert table.select(method='post', host='a.example.com', status=(200, 300)) == [3]
+        assert table.select(status=(200, 300)) == [0, 2, 3]
+        assert table.select(method='DELETE') == []
+        assert table.select(host='unknown.example.com') == []
+    
+    def test_argsort_and_counts(self, entries, use_numpy):
+        """Test column sorting and value counts."""
+        table = EntryTable.from_entries(entries, use_numpy=use_numpy)
+        
+        assert table.argsort('duration') == [4, 0, 3, 2, 1]
+        assert table.argsort('method', descending=True) == [1, 2, 3, 0, 4]
+        assert table.argsort('url')[0] == 3
+        assert table.value_counts('method') == {'GET': 2, 'POST': 3}
+        assert table.value_counts('status')[404] == 1
+    
+    def test_sort_keys(self, use_numpy):
+        """Test that names and URLs are ranked by text, and keys are cached."""
+        table = EntryTable.from_entries([
+            make_entry('https://z.example.com/b', 'POST'),
+            make_entry('https://a.example.com/b', 'GET'),
+            make_entry('https://z.example.com/b', 'DELETE'),
+            make_entry('https://m.example.com/a', 'GET'),
+        ], use_numpy=use_numpy)
+        
+        assert list(table.sort_keys('url')) == [2, 0, 2, 1]
+        assert list(table.sort_keys('method')) == [2, 1, 0, 1]
+        assert list(table.sort_keys('host')) == [2, 0, 2, 1]
+        assert table.sort_keys('url') is table.sort_keys('url')
+        assert table.argsort('url') == [1, 3, 0, 2]
+        assert table.argsort('method', descending=True) == [0, 1, 3, 2]
+        assert table.argsort('host', descending=True) == [0, 2, 3, 1]
+    
+    def test_to_entry(self, entries, use_numpy):
+        """Test converting rows back into entries."""
+        with_source = EntryTable.from_entries(entries, use_numpy=use_numpy)
+        without_source = EntryTable.from_entries(iter(entries), use_numpy=use_numpy)
+        
+        assert with_source.to_entries([1, 3]) == [entries[1], entries[3]]
+        rebuilt = without_source.to_entry(0)
+        assert rebuilt.request.url == 'https://a.example.com/login'
+        assert rebuilt.response.status == 200
+        assert rebuilt.timestamp == '2025-08-18T04:08:00.000Z'
+    
+    def test_frozen_table_rejects_append(self, entries, use_numpy):
+        """Test that rows cannot be added after freezing."""
+        table = EntryTable.from_entries(entries, use_numpy=use_numpy)
+        
+        with pytest.raises(RuntimeError):
+            table.append(entries[0])
+    
+    def test_malformed_url(self, entries, use_numpy):
+        """Test that a URL urlsplit rejects is stored without a host."""
+        entries.append(make_entry('http://[bad/x'))
+        
+        table = EntryTable.from_entries(entries, use_numpy=use_numpy)
+        
+        assert len(table) == 6
+        assert table.host_name(5) == ''
+        assert table.url(5) == 'http://[bad/x'
+    
+    def test_malformed_values(self, use_numpy):
+        """Test that values of the wrong type are coerced instead of failing."""
+        entries = [
+            make_entry('https://a.example.com/', status='200', duration='12.5'),
+            make_entry('https://a.example.com/', status=None, duration=None, timestamp=1755490080),
+            make_entry('https://a.example.com/', status='OK', timestamp=['2025-08-18']),
+        ]
+        entries[2].request.body = RequestBody(data=None, content_type='form')
+        
+        table = EntryTable.from_entries(entries, use_numpy=use_numpy)
+        
+        assert list(table.status) == [200, 0, 0]
+        assert list(table.duration) == [12.5, 0.0, 0.0]
+        assert list(table.body_size) == [0, 0, 0]
+        assert all(math.isnan(value) for value in table.timestamp)
@@ -0,0 +1,139 @@
+"""Tests for the HAR filter engine."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator import entry_table
+from generator.entry_table import EntryTable
+from generator.filter import FilterRule, CompiledFilter, apply_filters, compile_filter, filter_mask
+from generator.types import (
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    RequestBody,
+)
+
+
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(entry_table.np is None, reason='NumPy not installed')),
+]
+
+
+def make_entry(url, method='GET', status=200, body=None, headers=None):
+    """Build a SemanticHarEntry."""
+    return SemanticHarEntry(
+        request=SemanticHarRequest(
+            url=url,
+            method=method,
+            headers=headers or {},
+            cookies={},
+            body=RequestBody(data=body, content_type='json') if body is not None else None
+        ),
+        response=SemanticHarResponse(status=status)
+    )
+
+
+@pytest.fixture
+def entries():
+    """A small login flow across two hosts."""
+    return [
+        make_entry('https://example.com/login', headers={'Accept': 'text/html'}),
+        make_entry('https://example.com/api/login?next=/home', 'POST', 302, body='{"user":"a"}',
+                   headers={'Content-Type': 'application/json'}),
+        make_entry('https://cdn.example.net/app.js', headers={'Accept': '*/*'}),
+        make_entry('https://example.com/api/profile', status=401, headers={'Authorization': 'Bearer x'}),
+        make_entry('https://example.com/api/items?page=2', 'post', 500, body='{}'),
+    ]
+
+
+# (rules, logic, expected indices)
+CASES = [
+    ([FilterRule('url', 'contains', 'LOGIN')], 'AND', [0, 1]),
+    ([FilterRule('url', 'contains', 'LOGIN', case_sensitive=True)], 'AND', []),
+    ([FilterRule('url-hostname', 'equals', 'example.com')], 'AND', [0, 1, 3, 4]),
+    ([FilterRule('url-path', 'starts-with', '/api/')], 'AND', [1, 3, 4]),
+    ([FilterRule('url-query', 'equals', '')], 'AND', [0, 2, 3]),
+    ([FilterRule('url', 'ends-with', '.js')], 'AND', [2]),
+    ([FilterRule('url', 'regex', r'/api/(login|items)\b')], 'AND', [1, 4]),
+    ([FilterRule('request-method', 'equals', 'post')], 'AND', [1, 4]),
+    ([FilterRule('request-method', 'not-equals', 'GET')], 'AND', [1, 4]),
+    ([FilterRule('response-status', 'greater-than', '399')], 'AND', [3, 4]),
+    ([FilterRule('response-status', 'in-range', '300-401')], 'AND', [1, 3]),
+    ([FilterRule('body-size', 'in-range', '-5-5')], 'AND', [0, 2, 3, 4]),
+    ([FilterRule('response-status', 'in-range', '-10--1')], 'AND', []),
+    ([FilterRule('response-status', 'starts-with', '2')], 'AND', [0, 2]),
+    ([FilterRule('body-size', 'less-than', '5')], 'AND', [0, 2, 3, 4]),
+    ([FilterRule('request-header', 'contains', 'json', header='content-type')], 'AND', [1]),
+    ([FilterRule('request-header', 'contains', 'accept:')], 'AND', [0, 2]),
+    ([FilterRule('request-method', 'equals', 'POST'), FilterRule('url', 'not-contains', 'login')], 'AND', [4]),
+    ([FilterRule('response-status', 'less-than', '600'), FilterRule('url', 'contains', 'api')], 'AND', [1, 3, 4]),
+    ([FilterRule('response-status', 'equals', '200'), FilterRule('url', 'contains', 'cdn')], 'OR', [0, 2]),
+    ([FilterRule('url', 'contains', 'cdn'), FilterRule('response-status', 'equals', '401')], 'OR', [2, 3]),
+    ([FilterRule('url', 'contains', 'cdn'), FilterRule('url', 'contains', 'login', enabled=False)], 'OR', [2]),
+    ([], 'AND', [0, 1, 2, 3, 4]),
+]
+
+
+class TestCompiledFilter:
+    """Tests for rule compilation and entry filtering."""
+    
+    @pytest.mark.parametrize('rules, logic, expected', CASES)
+    def test_entries(self, entries, rules, logic, expected):
+        """Test each operator and target on entries."""
+        compiled = compile_filter(rules, logic)
+        
+        assert compiled.indices(entries) == expected
+        assert apply_filters(entries, rules, logic) == [entries[i] for i in expected]
+    
+    @pytest.mark.parametrize('use_numpy', BACKENDS)
+    @pytest.mark.parametrize('rules, logic, expected', CASES)
+    def test_table_mask_matches_entries(self, entries, rules, logic, expected, use_numpy):
+        """Test that the columnar path agrees with the per-entry path."""
+        table = EntryTable.from_entries(entries, use_numpy=use_numpy)
+        
+        mask = filter_mask(table, rules, logic)
+        
+        assert [i for i, hit in enumerate(mask) if hit] == expected
+    
+    def test_short_circuit(self, entries):
+        """Test that later rules only see entries earlier rules left open."""
+        seen = []
+        
+        class Recording(dict):
+            def items(self):
+                seen.append(self)
+                return super().items()
+        
+        for entry in entries:
+            entry.request.headers = Recording(entry.request.headers)
+        compiled = CompiledFilter([
+            FilterRule('response-status', 'equals', '500'),
+            FilterRule('request-header', 'contains', 'x'),
+        ], 'AND')
+        
+        assert compiled.indices(entries) == []
+        assert compiled.mask(EntryTable.from_entries(entries)) is not None
+        assert len(seen) == 2
+    
+    def test_invalid_rules(self):
+        """Test that bad rules fail when compiled."""
+        with pytest.raises(ValueError):
+            compile_filter([FilterRule('url', 'regex', '(')])
+        with pytest.raises(ValueError):
+            compile_filter([FilterRule('body-size', 'greater-than', 'big')])
+        with pytest.raises(ValueError):
+            compile_filter([FilterRule('body-size', 'in-range', '1-2-3')])
+        with pytest.raises(ValueError):
+            compile_filter([FilterRule('cookie', 'contains', 'x')])
+        with pytest.raises(ValueError):
+            compile_filter([], logic='XOR')
+    
+    def test_header_rules_need_source(self, entries):
+        """Test that header rules on a table without entries are rejected."""
+        table = EntryTable.from_entries(iter(entries))
+        
+        with pytest.raises(ValueError):
+            filter_mask(table, [FilterRule('request-header', 'contains', 'json')])
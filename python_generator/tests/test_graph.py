@@ -0,0 +1,90 @@
+"""Tests for dependency graph algorithms and DependencyMatrix."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.graph import (
+    strongly_connected_components,
+    topological_sort,
+    dependency_depths,
+    critical_path,
+)
+from generator.types import DependencyMatrix
+
+
+# 0 <- 1 <- 3, 0 <- 2, and 4 <-> 5 in a cycle that depends on 3
+DEPENDENCIES = [set(), {0}, {0}, {1}, {3, 5}, {4}, set()]
+
+
+class TestGraph:
+    """Tests for the graph functions."""
+    
+    def test_strongly_connected_components(self):
+        """Test that cycles are grouped and dependencies come first."""
+        components = strongly_connected_components(DEPENDENCIES)
+        
+        assert sorted(components) == [[0], [1], [2], [3], [4, 5], [6]]
+        assert components.index([3]) < components.index([4, 5])
+        assert components.index([0]) < components.index([1])
+    
+    def test_topological_sort(self):
+        """Test Kahn ordering over the condensation."""
+        assert topological_sort(DEPENDENCIES) == [0, 1, 2, 3, 4, 5, 6]
+        assert topological_sort([{1}, set(), {0}]) == [1, 0, 2]
+        assert topological_sort([]) == []
+    
+    def test_topological_sort_deep_chain(self):
+        """Test that long chains do not hit the recursion limit."""
+        n = 20_000
+        dependencies = [set()] + [{i - 1} for i in range(1, n)]
+        dependencies[0] = {n - 1}
+        
+        assert topological_sort(dependencies) == list(range(n))
+    
+    def test_depths_and_critical_path(self):
+        """Test longest dependency chains, including through a cycle."""
+        depths = dependency_depths(DEPENDENCIES)
+        
+        assert depths == [0, 1, 1, 2, 3, 3, 0]
+        assert critical_path(DEPENDENCIES, depths) == [0, 1, 3, 4]
+        assert critical_path([{1}, {0}, {0, 1}], dependency_depths([{1}, {0}, {0, 1}])) == [0, 2]
+        assert critical_path([set(), set()], [0, 0]) == [0]
+    
+    def test_unknown_node(self):
+        """Test that dependencies on missing nodes are rejected."""
+        with pytest.raises(ValueError):
+            topological_sort([{3}])
+
+
+class TestDependencyMatrix:
+    """Tests for the DependencyMatrix graph methods."""
+    
+    def test_from_dependencies(self):
+        """Test building a matrix with a computed order."""
+        matrix = DependencyMatrix.from_dependencies(DEPENDENCIES)
+        
+        assert matrix.topological_order == [0, 1, 2, 3, 4, 5, 6]
+        assert matrix.cycles() == [[4, 5]]
+        assert matrix.depths()[5] == 3
+        assert matrix.critical_path() == [0, 1, 3, 4]
+    
+    def test_order(self):
+        """Test ordering selections, duplicates and missing indices."""
+        matrix = DependencyMatrix(topological_order=[3, 1, 2])
+        
+        assert matrix.order([2, 3, 1]) == [3, 1, 2]
+        assert matrix.order([2, 2, 3]) == [3, 2]
+        assert matrix.order([7, 2, 0]) == [2, 0, 7]
+        assert matrix.position(1) == 1
+        assert matrix.position(0) is None
+    
+    def test_order_after_reassignment(self):
+        """Test that assigning a new order refreshes the position index."""
+        matrix = DependencyMatrix(topological_order=[0, 1])
+        assert matrix.order([1, 0]) == [0, 1]
+        
+        matrix.topological_order = [1, 0]
+        
+        assert matrix.order([0, 1]) == [1, 0]
@@ -0,0 +1,68 @@
+"""Tests for the request list of the GUI application."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+tk = pytest.importorskip('tkinter')
+
+from gui_app import VirtualRequestList
+from generator.entry_table import EntryTable
+from generator.selection import Selection
+from generator.types import SemanticHarEntry, SemanticHarRequest, SemanticHarResponse
+
+
+def make_list(entries):
+    """Build a request list over ``entries`` without creating its widgets."""
+    request_list = VirtualRequestList.__new__(VirtualRequestList)
+    request_list.items = []
+    request_list._render = lambda: None
+    request_list.set_table(EntryTable.from_entries(entries))
+    return request_list
+
+
+@pytest.fixture
+def entries():
+    """Requests with distinct methods, URLs and statuses."""
+    return [
+        SemanticHarEntry(
+            request=SemanticHarRequest(url=url, method=method, headers={}, cookies={}),
+            response=SemanticHarResponse(status=status)
+        )
+        for url, method, status in (
+            ('https://example.com/c', 'POST', 404),
+            ('https://example.com/a', 'GET', 200),
+            ('https://example.com/b', 'PUT', 302),
+        )
+    ]
+
+
+class TestVirtualRequestList:
+    """Tests for sorting the request list."""
+    
+    @pytest.mark.parametrize('column', [name for name, _, _ in VirtualRequestList.COLUMNS])
+    def test_sort_by_every_column(self, entries, column):
+        """Test that every column heading sorts, and sorts again in reverse."""
+        request_list = make_list(entries)
+        request_list.selection = Selection(3, [2])
+        
+        request_list.sort_by(column)
+        ascending = list(request_list.order)
+        request_list.sort_by(column)
+        
+        assert sorted(ascending) == [0, 1, 2]
+        assert request_list.sort_descending is True
+        if column != 'check':
+            assert list(request_list.order) == ascending[::-1]
+    
+    def test_sort_by_check(self, entries):
+        """Test that sorting by the checkbox column puts checked entries first."""
+        request_list = make_list(entries)
+        request_list.selection = Selection(3, [2])
+        
+        request_list.sort_by('check')
+        assert list(request_list.order) == [2, 0, 1]
+        request_list.sort_by('check')
+        assert list(request_list.order) == [0, 1, 2]
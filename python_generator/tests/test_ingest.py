@@ -0,0 +1,100 @@
+"""Tests for parallel HAR ingest."""
+
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.ingest import transform_entries, ingest_har_file
+from generator.parser import transform_entry
+
+
+MALFORMED_ENTRY = {'invalid_entry': 'this should cause an error'}
+
+
+def make_raw_entries(count):
+    """Build raw HAR entries with a malformed entry every seventh position."""
+    entries = []
+    for i in range(count):
+        if i % 7 == 1:
+            entries.append(MALFORMED_ENTRY)
+            continue
+        entries.append({
+            'request': {
+                'method': 'POST',
+                'url': f'https://example.com/api/{i}',
+                'headers': [{'name': 'Content-Type', 'value': 'application/json'}],
+                'cookies': [{'name': 'session', 'value': str(i)}],
+                'postData': {'mimeType': 'application/json', 'text': '{}'},
+            },
+            'response': {
+                'status': 200,
+                'cookies': [{'name': 'token', 'value': str(i)}],
+                'content': {'mimeType': 'application/json', 'text': '{"ok":true}'},
+            },
+        })
+    return entries
+
+
+class TestTransformEntries:
+    """Tests for transform_entries."""
+    
+    def test_serial_fallback(self):
+        """Test that small inputs are transformed in-process."""
+        raw = make_raw_entries(10)
+        
+        result = transform_entries(raw)
+        
+        assert result.entries == [transform_entry(e) for e in raw if e is not MALFORMED_ENTRY]
+        assert result.skipped == 2
+    
+    def test_parallel_preserves_order(self):
+        """Test that chunks are reassembled in original order."""
+        raw = make_raw_entries(50)
+        
+        result = transform_entries(raw, max_workers=2, chunk_size=4, serial_threshold=0)
+        
+        expected = [transform_entry(e) for e in raw if e is not MALFORMED_ENTRY]
+        assert result.entries == expected
+        assert result.skipped == 50 - len(expected)
+    
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected."""
+        with pytest.raises(ValueError):
+            transform_entries([], chunk_size=0)
+    
+    def test_profile(self):
+        """Test that the parse profile decides which response fields are kept."""
+        raw = make_raw_entries(10)
+        
+        analysis = transform_entries(raw).entries
+        minimal = transform_entries(raw, max_workers=2, chunk_size=4, serial_threshold=0, profile='minimal').entries
+        
+        assert analysis[0].response.cookies == {'token': '0'}
+        assert analysis[0].response.body.data == '{"ok":true}'
+        assert minimal == [transform_entry(e, 'minimal') for e in raw if e is not MALFORMED_ENTRY]
+        assert minimal[0].response.body is None
+        with pytest.raises(ValueError):
+            transform_entries(raw, profile='everything')
+
+
+class TestIngestHarFile:
+    """Tests for ingest_har_file."""
+    
+    def test_parallel_file_ingest(self, tmp_path):
+        """Test that workers decode their own spans of the file."""
+        raw = make_raw_entries(40)
+        path = tmp_path / 'capture.har'
+        path.write_text(json.dumps({'log': {'entries': raw}}))
+        
+        parallel = ingest_har_file(path, max_workers=2, chunk_size=5, serial_threshold=0)
+        serial = ingest_har_file(path, max_workers=1)
+        
+        assert parallel.entries == serial.entries
+        assert [e.request.url for e in parallel.entries][:2] == [
+            'https://example.com/api/0',
+            'https://example.com/api/2',
+        ]
+        assert parallel.skipped == serial.skipped == 6
+        assert parallel.entries[0].response.body.data == '{"ok":true}'
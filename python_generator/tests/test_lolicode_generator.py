@@ -1,13 +1,18 @@
 """Tests for LoliCodeGenerator."""
 
+import io
+import json
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 import pytest
+from generator.parser import load_har_entries
 from generator.lolicode_generator import LoliCodeGenerator, generate_lolicode
+from generator.validators import LoliCodeValidator
 from generator.types import (
     LoliCodeConfig,
+    BodyOptions,
     SemanticHarEntry,
     SemanticHarRequest,
     SemanticHarResponse,
@@ -197,6 +202,17 @@ class TestLoliCodeGenerator:
         data_pos = script.find('api/data')
         assert login_pos < data_pos
     
+    @pytest.mark.asyncio
+    async def test_selection_missing_from_order(self):
+        """Test that selected requests missing from the order are still generated."""
+        config = LoliCodeConfig(
+            selected_indices=[1, 0]
+        )
+        
+        script = await self.generator.generate(config, self.entries, DependencyMatrix(topological_order=[1]))
+        
+        assert 0 < script.find('api/data') < script.find('api/login')
+    
     @pytest.mark.asyncio
     async def test_factory_function(self):
         """Test the factory function."""
@@ -224,3 +240,87 @@ class TestLoliCodeGenerator:
         
         assert 'KEYCHECK SUCCESS' in script
         assert 'Equal "200"' in script
+    
+    @pytest.mark.asyncio
+    async def test_streaming_matches_generate(self):
+        """Test that iter_sections and generate_to reproduce generate()."""
+        self.generator._generate_header = lambda: '# header'
+        config = LoliCodeConfig(selected_indices=[0, 1], settings={'useProxy': True})
+        
+        script = await self.generator.generate(config, self.entries, self.dependency_matrix)
+        sections = [
+            section
+            async for section in self.generator.iter_sections(config, self.entries, self.dependency_matrix)
+        ]
+        stream = io.StringIO()
+        written = await self.generator.generate_to(stream, config, self.entries, self.dependency_matrix)
+        
+        assert len(sections) == 5
+        assert '\n\n'.join(sections) == script
+        assert stream.getvalue() == script
+        assert written == len(script)
+    
+    @pytest.mark.asyncio
+    async def test_streaming_validates_each_section(self):
+        """Test that an invalid section stops the stream with its script line."""
+        config = LoliCodeConfig(
+            selected_indices=[0, 1],
+            custom_headers={1: [CustomHeader(key='X-Quote', value='a"b', enabled=True)]}
+        )
+        unchecked = '\n\n'.join([
+            self.generator._generate_header(),
+            self.generator._generate_request_section(self.entries[0], 0, config),
+            self.generator._generate_request_section(self.entries[1], 1, config),
+            self.generator._generate_footer(),
+        ])
+        expected = LoliCodeValidator().validate(unchecked).errors[0]
+        stream = io.StringIO()
+        
+        with pytest.raises(RuntimeError, match='Unmatched quotes') as error:
+            await self.generator.generate_to(stream, config, self.entries, self.dependency_matrix)
+        
+        # Same line number as validating the whole script
+        assert str(error.value) == f'Generated invalid LoliCode: {expected}'
+        # Sections before the invalid one were already written
+        assert 'api/login' in stream.getvalue()
+        assert 'api/data' not in stream.getvalue()
+    
+    @pytest.mark.asyncio
+    async def test_lone_surrogate_in_body(self, tmp_path):
+        """Test a captured body with a lone surrogate, as json.loads returns for "\\ud83d"."""
+        har = tmp_path / 'capture.har'
+        har.write_text(json.dumps({'log': {'entries': [{
+            'request': {'method': 'POST', 'url': 'https://example.com/form', 'headers': [],
+                        'postData': {'mimeType': 'application/x-www-form-urlencoded', 'text': 'a=\ud83d'}},
+            'response': {'status': 200, 'headers': []},
+        }]}}))
+        entries = load_har_entries(str(har))
+        
+        script = await self.generator.generate(LoliCodeConfig(selected_indices=[0]), entries, DependencyMatrix(topological_order=[0]))
+        
+        assert '  CONTENT "a=\ud83d"' in script
+    
+    @pytest.mark.asyncio
+    async def test_body_options(self, tmp_path):
+        """Test side files and the body report of a script with body options."""
+        options = BodyOptions(minify_json=True, side_file_threshold=10, side_file_dir=str(tmp_path))
+        config = LoliCodeConfig(selected_indices=[0, 1], body_options=options)
+        
+        script = await self.generator.generate(config, self.entries, self.dependency_matrix)
+        
+        assert LoliCodeValidator().validate(script).is_valid
+        assert 'UTILITY File' in script and '{\\"username' not in script
+        assert [path.read_text() for path in tmp_path.iterdir()] == ['{"username":"test"}']
+        assert self.generator.body_report.side_files == 1
+        assert self.generator.body_report.bodies == 1
+        # Sections with body options bypass the section cache
+        assert len(self.generator.section_cache) == 0
+        
+        await self.generator.generate(LoliCodeConfig(selected_indices=[0]), self.entries, self.dependency_matrix)
+        assert self.generator.body_report is None
+        with pytest.raises(ValueError, match='INVALID_CONFIG'):
+            await self.generator.generate(
+                LoliCodeConfig(selected_indices=[0], body_options=BodyOptions(side_file_threshold=1)),
+                self.entries,
+                self.dependency_matrix
+            )
@@ -1,10 +1,23 @@
 """Tests for LoliCodeValidator."""
 
+import io
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from generator.validators.lolicode_validator import LoliCodeValidator
+from generator.validators import lolicode_validator
+from generator.validators.lolicode_validator import LoliCodeValidator, StreamingValidator
+
+
+SCRIPT_WITH_ERRORS = '''# Generated by HAR2LoliCode
+REQUEST "https://example.com/login" POST
+  CONTENT "{\\"quote\\": \\"}"
+PARSE "<SOURCE>" LR "token=\\"" "\\""
+  "dangling
+KEYCHECK SUCCESS
+  KEY "<RESPONSE.STATUS>" Equal "200
+REQUEST
+FUNCTION Delay "1000" None'''
 
 
 class TestLoliCodeValidator:
@@ -89,6 +102,14 @@ REQUEST "undefined"
         assert result.is_valid is False
         assert 'Script is empty' in result.errors[0]
     
+    def test_lone_surrogate(self):
+        """Test a lone surrogate, as JSON decoding of a captured body can give."""
+        script = 'REQUEST "https://example.com" POST\n  CONTENT "a=\ud83d"\nKEYCHECK "\ud83d'
+        
+        result = self.validator.validate(script)
+        
+        assert result.errors == ['Line 3: Unmatched quotes']
+    
     def test_validation_result_to_dict(self):
         """Test conversion of validation result to dictionary."""
         script = 'REQUEST "https://example.com"'
@@ -100,3 +121,60 @@ REQUEST "undefined"
         assert 'errors' in result_dict
         assert isinstance(result_dict['is_valid'], bool)
         assert isinstance(result_dict['errors'], list)
+
+
+class TestStreamingValidation:
+    """Tests for single-pass and incremental validation."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.validator = LoliCodeValidator()
+        self.expected = [
+            'Script contains "None" values.',
+            'Line 7: Unmatched quotes',
+            'Line 8: Empty or invalid REQUEST block',
+        ]
+    
+    def test_parse_and_content_lines_are_skipped(self):
+        """Test that quotes in CONTENT lines and PARSE blocks are not errors."""
+        result = self.validator.validate(SCRIPT_WITH_ERRORS)
+        
+        assert result.errors == self.expected
+    
+    def test_chunks_match_whole_script(self, monkeypatch):
+        """Test feeding any split of the script, across small blocks."""
+        monkeypatch.setattr(lolicode_validator, 'BLOCK_SIZE', 16)
+        
+        for size in (1, 7, 40, len(SCRIPT_WITH_ERRORS)):
+            validator = StreamingValidator()
+            for start in range(0, len(SCRIPT_WITH_ERRORS), size):
+                validator.feed(SCRIPT_WITH_ERRORS[start:start + size])
+            assert validator.close().errors == self.expected
+    
+    def test_validate_stream_reads_lines(self):
+        """Test validating the lines of a file-like object."""
+        result = self.validator.validate_stream(io.StringIO(SCRIPT_WITH_ERRORS))
+        
+        assert result.errors == self.expected
+    
+    def test_fail_fast_stops_at_first_line_error(self):
+        """Test that fail-fast reports only the earliest error."""
+        result = self.validator.validate(SCRIPT_WITH_ERRORS, fail_fast=True)
+        
+        assert result.errors == ['Line 7: Unmatched quotes']
+    
+    def test_first_line_offset(self):
+        """Test numbering lines of a script fragment."""
+        result = self.validator.validate('KEYCHECK\nREQUEST "x', first_line=10)
+        
+        assert result.errors == ['Line 11: Unmatched quotes']
+    
+    def test_sections_are_validated_incrementally(self):
+        """Test appended sections keep script line numbers and PARSE state."""
+        validator = self.validator.streaming()
+        
+        assert validator.add_section('REQUEST "https://example.com"') == []
+        assert validator.add_section('PARSE "<SOURCE>" LR "a" "b"') == []
+        assert validator.add_section('  "still parsing') == []
+        assert validator.add_section('KEYCHECK SUCCESS\n  "broken') == ['Line 8: Unmatched quotes']
+        assert validator.close().is_valid is False
@@ -0,0 +1,257 @@
+"""Tests for the incremental HAR parser."""
+
+import base64
+import io
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.parser import (
+    HarStreamingParser,
+    ParseProfile,
+    get_profile,
+    iter_har_entries,
+    load_har_entries,
+    transform_entry,
+)
+
+
+def make_raw_entry(url='https://example.com/api', method='GET', status=200, post_data=None):
+    """Build a raw HAR entry dict."""
+    request = {
+        'method': method,
+        'url': url,
+        'headers': [{'name': 'Accept', 'value': 'application/json'}],
+        'cookies': [{'name': 'session', 'value': 'abc123'}],
+    }
+    if post_data is not None:
+        request['postData'] = post_data
+    return {'request': request, 'response': {'status': status}}
+
+
+def make_har(entries, **extra_log):
+    """Serialize entries as a HAR document."""
+    log = {'version': '1.2', 'creator': {'name': 'Test', 'version': '1.0'}}
+    log.update(extra_log)
+    log['entries'] = entries
+    return json.dumps({'log': log}).encode('utf-8')
+
+
+class TestTransformEntry:
+    """Tests for transform_entry."""
+    
+    def test_headers_lowercased_and_cookies_collapsed(self):
+        """Test header and cookie normalization."""
+        entry = transform_entry(make_raw_entry())
+        
+        assert entry.request.headers == {'accept': 'application/json'}
+        assert entry.request.cookies == {'session': 'abc123'}
+        assert entry.response.status == 200
+        assert entry.request.body is None
+    
+    def test_post_data_content_type(self):
+        """Test body content type sniffing from postData mime type."""
+        json_entry = transform_entry(make_raw_entry(
+            method='POST',
+            post_data={'mimeType': 'application/json', 'text': '{"a":1}'}
+        ))
+        form_entry = transform_entry(make_raw_entry(
+            method='POST',
+            post_data={'mimeType': 'application/x-www-form-urlencoded', 'text': 'a=1'}
+        ))
+        
+        assert json_entry.request.body.content_type == 'json'
+        assert json_entry.request.body.data == '{"a":1}'
+        assert form_entry.request.body.content_type == 'form'
+    
+    def test_missing_request_raises(self):
+        """Test that an entry without a request object is rejected."""
+        with pytest.raises(ValueError):
+            transform_entry({'invalid_entry': 'this should cause an error'})
+
+
+def make_response(mime_type='application/json', text='{"token":"abc"}', **content):
+    """Build a raw HAR response with headers, cookies and a body."""
+    content.update(mimeType=mime_type, text=text, size=content.get('size', len(text)))
+    return {
+        'status': 302,
+        'statusText': 'Found',
+        'headers': [{'name': 'Set-Cookie', 'value': 'sid=1'}, {'name': 'Location', 'value': '/home'}],
+        'cookies': [{'name': 'sid', 'value': '1'}],
+        'redirectURL': 'https://example.com/home',
+        'content': content,
+    }
+
+
+class TestParseProfiles:
+    """Tests for the response fields kept by each parse profile."""
+    
+    def transform(self, response, profile):
+        """Transform an entry with the given raw response."""
+        raw = make_raw_entry()
+        raw['response'] = response
+        return transform_entry(raw, profile).response
+    
+    def test_analysis_keeps_response_fields(self):
+        """Test headers, cookies, redirect URL and body under the default profile."""
+        raw = make_raw_entry()
+        raw['response'] = make_response()
+        response = transform_entry(raw).response
+        
+        assert response.status == 302
+        assert response.status_text == 'Found'
+        assert response.headers == {'set-cookie': 'sid=1', 'location': '/home'}
+        assert response.cookies == {'sid': '1'}
+        assert response.redirect_url == 'https://example.com/home'
+        assert response.body.content_type == 'json'
+        assert response.body.data == '{"token":"abc"}'
+        assert not response.body.truncated
+    
+    def test_minimal_keeps_status_only(self):
+        """Test that the minimal profile drops every other response field."""
+        response = self.transform(make_response(), 'minimal')
+        
+        assert response.status == 302
+        assert response.headers == {} and response.cookies == {}
+        assert response.redirect_url is None and response.body is None
+    
+    def test_skipped_mime_types(self):
+        """Test that images and bundles are only kept by the full profile."""
+        for mime_type in ('image/png', 'application/javascript; charset=utf-8', 'Font/woff2'):
+            assert self.transform(make_response(mime_type), 'analysis').body is None
+            assert self.transform(make_response(mime_type), 'full').body is not None
+        assert self.transform(make_response('text/html; charset=utf-8'), 'analysis').body.content_type == 'html'
+    
+    def test_body_size_cap(self):
+        """Test that bodies are cut to max_body_size."""
+        profile = ParseProfile('small', max_body_size=4)
+        body = self.transform(make_response(text='abcdefgh', size=8), profile).body
+        
+        assert body.data == 'abcd'
+        assert body.truncated and body.size == 8
+    
+    def test_base64_decoded_on_access(self):
+        """Test that base64 bodies are kept encoded and capped in decoded bytes."""
+        encoded = base64.b64encode('héllo wörld'.encode('utf-8')).decode('ascii')
+        body = self.transform(make_response('text/plain', encoded, encoding='base64'), 'full').body
+        
+        assert body.text == encoded and body.encoding == 'base64'
+        assert body.data == 'héllo wörld'
+        
+        profile = ParseProfile('small', max_body_size=5)
+        body = self.transform(make_response('text/plain', encoded, encoding='base64'), profile).body
+        assert body.truncated and len(body.text) == 8
+        assert body.data == 'héll'
+    
+    def test_unknown_profile_raises(self):
+        """Test that an unknown profile name is rejected."""
+        assert get_profile('full').name == 'full'
+        with pytest.raises(ValueError):
+            get_profile('everything')
+        with pytest.raises(ValueError):
+            HarStreamingParser(profile='everything')
+    
+    def test_parser_uses_profile(self):
+        """Test that the streaming parser transforms with its profile."""
+        raw = make_raw_entry()
+        raw['response'] = make_response()
+        data = make_har([raw])
+        
+        assert load_har_entries(io.BytesIO(data))[0].response.cookies == {'sid': '1'}
+        assert load_har_entries(io.BytesIO(data), profile='minimal')[0].response.cookies == {}
+
+
+class TestHarStreamingParser:
+    """Tests for HarStreamingParser."""
+    
+    def test_parse_file_object(self):
+        """Test parsing entries from a binary file object."""
+        data = make_har([make_raw_entry(url=f'https://example.com/{i}') for i in range(3)])
+        
+        entries = list(HarStreamingParser().parse(io.BytesIO(data)))
+        
+        assert [e.request.url for e in entries] == [
+            'https://example.com/0',
+            'https://example.com/1',
+            'https://example.com/2',
+        ]
+    
+    def test_small_chunks_match_json_load(self):
+        """Test that tiny read chunks give the same result as json.load."""
+        raw_entries = [
+            make_raw_entry(
+                url=f'https://example.com/{i}?q="quoted"\\\\',
+                method='POST',
+                post_data={'mimeType': 'application/json', 'text': '{"k": "v\\"}[{"}'}
+            )
+            for i in range(5)
+        ]
+        data = make_har(raw_entries, pages=[{'id': 'page_1', 'title': '{[}]"'}])
+        
+        parsed = list(HarStreamingParser(chunk_size=7).parse(io.BytesIO(data)))
+        expected = [transform_entry(e) for e in json.loads(data)['log']['entries']]
+        
+        assert parsed == expected
+    
+    def test_bare_entries_array(self):
+        """Test parsing a bare JSON array of entries."""
+        data = json.dumps([make_raw_entry()]).encode('utf-8')
+        
+        entries = load_har_entries(io.BytesIO(data))
+        
+        assert len(entries) == 1
+    
+    def test_missing_entries_yields_nothing(self):
+        """Test that a document without log.entries yields no entries."""
+        data = json.dumps({'log': {'version': '1.2'}}).encode('utf-8')
+        
+        assert load_har_entries(io.BytesIO(data)) == []
+    
+    def test_unicode_and_bom(self):
+        """Test UTF-8 content split across chunks and a leading BOM."""
+        data = b'\xef\xbb\xbf' + make_har([make_raw_entry(url='https://example.com/café/☃')])
+        
+        entries = load_har_entries(io.BytesIO(data), chunk_size=3)
+        
+        assert entries[0].request.url == 'https://example.com/café/☃'
+    
+    def test_malformed_entry_skipped(self, tmp_path):
+        """Test that malformed entries are skipped and counted."""
+        har_path = tmp_path / 'malformed.har'
+        har_path.write_bytes(make_har([
+            make_raw_entry(url='https://example.com'),
+            {'invalid_entry': 'this should cause an error'},
+        ]))
+        parser = HarStreamingParser()
+        
+        entries = list(parser.parse(str(har_path)))
+        
+        assert len(entries) == 1
+        assert entries[0].request.url == 'https://example.com'
+        assert parser.entries_parsed == 1
+        assert parser.entries_skipped == 1
+        assert parser.bytes_processed == parser.total_bytes == har_path.stat().st_size
+    
+    def test_truncated_file_raises(self):
+        """Test that a truncated file raises ValueError."""
+        data = make_har([make_raw_entry(), make_raw_entry()])
+        
+        with pytest.raises(ValueError):
+            load_har_entries(io.BytesIO(data[:-40]))
+    
+    def test_not_json_raises(self):
+        """Test that non-JSON input raises ValueError."""
+        with pytest.raises(ValueError):
+            load_har_entries(io.BytesIO(b'not a har file'))
+    
+    def test_iter_is_lazy(self):
+        """Test that entries are produced before the input is exhausted."""
+        data = make_har([make_raw_entry() for _ in range(100)])
+        stream = io.BytesIO(data)
+        
+        iterator = iter_har_entries(stream, chunk_size=256)
+        next(iterator)
+        
+        assert stream.tell() < len(data)
@@ -1,5 +1,6 @@
 """Tests for RequestBlockBuilder."""
 
+import io
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
@@ -144,3 +145,66 @@ class TestRequestBlockBuilder:
         
         # Quotes should be escaped
         assert '\\\\"' in result or 'value with' in result
+    
+    def test_write_matches_build(self):
+        """Test that writing into a shared stream gives the built block."""
+        entry = SemanticHarEntry(
+            request=SemanticHarRequest(
+                url='https://example.com/api/login',
+                method='POST',
+                headers={'Accept': 'application/json', 'Cookie': 'a=1'},
+                cookies={'a': '1'},
+                body=RequestBody(data='{"q": "a\\\\b"}', content_type='json')
+            ),
+            response=SemanticHarResponse(status=200)
+        )
+        stream = io.StringIO()
+        
+        self.builder.write(stream.write, entry)
+        stream.write('\n')
+        self.builder.write(stream.write, entry)
+        
+        block = self.builder.build(entry)
+        assert stream.getvalue() == block + '\n' + block
+        assert block.endswith('CONTENT "{\\"q\\": \\"a\\\\\\\\b\\"}"\n  "Content-Type: application/json"')
+    
+    def test_header_policy(self):
+        """Test skipped headers in any case and custom headers merged in order."""
+        entry = SemanticHarEntry(
+            request=SemanticHarRequest(
+                url='https://example.com/',
+                method='GET',
+                headers={'USER-AGENT': 'curl', 'accept': 'text/html', 'Content-Length': '0', 'x-a': '1'},
+                cookies={}
+            ),
+            response=SemanticHarResponse(status=200)
+        )
+        custom_headers = [
+            CustomHeader(key='X-B', value='2', enabled=True),
+            CustomHeader(key='Accept', value='*/*', enabled=True),
+            CustomHeader(key='X-B', value='3', enabled=True),
+            CustomHeader(key='x-a', value='off', enabled=False),
+        ]
+        
+        lines = self.builder.build(entry, custom_headers).split('\n')
+        
+        assert lines[2:] == ['  "accept: */*"', '  "x-a: 1"', '  "x-b: 3"']
+        assert 'curl' not in self.builder.build(entry)
+    
+    def test_custom_skip_headers(self):
+        """Test a builder with its own set of skipped headers."""
+        builder = RequestBlockBuilder(skip_headers=['Accept'])
+        entry = SemanticHarEntry(
+            request=SemanticHarRequest(
+                url='https://example.com/',
+                method='GET',
+                headers={'accept': 'text/html', 'content-length': '0'},
+                cookies={}
+            ),
+            response=SemanticHarResponse(status=200)
+        )
+        
+        result = builder.build(entry)
+        
+        assert 'accept' not in result
+        assert 'content-length: 0' in result
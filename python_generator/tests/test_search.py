@@ -0,0 +1,133 @@
+"""Tests for the trigram search index."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator import entry_table
+from generator.search import TrigramIndex
+from generator.types import (
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    RequestBody,
+)
+
+
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(entry_table.np is None, reason='NumPy not installed')),
+]
+
+
+def make_entry(url, body=None, headers=None):
+    """Build a SemanticHarEntry."""
+    return SemanticHarEntry(
+        request=SemanticHarRequest(
+            url=url,
+            method='GET',
+            headers=headers or {},
+            cookies={},
+            body=RequestBody(data=body, content_type='json') if body is not None else None
+        ),
+        response=SemanticHarResponse(status=200)
+    )
+
+
+@pytest.fixture
+def entries():
+    """A small login flow across two hosts."""
+    return [
+        make_entry('https://example.com/login', headers={'Accept': 'text/html'}),
+        make_entry('https://example.com/api/login', body='{"username":"Alice"}',
+                   headers={'Content-Type': 'application/json'}),
+        make_entry('https://cdn.example.net/app.js', headers={'Accept': '*/*'}),
+        make_entry('https://example.com/api/profile', headers={'Authorization': 'Bearer tok3n'}),
+        make_entry('https://example.com/café'),
+    ]
+
+
+# (query, expected indices)
+CASES = [
+    ('login', [0, 1]),
+    ('LOGIN', [0, 1]),
+    ('api/', [1, 3]),
+    ('example.', [0, 1, 2, 3, 4]),
+    ('username":"alice', [1]),
+    ('authorization: bearer', [3]),
+    ('accept: */*', [2]),
+    ('café', [4]),
+    ('CAFÉ', [4]),
+    ('js', [1, 2]),
+    ('*', [2]),
+    ('zzz', []),
+    ('logout', []),
+]
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+class TestTrigramIndex:
+    """Test cases for TrigramIndex."""
+    
+    @pytest.mark.parametrize('query,expected', CASES)
+    def test_search(self, entries, use_numpy, query, expected):
+        """Test substring queries over URLs, headers and bodies."""
+        index = TrigramIndex.from_entries(entries, use_numpy=use_numpy)
+        
+        assert index.search(query) == expected
+    
+    def test_empty_query(self, entries, use_numpy):
+        """Test that an empty query matches every entry."""
+        index = TrigramIndex.from_entries(entries, use_numpy=use_numpy)
+        
+        assert len(index) == 5
+        assert index.search('') == [0, 1, 2, 3, 4]
+    
+    def test_field_boundaries(self, entries, use_numpy):
+        """Test that matches do not span two fields or two entries."""
+        index = TrigramIndex.from_entries(entries, use_numpy=use_numpy)
+        
+        # URL of entry 0 followed by its first header
+        assert index.search('loginaccept') == []
+        assert index.search('login\x00accept') == []
+        # Last header of entry 1 followed by the URL of entry 2
+        assert index.search('jsonhttps') == []
+    
+    def test_body_limit(self, use_numpy):
+        """Test that only the start of a long body is indexed."""
+        index = TrigramIndex.from_entries(
+            [make_entry('https://a.test/', body='x' * 20 + 'needle')],
+            max_body_length=20,
+            use_numpy=use_numpy
+        )
+        
+        assert index.search('needle') == []
+        assert index.search('xxx') == [0]
+    
+    def test_matches_scan(self, use_numpy):
+        """Test that indexed results agree with a plain scan over many entries."""
+        entries = [
+            make_entry(f'https://host{i % 7}.test/item/{i}', body=f'{{"id":{i * 31}}}' if i % 3 else None)
+            for i in range(600)
+        ]
+        index = TrigramIndex.from_entries(entries, use_numpy=use_numpy)
+        
+        for query in ('host3', 'item/12', '"id":93', '/4', 'st/i', 'host6.test/item/59'):
+            expected = [
+                i for i, entry in enumerate(entries)
+                if query in entry.request.url or (entry.request.body is not None and query in entry.request.body.data)
+            ]
+            assert index.search(query) == expected, query
+    
+    def test_frozen(self, entries, use_numpy):
+        """Test that an index is searched only after freezing and not changed after."""
+        index = TrigramIndex(use_numpy=use_numpy)
+        index.append(entries[0])
+        with pytest.raises(RuntimeError):
+            index.search('login')
+        
+        index.freeze()
+        assert index.search('login') == [0]
+        with pytest.raises(RuntimeError):
+            index.append(entries[1])
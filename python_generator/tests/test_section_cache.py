@@ -0,0 +1,123 @@
+"""Tests for the rendered section cache."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.lolicode_generator import LoliCodeGenerator
+from generator.section_cache import SectionCache, section_key
+from generator.types import (
+    LoliCodeConfig,
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    DependencyMatrix,
+    CustomHeader,
+)
+
+
+def make_entry(path):
+    """Build a SemanticHarEntry for a path."""
+    return SemanticHarEntry(
+        request=SemanticHarRequest(
+            url=f'https://example.com/{path}',
+            method='GET',
+            headers={'accept': '*/*'},
+            cookies={}
+        ),
+        response=SemanticHarResponse(status=200)
+    )
+
+
+def without_date(script):
+    """Drop the generation timestamp from a script."""
+    return '\n'.join(line for line in script.split('\n') if not line.startswith('# Date:'))
+
+
+class TestSectionCache:
+    """Tests for SectionCache."""
+    
+    def test_hits_and_misses(self):
+        """Test counters and lookups."""
+        cache = SectionCache(max_bytes=10_000)
+        
+        assert cache.get('a') is None
+        cache.put('a', 'section a')
+        
+        assert cache.get('a') == 'section a'
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the byte budget evicts the oldest unused sections."""
+        section = 'x' * 1000
+        cache = SectionCache(max_bytes=3 * 2 * sys.getsizeof(section))
+        for key in 'abc':
+            cache.put(key, section)
+        cache.get('a')
+        
+        cache.put('d', section)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == section
+        assert len(cache) == 3
+        assert cache.size_bytes <= cache.max_bytes
+    
+    def test_shrinking_and_oversized_sections(self):
+        """Test lowering the cap and sections larger than the cache."""
+        cache = SectionCache(max_bytes=100_000)
+        cache.put('a', 'x' * 100)
+        cache.put('big', 'x' * 200_000)
+        
+        assert cache.get('big') is None
+        cache.max_bytes = 0
+        assert len(cache) == 0
+        with pytest.raises(ValueError):
+            SectionCache(max_bytes=-1)
+
+
+class TestGeneratorCaching:
+    """Tests for section caching in LoliCodeGenerator."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.entries = [make_entry(path) for path in ('login', 'data', 'logout')]
+        self.matrix = DependencyMatrix(topological_order=[0, 1, 2])
+    
+    @pytest.mark.asyncio
+    async def test_regeneration_renders_only_changes(self):
+        """Test that only sections whose inputs changed are re-rendered."""
+        generator = LoliCodeGenerator()
+        config = LoliCodeConfig(selected_indices=[0, 1, 2])
+        await generator.generate(config, self.entries, self.matrix)
+        
+        config.custom_headers = {1: [CustomHeader(key='X-Test', value='1', enabled=True)]}
+        script = await generator.generate(config, self.entries, self.matrix)
+        
+        assert generator.section_cache.misses == 4
+        assert generator.section_cache.hits == 2
+        assert '"x-test: 1"' in script
+    
+    @pytest.mark.asyncio
+    async def test_cached_output_matches_uncached(self):
+        """Test that caching does not change the generated script."""
+        config = LoliCodeConfig(selected_indices=[2, 0])
+        cached = LoliCodeGenerator()
+        await cached.generate(config, self.entries, self.matrix)
+        
+        first = await cached.generate(config, self.entries, self.matrix)
+        second = await LoliCodeGenerator(cache_max_bytes=0).generate(config, self.entries, self.matrix)
+        
+        assert without_date(first) == without_date(second)
+    
+    def test_key_tracks_entry_contents(self):
+        """Test that equal entries share a key and edited entries do not."""
+        config = LoliCodeConfig(selected_indices=[0])
+        entry = make_entry('login')
+        key = section_key(entry, 0, config)
+        
+        assert section_key(make_entry('login'), 0, config) == key
+        assert section_key(entry, 1, config) != key
+        entry.request.headers['accept'] = 'text/html'
+        assert section_key(entry, 0, config) != key
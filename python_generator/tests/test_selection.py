@@ -0,0 +1,101 @@
+"""Tests for Selection."""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator import entry_table
+from generator.selection import Selection
+
+
+class TestSelection:
+    """Tests for the bitset selection model."""
+    
+    def test_single_indices(self):
+        """Test adding, removing and toggling indices."""
+        selection = Selection(10, [7, 2])
+        
+        selection.add(0)
+        selection.discard(7)
+        selection.toggle(9)
+        selection.toggle(2)
+        
+        assert selection.indices() == [0, 9]
+        assert list(selection) == [0, 9]
+        assert len(selection) == 2
+        assert 9 in selection and 2 not in selection and 10 not in selection
+        with pytest.raises(IndexError):
+            selection.add(10)
+    
+    def test_bulk_operations(self):
+        """Test selecting all, inverting and clearing."""
+        selection = Selection(70, [1, 64])
+        
+        selection.invert()
+        assert len(selection) == 68
+        assert 1 not in selection and 64 not in selection and 69 in selection
+        
+        selection.select_all()
+        assert selection.indices() == list(range(70))
+        
+        selection.clear()
+        assert not selection
+        assert selection.indices() == []
+    
+    @pytest.mark.parametrize('use_numpy', [
+        False,
+        pytest.param(True, marks=pytest.mark.skipif(entry_table.np is None, reason='NumPy not installed')),
+    ])
+    def test_masks(self, use_numpy):
+        """Test selecting and deselecting by filter mask."""
+        mask = [i % 3 == 0 for i in range(20)]
+        if use_numpy:
+            mask = entry_table.np.array(mask)
+        
+        selection = Selection.from_mask(mask)
+        assert selection.indices() == [0, 3, 6, 9, 12, 15, 18]
+        
+        selection.select_all()
+        selection.deselect_where(mask)
+        assert len(selection) == 13 and 3 not in selection and 4 in selection
+        
+        selection.select_where(mask)
+        assert len(selection) == 20
+        
+        selection.invert_where(mask)
+        assert len(selection) == 13 and 3 not in selection
+        selection.invert_where(mask)
+        assert len(selection) == 20
+        with pytest.raises(ValueError):
+            selection.select_where(mask[:5])
+    
+    def test_non_bool_masks(self):
+        """Test that masks of other types select their true rows."""
+        expected = [0, 3, 6, 9]
+        masks = [
+            [2 if i % 3 == 0 else 0 for i in range(10)],
+            tuple(1.5 if i % 3 == 0 else 0.0 for i in range(10)),
+            bytes(7 if i % 3 == 0 else 0 for i in range(10)),
+            ['x' if i % 3 == 0 else '' for i in range(10)],
+        ]
+        np = entry_table.np
+        if np is not None:
+            masks += [
+                np.array([i % 3 == 0 for i in range(10)], dtype='int64'),
+                np.array([i % 3 == 0 for i in range(10)], dtype='uint8') * 255,
+                np.array([0.5 if i % 3 == 0 else 0.0 for i in range(10)]),
+            ]
+        
+        for mask in masks:
+            assert Selection.from_mask(mask).indices() == expected
+    
+    def test_empty(self):
+        """Test a selection over no entries."""
+        selection = Selection(0)
+        
+        selection.select_all()
+        selection.invert()
+        
+        assert selection.indices() == []
+        assert len(selection) == 0
@@ -0,0 +1,94 @@
+"""Tests for TokenUsageIndex."""
+
+import random
+import string
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.analyzer import TokenUsageIndex
+from generator.types import (
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    RequestBody,
+    TokenInfo,
+)
+
+
+def make_token(value, source_entry=0):
+    """Build a TokenInfo defined by ``source_entry``."""
+    return TokenInfo(type='APIKey', value=value, source_entry=source_entry, source_location='body')
+
+
+def make_entry(url, headers=None, body=None):
+    """Build a SemanticHarEntry."""
+    return SemanticHarEntry(
+        request=SemanticHarRequest(
+            url=url,
+            method='GET',
+            headers=headers or {},
+            cookies={},
+            body=RequestBody(data=body, content_type='json') if body else None
+        ),
+        response=SemanticHarResponse(status=200)
+    )
+
+
+class TestTokenUsageIndex:
+    """Tests for TokenUsageIndex."""
+    
+    def test_find(self):
+        """Test finding values anywhere in a text, including nested ones."""
+        index = TokenUsageIndex([
+            make_token('abcdefghijklmnop'),
+            make_token('ghijklmnopqr'),
+            make_token('zzzzzzzzzzzzzz'),
+        ])
+        
+        assert index.find('xx abcdefghijklmnopqr yy') == {'abcdefghijklmnop', 'ghijklmnopqr'}
+        assert index.find('abcdefghijklmno') == set()
+        assert index.find('') == set()
+    
+    def test_short_values_shrink_grams(self):
+        """Test values shorter than the gram size are still found."""
+        index = TokenUsageIndex([make_token('abc'), make_token('0123456789')])
+        
+        assert index.gram_size == 3
+        assert index.stride == 1
+        assert index.find('--abc--0123456789') == {'abc', '0123456789'}
+    
+    def test_matches_substring_search(self):
+        """Test against a per-token substring search on random data."""
+        rng = random.Random(3)
+        alphabet = string.ascii_letters + string.digits + '-_'
+        values = [''.join(rng.choice(alphabet) for _ in range(rng.randrange(10, 40))) for _ in range(200)]
+        index = TokenUsageIndex([make_token(value) for value in values])
+        
+        for _ in range(200):
+            text = ''.join(rng.choice(alphabet + ' ":') for _ in range(rng.randrange(200)))
+            for value in rng.sample(values, rng.randrange(3)):
+                position = rng.randrange(len(text) + 1)
+                text = text[:position] + value + text[position:]
+            assert index.find(text) == {value for value in values if value in text}
+    
+    def test_dependencies(self):
+        """Test request-to-definition edges from URL, headers and body."""
+        index = TokenUsageIndex([
+            make_token('session-token-0001', source_entry=0),
+            make_token('csrf-token-000002', source_entry=2),
+        ])
+        entries = [
+            make_entry('https://example.com/login'),
+            make_entry('https://example.com/a?sid=session-token-0001'),
+            make_entry('https://example.com/b', headers={'x-csrf': 'csrf-token-000002'}),
+            make_entry('https://example.com/c', body='{"csrf": "csrf-token-000002", "s": "session-token-0001"}'),
+        ]
+        
+        assert list(index.dependencies(entries)) == [(1, 0), (3, 0), (3, 2)]
+    
+    def test_invalid_gram_size(self):
+        """Test that the gram size must be positive."""
+        with pytest.raises(ValueError):
+            TokenUsageIndex([], gram_size=0)
@@ -0,0 +1,93 @@
+"""Tests for the compact HAR entry types."""
+
+import pickle
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+from generator.parser import transform_entry
+from generator.types import (
+    SemanticHarEntry,
+    SemanticHarRequest,
+    SemanticHarResponse,
+    RequestBody,
+    ResponseBody,
+)
+
+
+class TestSlottedTypes:
+    """Tests for the slotted SemanticHar* dataclasses."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.entry = SemanticHarEntry(
+            request=SemanticHarRequest(
+                url='https://example.com/api/login',
+                method='POST',
+                headers={'content-type': 'application/json'},
+                cookies={},
+                body=RequestBody(data='{}', content_type='json')
+            ),
+            response=SemanticHarResponse(
+                status=200,
+                body=ResponseBody(text='eyJ0b2tlbiI6IDF9', content_type='json', encoding='base64')
+            )
+        )
+    
+    def test_no_instance_dict(self):
+        """Test that instances carry no per-instance __dict__."""
+        for obj in (self.entry, self.entry.request, self.entry.response, self.entry.request.body,
+                    self.entry.response.body):
+            assert not hasattr(obj, '__dict__')
+            with pytest.raises(AttributeError):
+                obj.unexpected = True
+    
+    def test_constructor_signatures(self):
+        """Test positional arguments and defaults still work."""
+        request = SemanticHarRequest('https://example.com', 'GET', {}, {})
+        
+        assert request.body is None
+        assert SemanticHarResponse(404).status == 404
+        assert SemanticHarResponse(404).headers == {}
+        assert ResponseBody('abc').data == 'abc'
+        assert RequestBody('a=1', 'form').content_type == 'form'
+    
+    def test_equality_repr_and_pickle(self):
+        """Test dataclass behavior survives the slot rebuild."""
+        restored = pickle.loads(pickle.dumps(self.entry))
+        
+        assert restored == self.entry
+        assert restored.response.body.data == self.entry.response.body.data == '{"token": 1}'
+        assert 'SemanticHarEntry(request=SemanticHarRequest(' in repr(self.entry)
+
+
+class TestInterning:
+    """Tests for string interning during parsing."""
+    
+    def make_raw_entry(self, host):
+        """Build a raw HAR entry with strings that are not shared."""
+        return {
+            'request': {
+                'method': ''.join(['P', 'OST']),
+                'url': f'https://{host}/',
+                'headers': [
+                    {'name': ''.join(['Acc', 'ept']), 'value': '*/*'},
+                    {'name': 'Host', 'value': ''.join([host[:3], host[3:]])},
+                ],
+                'cookies': [{'name': ''.join(['sess', 'ion']), 'value': 'x'}],
+            },
+            'response': {'status': 200},
+        }
+    
+    def test_repeated_strings_are_shared(self):
+        """Test that header names, methods, cookie names and hosts are interned."""
+        first = transform_entry(self.make_raw_entry('example.com'))
+        second = transform_entry(self.make_raw_entry('example.com'))
+        
+        first_keys = list(first.request.headers)
+        second_keys = list(second.request.headers)
+        assert first_keys[0] is second_keys[0]
+        assert first.request.method is second.request.method
+        assert list(first.request.cookies)[0] is list(second.request.cookies)[0]
+        assert first.request.headers['host'] is second.request.headers['host']